@@ -0,0 +1,109 @@
+"""
+Decode and encode cost of each installed JSON codec on SpyFu-shaped data.
+
+    python -m benchmarks.codec_benchmark
+    python -m benchmarks.codec_benchmark --items 50 --records 2000 --repeat 5
+
+For every codec it times decoding raw response bodies (bytes, as the client
+receives them), encoding records to JSON Lines and the indented ``.json``
+export, and reports microseconds per operation plus the speed-up over the
+standard library.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.stub_server import _payload
+from src.parsers.json_normalizer import build_record
+from src.services.json_codec import available_codecs, get_codec
+
+def _records(bodies: List[bytes]) -> List[Dict[str, Any]]:
+    records = []
+    for index, body in enumerate(bodies):
+        items = json.loads(body)
+        records.append(
+            build_record(
+                origin=f"https://www.bench-{index}.example.com/",
+                domain=f"bench-{index}.example.com",
+                country="US",
+                process_type="all",
+                top_competitors=items,
+                most_valuable_keywords=items,
+                most_successful_keywords=[],
+                newly_ranked_keywords=items,
+                top_ads=items,
+                domain_stats={"organic_keywords": index, "monthly_organic_clicks": index * 3},
+                timestamp_ms=0,
+                run_id="bench",
+            ).to_dict()
+        )
+    return records
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def run_codec_benchmark(
+    items: int = 10,
+    records: int = 1000,
+    repeat: int = 3,
+    codecs: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    bodies = [
+        json.dumps(_payload("most_valuable_keywords", f"bench-{i}.example.com", items)).encode("utf-8")
+        for i in range(records)
+    ]
+    rows = _records(bodies)
+    body_bytes = sum(len(body) for body in bodies)
+
+    results: Dict[str, Any] = {}
+    for name in codecs or available_codecs():
+        codec = get_codec(name)
+        decode = _best_of(repeat, lambda: [codec.loads(body) for body in bodies])
+        encode = _best_of(repeat, lambda: [codec.dumps(row) for row in rows])
+        export = _best_of(repeat, lambda: codec.dumps_pretty(rows))
+        results[name] = {
+            "decode_us_per_response": round(decode / records * 1e6, 2),
+            "decode_mb_per_s": round(body_bytes / decode / 1e6, 1),
+            "encode_us_per_record": round(encode / records * 1e6, 2),
+            "export_ms": round(export * 1000, 2),
+        }
+
+    baseline = results.get("json")
+    if baseline:
+        for entry in results.values():
+            entry["decode_speedup"] = round(baseline["decode_us_per_response"] / entry["decode_us_per_response"], 2)
+            entry["encode_speedup"] = round(baseline["encode_us_per_record"] / entry["encode_us_per_record"], 2)
+    return {
+        "config": {"items": items, "records": records, "repeat": repeat, "response_bytes": body_bytes},
+        "results": results,
+    }
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON codecs on SpyFu-shaped data.")
+    parser.add_argument("--items", type=int, default=10, help="Items per response body.")
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept.")
+    parser.add_argument("--codec", dest="codecs", action="append", default=None, help="Limit to these codecs.")
+    parser.add_argument("--output", default=None, help="Where to write the JSON results.")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    result = run_codec_benchmark(args.items, args.records, args.repeat, args.codecs)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Throughput and resource benchmark against a local stub SpyFu server.
+
+    python -m benchmarks.run_benchmarks --domains 500 --workers 8 --latency-ms 50
+    python -m benchmarks.run_benchmarks --engine async --error-rate 0.02 --throttle-rate 0.01
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/baseline.json
+
+Each run is saved as JSON (``--output``, default
+``benchmarks/results/<name>-<timestamp>.json``). With ``--compare`` the run is
+checked against an earlier result and the script exits with status 1 when
+throughput or p95 latency regressed by more than ``--tolerance``.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+from benchmarks.stub_server import StubConfig, StubSpyfuServer
+from src.runner import PROCESS_TYPES, _client_kwargs, process_urls, process_urls_async, run_bulk
+from src.services.async_spyfu_client import AsyncSpyfuClient
+from src.services.spyfu_client import SpyfuClient
+
+LOGGER = logging.getLogger(__name__)
+
+class _TimedClient(SpyfuClient):
+    """
+    ``SpyfuClient`` that records the latency of every HTTP attempt.
+    """
+
+    latencies: List[float]
+
+    def _send(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._send(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+class _TimedAsyncClient(AsyncSpyfuClient):
+    latencies: List[float]
+
+    async def _send(self, *args: Any, **kwargs: Any) -> Any:  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            return await super()._send(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of ``values`` (``None`` when empty).
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _settings(base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "spyfu_base_url": base_url,
+        "spyfu_api_key": "benchmark",
+        "use_sample_data": False,
+        "requests_per_minute": args.requests_per_minute,
+        "burst": args.workers,
+        "concurrency": args.workers,
+        "max_connections": args.workers,
+        "http_pool_size": args.workers,
+        "cache_enabled": False,
+        "retry_base_delay_seconds": args.retry_base_delay,
+        "validation_mode": args.validation_mode,
+    }
+
+def _domains(count: int) -> List[str]:
+    return [f"https://www.bench-{i}.example.com/page" for i in range(count)]
+
+def _run_process(urls: List[str], settings: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    latencies: List[float] = []
+    if args.engine == "async":
+        client = _TimedAsyncClient(
+            max_connections=args.workers, **_client_kwargs(settings)
+        )
+        client.latencies = latencies
+
+        async def run() -> List[Dict[str, Any]]:
+            async with client:
+                return await process_urls_async(
+                    urls, None, args.process, settings, concurrency=args.workers, client=client
+                )
+
+        records = asyncio.run(run())
+    else:
+        client = _TimedClient(**_client_kwargs(settings))
+        client.latencies = latencies
+        try:
+            records = process_urls(urls, None, args.process, settings, workers=args.workers, client=client)
+        finally:
+            client.close()
+    return {"records": len(records), "latencies": latencies}
+
+def _run_end_to_end(urls: List[str], settings: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = os.path.join(tmp, "urls.txt")
+        settings_path = os.path.join(tmp, "settings.json")
+        with open(input_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(urls))
+        with open(settings_path, "w", encoding="utf-8") as f:
+            json.dump(dict(settings, journal_dir=tmp), f)
+        records = run_bulk(
+            input_file=input_file,
+            country=None,
+            process_type=args.process,
+            output_format=args.format,
+            output_path=os.path.join(tmp, f"output.{args.format}"),
+            settings_path=settings_path,
+            log_config_path=os.path.join(tmp, "missing-logging.conf"),
+            workers=args.workers,
+            engine=args.engine,
+        )
+    return {"records": len(records), "latencies": []}
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after,
+        payload_items=args.payload_items,
+        seed=args.seed,
+    )
+    urls = _domains(args.domains)
+
+    with StubSpyfuServer(config) as server:
+        settings = _settings(server.base_url, args)
+        runner = _run_end_to_end if args.end_to_end else _run_process
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        outcome = runner(urls, settings, args)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+        server_stats = server.stats()
+
+    records = outcome["records"]
+    latencies = outcome["latencies"]
+    return {
+        "name": args.name,
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "domains": args.domains,
+            "process": args.process,
+            "engine": args.engine,
+            "workers": args.workers,
+            "end_to_end": args.end_to_end,
+            "stub": asdict(config),
+        },
+        "results": {
+            "records": records,
+            "success_rate": round(records / args.domains, 4) if args.domains else 0.0,
+            "elapsed_seconds": round(elapsed, 3),
+            "domains_per_minute": round(records / elapsed * 60, 1) if elapsed else 0.0,
+            "requests": len(latencies) or server_stats["requests"],
+            "latency_ms": {
+                f"p{pct}": (round(value * 1000, 2) if value is not None else None)
+                for pct in (50, 95, 99)
+                for value in [percentile(latencies, pct)]
+            },
+            "peak_rss_mb": peak_rss_mb(),
+            "cpu_ms_per_record": round(cpu * 1000 / records, 3) if records else None,
+            "server": server_stats,
+        },
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Return the regressions of ``current`` against ``baseline``.
+    """
+    regressions: List[str] = []
+    now, before = current["results"], baseline["results"]
+    if now["domains_per_minute"] < before["domains_per_minute"] * (1 - tolerance):
+        regressions.append(
+            f"domains/min fell from {before['domains_per_minute']} to {now['domains_per_minute']}"
+        )
+    p95_now, p95_before = now["latency_ms"].get("p95"), before["latency_ms"].get("p95")
+    if p95_now is not None and p95_before and p95_now > p95_before * (1 + tolerance):
+        regressions.append(f"p95 latency rose from {p95_before}ms to {p95_now}ms")
+    cpu_now, cpu_before = now.get("cpu_ms_per_record"), before.get("cpu_ms_per_record")
+    if cpu_now is not None and cpu_before and cpu_now > cpu_before * (1 + tolerance):
+        regressions.append(f"CPU per record rose from {cpu_before}ms to {cpu_now}ms")
+    return regressions
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark spyfu-bulk-urls against a stub server.")
+    parser.add_argument("--name", default="default", help="Label stored with the results.")
+    parser.add_argument("--domains", type=int, default=500)
+    parser.add_argument("--process", default="domain_stats", help=f"One of {', '.join(PROCESS_TYPES)}, a comma list or 'all'.")
+    parser.add_argument("--engine", choices=["threads", "async"], default="threads")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--requests-per-minute", type=int, default=1_000_000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 replies.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429 replies.")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After sent with 429s.")
+    parser.add_argument("--retry-base-delay", type=float, default=0.05)
+    parser.add_argument("--payload-items", type=int, default=10)
+    parser.add_argument("--validation-mode", choices=["full", "sampled", "fast"], default="full")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--end-to-end",
+        action="store_true",
+        help="Drive run_bulk (validation and export included). Latency percentiles are not collected.",
+    )
+    parser.add_argument("--format", default="jsonl", help="Output format for --end-to-end.")
+    parser.add_argument("--output", default=None, help="Where to write the JSON results.")
+    parser.add_argument("--compare", default=None, help="Earlier results file to check for regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+
+    result = run_benchmark(args)
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{args.name}-{result['timestamp']}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(json.dumps(result["results"], indent=2))
+    print(f"Saved results to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
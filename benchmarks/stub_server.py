@@ -0,0 +1,178 @@
+import json
+import multiprocessing
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+@dataclass
+class StubConfig:
+    """
+    Behaviour of the stub SpyFu server.
+
+    ``latency_ms`` is the mean service time, varied by up to ``jitter_ms``
+    either way. ``error_rate`` and ``throttle_rate`` are the fractions of
+    requests answered with a 503 or a 429 (with ``Retry-After:
+    retry_after_seconds``). ``payload_items`` sets how many items each list
+    endpoint returns.
+    """
+
+    latency_ms: float = 20.0
+    jitter_ms: float = 5.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after_seconds: float = 0.0
+    payload_items: int = 10
+    seed: int = 1
+
+def _payload(endpoint: str, domain: str, items: int) -> Any:
+    if endpoint == "domain_stats":
+        return {
+            "organic_keywords": 5000,
+            "paid_keywords": 800,
+            "estimated_monthly_clicks": 42000,
+            "estimated_monthly_budget": 9100.5,
+        }
+    if endpoint == "top_competitors":
+        return [
+            {
+                "domain": f"{domain}-rival-{i}.com",
+                "overlap_score": 0.5,
+                "estimated_monthly_clicks": 1000 * i,
+                "organic_keywords": 300 * i,
+                "paid_keywords": 40 * i,
+            }
+            for i in range(items)
+        ]
+    if endpoint == "top_ads":
+        return [
+            {
+                "headline": f"{domain} ad {i}",
+                "description": f"Benchmark ad {i} for {domain}",
+                "ad_type": "text",
+                "landing_page_url": f"https://{domain}/landing-{i}",
+            }
+            for i in range(items)
+        ]
+    return [
+        {
+            "keyword": f"{domain} keyword {i}",
+            "search_volume": 100 * i,
+            "estimated_value": 1.5,
+            "position": i + 1,
+            "traffic_share": 0.01,
+            "trend": "stable",
+        }
+        for i in range(items)
+    ]
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; avoid the delayed-ACK stall.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        server: "_StubServer" = self.server  # type: ignore[assignment]
+        parsed = urlparse(self.path)
+        endpoint = parsed.path.strip("/")
+        if endpoint == "__stats":
+            self._reply(200, json.dumps(server.stats()).encode("utf-8"))
+            return
+
+        domain = parse_qs(parsed.query).get("domain", ["example.com"])[0]
+        config = server.config
+        with server.lock:
+            roll = server.rng.random()
+            delay = max(0.0, config.latency_ms + server.rng.uniform(-1, 1) * config.jitter_ms)
+        time.sleep(delay / 1000.0)
+
+        if roll < config.throttle_rate:
+            server.count("throttled")
+            self._reply(429, b"", {"Retry-After": f"{config.retry_after_seconds:g}"})
+        elif roll < config.throttle_rate + config.error_rate:
+            server.count("errors")
+            self._reply(503, b"")
+        else:
+            server.count("ok")
+            body = json.dumps(_payload(endpoint, domain, config.payload_items)).encode("utf-8")
+            self._reply(200, body)
+
+    def _reply(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: StubConfig) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.counters = {"ok": 0, "errors": 0, "throttled": 0}
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counters[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counters, requests=sum(self.counters.values()))
+
+def _serve(config: Dict[str, Any], conn: Any) -> None:
+    server = _StubServer(StubConfig(**config))
+    conn.send(server.server_address[1])
+    conn.close()
+    server.serve_forever()
+
+class StubSpyfuServer:
+    """
+    Stub SpyFu API in a child process, so its CPU time and memory do not
+    count against the client being measured.
+
+    Use as a context manager; ``base_url`` points at the running server and
+    ``stats()`` returns its request counters.
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None) -> None:
+        self.config = config or StubConfig()
+        self.base_url = ""
+        self._process: Optional[multiprocessing.Process] = None
+
+    def __enter__(self) -> "StubSpyfuServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        parent, child = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_serve, args=(asdict(self.config), child), daemon=True
+        )
+        self._process.start()
+        port = parent.recv()
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    def stats(self) -> Dict[str, int]:
+        return requests.get(f"{self.base_url}/__stats", timeout=5).json()
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
@@ -0,0 +1,157 @@
+import logging
+from typing import Any, Dict, List
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+from src.outputs.exporters import RecordWriter
+from src.parsers.record import as_dict
+
+LOGGER = logging.getLogger(__name__)
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+def record_schema() -> "pa.Schema":
+    """
+    Arrow schema for ``build_record`` output, with typed nested sections.
+    """
+    keyword = pa.struct(
+        [
+            ("keyword", pa.string()),
+            ("search_volume", pa.int64()),
+            ("estimated_value", pa.float64()),
+            ("position", pa.int64()),
+            ("traffic_share", pa.float64()),
+        ]
+    )
+    return pa.schema(
+        [
+            ("origin", pa.string()),
+            ("domain", pa.string()),
+            ("country", pa.string()),
+            ("process_type", pa.string()),
+            (
+                "top_competitors",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("domain", pa.string()),
+                            ("overlap_score", pa.float64()),
+                            ("estimated_monthly_clicks", pa.int64()),
+                            ("organic_keywords", pa.int64()),
+                            ("paid_keywords", pa.int64()),
+                        ]
+                    )
+                ),
+            ),
+            ("most_valuable_keywords", pa.list_(keyword)),
+            ("most_successful_keywords", pa.list_(keyword)),
+            (
+                "newly_ranked_keywords",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("keyword", pa.string()),
+                            ("search_volume", pa.int64()),
+                            ("position", pa.int64()),
+                            ("trend", pa.string()),
+                        ]
+                    )
+                ),
+            ),
+            (
+                "top_ads",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("headline", pa.string()),
+                            ("description", pa.string()),
+                            ("ad_type", pa.string()),
+                            ("landing_page_url", pa.string()),
+                        ]
+                    )
+                ),
+            ),
+            (
+                "domain_stats",
+                pa.struct(
+                    [
+                        ("organic_keywords", pa.int64()),
+                        ("paid_keywords", pa.int64()),
+                        ("estimated_monthly_clicks", pa.int64()),
+                        ("estimated_monthly_budget", pa.float64()),
+                    ]
+                ),
+            ),
+            ("timestamp", pa.timestamp("ms")),
+            ("run_id", pa.string()),
+            ("notes", pa.string()),
+        ]
+    )
+
+class ArrowRecordWriter(RecordWriter):
+    """
+    Columnar writer for Parquet (``fmt="parquet"``) or Arrow IPC files
+    (``fmt="arrow"``).
+
+    Records are buffered and flushed as one row group / record batch every
+    ``row_group_size`` records, so only a single group is held in memory.
+    Nested sections become typed list-of-struct columns. Item fields outside
+    the schema are dropped.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        fmt: str = "parquet",
+        row_group_size: int = 10000,
+        compression: str = "zstd",
+    ) -> None:
+        if pa is None:
+            raise RuntimeError(
+                "Parquet/Arrow export requires pyarrow. Install it with "
+                "'pip install spyfu-bulk-urls[columnar]'."
+            )
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported columnar format: {fmt}")
+        super().__init__(output_path)
+        self.fmt = fmt
+        self.row_group_size = max(1, row_group_size)
+        self.schema = record_schema()
+        self._buffer: List[Dict[str, Any]] = []
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(output_path, self.schema, compression=compression)
+        else:
+            self._sink = pa.OSFile(output_path, "wb")
+            self._writer = pa.ipc.new_file(
+                self._sink,
+                self.schema,
+                options=pa.ipc.IpcWriteOptions(compression=compression),
+            )
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._buffer.append(as_dict(record))
+        self.count += 1
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        table = pa.Table.from_pylist(self._buffer, schema=self.schema)
+        self._buffer = []
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+        if self.fmt == "arrow":
+            self._sink.close()
+        LOGGER.info("Wrote %s output to %s", self.fmt.capitalize(), self.output_path)
@@ -0,0 +1,55 @@
+import logging
+import os
+import threading
+from typing import IO, Any, Optional, Set
+
+LOGGER = logging.getLogger(__name__)
+
+class DeadLetterFile:
+    """
+    URLs that still failed after every retry, one per line.
+
+    The file has the same format as the input list, so it can be passed
+    straight back with ``--input`` to re-run only those URLs. It is created on
+    the first failure; with ``append`` an existing file is extended instead of
+    replaced (used when resuming a run). Each URL is written once.
+    """
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        self.path = path
+        self.append = append
+        self.count = 0
+        self._seen: Set[str] = set()
+        self._fh: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "DeadLetterFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def add(self, origin: str) -> None:
+        with self._lock:
+            if origin in self._seen:
+                return
+            self._seen.add(origin)
+            if self._fh is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                self._fh = open(self.path, "a" if self.append else "w", encoding="utf-8")
+            self._fh.write(origin + "\n")
+            self._fh.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        if self.count:
+            LOGGER.warning(
+                "%d URL(s) failed after retries; re-run them with --input %s",
+                self.count,
+                self.path,
+            )
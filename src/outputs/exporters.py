@@ -1,11 +1,17 @@
 import csv
-import json
 import logging
 import os
-from typing import Any, Dict, Iterable, List
+import tempfile
+from typing import IO, Any, Dict, Iterable, Optional, Sequence, Set
+
+from src.parsers.record import as_dict
+from src.services import json_codec
 
 LOGGER = logging.getLogger(__name__)
 
+CSV_LAYOUTS = ("flat", "normalized")
+CHILD_KEY_COLUMNS = ("run_id", "domain", "origin", "item_index")
+
 def _ensure_dir(path: str) -> None:
     directory = os.path.dirname(os.path.abspath(path))
     if directory and not os.path.exists(directory):
@@ -18,40 +24,289 @@ def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
     flat: Dict[str, Any] = {}
     for key, value in record.items():
         if isinstance(value, (dict, list)):
-            flat[key] = json.dumps(value, ensure_ascii=False)
+            flat[key] = json_codec.dumps(value).decode("utf-8")
         else:
             flat[key] = value
     return flat
 
-def export_to_json(records: Iterable[Dict[str, Any]], output_path: str) -> None:
+def export_to_json(
+    records: Iterable[Dict[str, Any]],
+    output_path: str,
+    sparse: bool = False,
+) -> None:
     _ensure_dir(output_path)
-    data = list(records)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    data = [as_dict(record, sparse) for record in records]
+    with open(output_path, "wb") as f:
+        f.write(json_codec.dumps_pretty(data))
     LOGGER.info("Wrote JSON output to %s", output_path)
 
-def export_to_csv(records: Iterable[Dict[str, Any]], output_path: str) -> None:
-    _ensure_dir(output_path)
-    data = list(records)
-    if not data:
-        LOGGER.warning("No records to export to CSV.")
-        return
-
-    flattened = [_flatten_record(r) for r in data]
-    fieldnames: List[str] = sorted(flattened[0].keys())
-
-    with open(output_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in flattened:
-            writer.writerow(row)
-    LOGGER.info("Wrote CSV output to %s", output_path)
-
-def export_records(records: Iterable[Dict[str, Any]], output_path: str, fmt: str = "json") -> None:
+def _flatten_parent_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Scalar columns of a record for the normalized CSV layout.
+
+    ``domain_stats`` becomes ``domain_stats.<key>`` columns; list sections are
+    written to their own child tables instead.
+    """
+    row: Dict[str, Any] = {}
+    for key, value in record.items():
+        if key == "domain_stats" and isinstance(value, dict):
+            for stat, stat_value in value.items():
+                row[f"domain_stats.{stat}"] = stat_value
+        elif not isinstance(value, list):
+            row[key] = value
+    return _flatten_record(row)
+
+def export_to_csv(
+    records: Iterable[Dict[str, Any]],
+    output_path: str,
+    layout: str = "flat",
+) -> None:
+    with CsvWriter(output_path, layout=layout) as writer:
+        for record in records:
+            writer.write(record)
+
+def export_to_jsonl(
+    records: Iterable[Dict[str, Any]],
+    output_path: str,
+    sparse: bool = False,
+) -> None:
+    with JsonLinesWriter(output_path, sparse=sparse) as writer:
+        for record in records:
+            writer.write(record)
+    LOGGER.info("Wrote JSON Lines output to %s", output_path)
+
+class RecordWriter:
+    """
+    Incremental sink that writes records as they arrive.
+
+    Use as a context manager; ``count`` holds the number of records written.
+    """
+
+    def __init__(self, output_path: str) -> None:
+        _ensure_dir(output_path)
+        self.output_path = output_path
+        self.count = 0
+        self._fh: Optional[IO[Any]] = None
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+class JsonLinesWriter(RecordWriter):
+    """
+    Writes one compact JSON document per line.
+
+    ``offset`` is the byte position just after the last record, which lets a
+    run journal checkpoint the output. With ``append`` the writer continues an
+    existing file. ``sparse`` leaves empty sections out of each line.
+    """
+
+    def __init__(self, output_path: str, append: bool = False, sparse: bool = False) -> None:
+        super().__init__(output_path)
+        self.sparse = sparse
+        self._fh = open(output_path, "ab" if append else "wb")
+        self.offset = self._fh.seek(0, os.SEEK_END)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        assert self._fh is not None
+        line = json_codec.dumps(as_dict(record, self.sparse)) + b"\n"
+        self._fh.write(line)
+        self.offset += len(line)
+        self.count += 1
+
+    def flush(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+
+class JsonArrayWriter(RecordWriter):
+    """
+    Streams a JSON array, one record per line, without holding the records.
+    """
+
+    def __init__(self, output_path: str, sparse: bool = False) -> None:
+        super().__init__(output_path)
+        self.sparse = sparse
+        self._fh = open(output_path, "wb")
+        self._fh.write(b"[")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        assert self._fh is not None
+        self._fh.write(b"\n" if self.count == 0 else b",\n")
+        self._fh.write(json_codec.dumps(as_dict(record, self.sparse)))
+        self.count += 1
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.write(b"\n]\n" if self.count else b"]\n")
+        super().close()
+
+class _SpooledCsvTable:
+    """
+    One CSV file whose header is the union of every row's keys.
+
+    Rows are spooled to a temporary JSON Lines file while the key set is
+    collected, then the CSV is written with the full header on ``finish``.
+    Only the header is ever held in memory.
+    """
+
+    def __init__(self, path: str, leading: Sequence[str] = ()) -> None:
+        self.path = path
+        self.leading = list(leading)
+        self.rows = 0
+        self._keys: Set[str] = set()
+        directory = os.path.dirname(os.path.abspath(path))
+        self._spool = tempfile.NamedTemporaryFile(
+            mode="w+b", dir=directory, prefix=".spool-", suffix=".jsonl", delete=False
+        )
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self._keys.update(row)
+        self._spool.write(json_codec.dumps(row) + b"\n")
+        self.rows += 1
+
+    def finish(self) -> None:
+        try:
+            if not self.rows:
+                return
+            rest = sorted(self._keys.difference(self.leading))
+            fieldnames = [k for k in self.leading if k in self._keys] + rest
+            self._spool.seek(0)
+            with open(self.path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                for line in self._spool:
+                    writer.writerow(json_codec.loads(line))
+        finally:
+            self._spool.close()
+            os.unlink(self._spool.name)
+
+class CsvWriter(RecordWriter):
+    """
+    Streaming CSV writer.
+
+    ``layout="flat"`` writes one row per record with nested sections as JSON
+    strings. ``layout="normalized"`` writes scalar fields and flattened
+    ``domain_stats`` to the main file. Each list section (``top_competitors``,
+    ``most_valuable_keywords``, ...) goes to a child CSV named
+    ``<output>.<section>.csv``, one row per item, keyed by
+    ``run_id``/``domain``/``origin``. Item fields that clash with those key
+    columns are prefixed with ``item_``. Headers are the union of all keys seen.
+    """
+
+    def __init__(self, output_path: str, layout: str = "flat") -> None:
+        if layout not in CSV_LAYOUTS:
+            raise ValueError(f"Unsupported CSV layout: {layout}")
+        super().__init__(output_path)
+        self.layout = layout
+        self._main = _SpooledCsvTable(output_path)
+        self._children: Dict[str, _SpooledCsvTable] = {}
+
+    def child_path(self, section: str) -> str:
+        base, ext = os.path.splitext(self.output_path)
+        return f"{base}.{section}{ext or '.csv'}"
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self.layout == "flat":
+            self._main.add(_flatten_record(record))
+        else:
+            self._main.add(_flatten_parent_row(record))
+            key = {
+                "run_id": record.get("run_id"),
+                "domain": record.get("domain"),
+                "origin": record.get("origin"),
+            }
+            for section, items in record.items():
+                if not isinstance(items, list):
+                    continue
+                table = self._children.get(section)
+                if table is None:
+                    table = _SpooledCsvTable(self.child_path(section), leading=CHILD_KEY_COLUMNS)
+                    self._children[section] = table
+                for position, item in enumerate(items, start=1):
+                    if isinstance(item, dict):
+                        # e.g. a competitor's own "domain" must not clobber the key column.
+                        row = {
+                            (f"item_{k}" if k in CHILD_KEY_COLUMNS else k): v
+                            for k, v in item.items()
+                        }
+                    else:
+                        row = {"value": item}
+                    row.update(key, item_index=position)
+                    table.add(_flatten_record(row))
+        self.count += 1
+
+    def close(self) -> None:
+        tables = [self._main, *self._children.values()]
+        self._children = {}
+        for table in tables:
+            table.finish()
+        if self.count:
+            LOGGER.info("Wrote CSV output to %s", self.output_path)
+        else:
+            LOGGER.warning("No records to export to CSV.")
+
+def open_record_writer(
+    output_path: str,
+    fmt: str = "jsonl",
+    append: bool = False,
+    csv_layout: str = "flat",
+    row_group_size: int = 10000,
+    compression: str = "zstd",
+    sparse: bool = False,
+) -> RecordWriter:
+    """
+    ``sparse`` omits empty sections in JSON and JSON Lines output; CSV and
+    columnar formats always have every column.
+    """
+    fmt = fmt.lower()
+    if fmt == "jsonl":
+        return JsonLinesWriter(output_path, append=append, sparse=sparse)
+    if append:
+        raise ValueError(f"Appending is only supported for jsonl output, not {fmt}.")
+    if fmt == "json":
+        return JsonArrayWriter(output_path, sparse=sparse)
+    if fmt == "csv":
+        return CsvWriter(output_path, layout=csv_layout)
+    if fmt in ("parquet", "arrow"):
+        # Imported lazily: pyarrow is an optional dependency.
+        from src.outputs.arrow_exporter import ArrowRecordWriter
+
+        return ArrowRecordWriter(
+            output_path, fmt=fmt, row_group_size=row_group_size, compression=compression
+        )
+    raise ValueError(f"Unsupported streaming export format: {fmt}")
+
+def export_records(
+    records: Iterable[Dict[str, Any]],
+    output_path: str,
+    fmt: str = "json",
+    csv_layout: str = "flat",
+    row_group_size: int = 10000,
+    compression: str = "zstd",
+    sparse: bool = False,
+) -> None:
     fmt = fmt.lower()
     if fmt == "json":
-        export_to_json(records, output_path)
+        export_to_json(records, output_path, sparse=sparse)
+    elif fmt == "jsonl":
+        export_to_jsonl(records, output_path, sparse=sparse)
     elif fmt == "csv":
-        export_to_csv(records, output_path)
+        export_to_csv(records, output_path, layout=csv_layout)
+    elif fmt in ("parquet", "arrow"):
+        with open_record_writer(
+            output_path, fmt, row_group_size=row_group_size, compression=compression
+        ) as writer:
+            for record in records:
+                writer.write(record)
     else:
         raise ValueError(f"Unsupported export format: {fmt}")
\ No newline at end of file
@@ -0,0 +1,172 @@
+import csv
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from src.outputs.exporters import CHILD_KEY_COLUMNS, _SpooledCsvTable, open_record_writer
+from src.services import json_codec
+from src.services.work_queue import WorkQueue
+
+LOGGER = logging.getLogger(__name__)
+
+MERGE_INPUT_FORMATS = ("json", "jsonl", "csv", "queue")
+
+# Work queue files (see ``src.services.work_queue``) hold the records of completed jobs.
+QUEUE_EXTENSIONS = ("sqlite", "db")
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "ndjson":
+        return "jsonl"
+    if ext in QUEUE_EXTENSIONS:
+        return "queue"
+    if ext in MERGE_INPUT_FORMATS or ext in ("parquet", "arrow"):
+        return ext
+    raise ValueError(f"Cannot tell the format of {path}; pass it explicitly.")
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json_codec.loads(line)
+            except ValueError:
+                # A torn last line from an interrupted streaming run.
+                LOGGER.warning("Skipping unparseable line %d in %s", line_no, path)
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the elements of a top-level JSON array one at a time, reading the
+    file in chunks instead of loading it whole.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        started = False
+        eof = False
+        while True:
+            # Skip whitespace and separators between elements.
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if not started and pos < len(buffer):
+                if buffer[pos] != "[":
+                    raise ValueError(f"{path} does not contain a JSON array.")
+                started = True
+                pos += 1
+                continue
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    if buffer[pos:].strip():
+                        raise ValueError(f"Truncated JSON array in {path}.") from None
+                    return
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield item
+            pos = end
+
+def iter_queue_results(path: str) -> Iterator[Dict[str, Any]]:
+    with WorkQueue(path) as queue:
+        counts = queue.counts()
+        if counts["pending"] or counts["leased"]:
+            LOGGER.warning("Queue %s still has unfinished jobs: %s", path, counts)
+        yield from queue.iter_results()
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    fmt = fmt or detect_format(path)
+    if fmt == "queue":
+        return iter_queue_results(path)
+    if fmt == "jsonl":
+        return iter_jsonl(path)
+    if fmt == "json":
+        return iter_json_array(path)
+    raise ValueError(f"Cannot read records back from {fmt} files.")
+
+def _csv_children(path: str) -> Dict[str, str]:
+    """
+    Child tables written next to ``path`` by the normalized CSV layout.
+    """
+    base, ext = os.path.splitext(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    pattern = re.compile(re.escape(os.path.basename(base)) + r"\.([a-z_]+)" + re.escape(ext or ".csv") + "$")
+    children: Dict[str, str] = {}
+    for name in sorted(os.listdir(directory)):
+        match = pattern.match(name)
+        if match:
+            children[match.group(1)] = os.path.join(directory, name)
+    return children
+
+def _merge_csv(inputs: Sequence[str], output_path: str) -> int:
+    main = _SpooledCsvTable(output_path)
+    children: Dict[str, _SpooledCsvTable] = {}
+    base, ext = os.path.splitext(output_path)
+    tables: List[_SpooledCsvTable] = [main]
+    try:
+        for path in inputs:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    main.add(row)
+            for section, child_path in _csv_children(path).items():
+                table = children.get(section)
+                if table is None:
+                    table = _SpooledCsvTable(f"{base}.{section}{ext or '.csv'}", leading=CHILD_KEY_COLUMNS)
+                    children[section] = table
+                    tables.append(table)
+                with open(child_path, "r", encoding="utf-8", newline="") as f:
+                    for row in csv.DictReader(f):
+                        table.add(row)
+    finally:
+        for table in tables:
+            table.finish()
+    return main.rows
+
+def merge_outputs(
+    inputs: Sequence[str],
+    output_path: str,
+    fmt: Optional[str] = None,
+    csv_layout: str = "flat",
+) -> int:
+    """
+    Stream several shard outputs into one file and return the record count.
+
+    JSON and JSON Lines inputs, and the completed jobs of a work queue file,
+    can be merged into any export format. CSV
+    inputs are merged into one CSV with the union of their headers, along
+    with any normalized-layout child tables. Records are never all held in
+    memory.
+    """
+    if not inputs:
+        raise ValueError("Nothing to merge.")
+    out_abs = os.path.abspath(output_path)
+    if any(os.path.abspath(path) == out_abs for path in inputs):
+        raise ValueError(f"Output {output_path} is also an input.")
+    for path in inputs:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Shard output not found: {path}")
+
+    fmt = fmt or detect_format(output_path)
+    input_formats = {detect_format(path) for path in inputs}
+    if "csv" in input_formats:
+        if input_formats != {"csv"} or fmt != "csv":
+            raise ValueError("CSV shard outputs can only be merged with each other into CSV.")
+        count = _merge_csv(inputs, output_path)
+    else:
+        count = 0
+        with open_record_writer(output_path, fmt, csv_layout=csv_layout) as writer:
+            for path in inputs:
+                for record in iter_records(path):
+                    writer.write(record)
+                    count += 1
+    LOGGER.info("Merged %d records from %d file(s) into %s", count, len(inputs), output_path)
+    return count
@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+JournalKey = Tuple[str, str, Optional[str]]
+
+class RunJournal:
+    """
+    Append-only checkpoint journal for one streaming run.
+
+    The first line is a header describing the run (output path, format,
+    process type, country). Every following line records one finished
+    ``(origin, process_type, country)`` entry and the byte offset of the
+    output file just after its record was written. On resume, the output is
+    truncated back to the last journaled offset, which drops a record
+    half-written during a crash, and finished entries are skipped.
+    """
+
+    def __init__(self, path: str, header: Dict[str, Any]) -> None:
+        self.path = path
+        self.header = header
+        self.completed: Set[JournalKey] = set()
+        self.last_offset = 0
+        self._fh = None
+
+    @staticmethod
+    def path_for(directory: str, run_id: str) -> str:
+        return os.path.join(directory, f"{run_id}.journal.jsonl")
+
+    @classmethod
+    def create(cls, directory: str, run_id: str, **header: Any) -> "RunJournal":
+        os.makedirs(directory, exist_ok=True)
+        path = cls.path_for(directory, run_id)
+        if os.path.exists(path):
+            raise FileExistsError(f"Run journal already exists: {path}")
+        header = {"run_id": run_id, "created": time.time(), **header}
+        journal = cls(path, header)
+        journal._fh = open(path, "a", encoding="utf-8")
+        journal._append(header)
+        return journal
+
+    @classmethod
+    def load(cls, directory: str, run_id: str) -> "RunJournal":
+        path = cls.path_for(directory, run_id)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No journal found for run {run_id}: {path}")
+
+        journal: Optional[RunJournal] = None
+        good_end = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    entry = None
+                if entry is None:
+                    # A torn final line from a crash; everything before it is intact.
+                    LOGGER.warning("Ignoring truncated journal line in %s", path)
+                    break
+                good_end += len(line)
+                if journal is None:
+                    journal = cls(path, entry)
+                    continue
+                journal.completed.add((entry["origin"], entry["process_type"], entry["country"]))
+                journal.last_offset = max(journal.last_offset, int(entry["offset"]))
+
+        if journal is None:
+            raise ValueError(f"Run journal {path} is empty.")
+        if os.path.getsize(path) != good_end:
+            # Drop the torn fragment so new entries start on a line of their own.
+            with open(path, "r+b") as f:
+                f.truncate(good_end)
+        journal._fh = open(path, "a", encoding="utf-8")
+        LOGGER.info(
+            "Loaded journal for run %s: %d entries done, output offset %d.",
+            run_id,
+            len(journal.completed),
+            journal.last_offset,
+        )
+        return journal
+
+    @property
+    def run_id(self) -> str:
+        return self.header["run_id"]
+
+    def is_done(self, origin: str, process_type: str, country: Optional[str]) -> bool:
+        return (origin, process_type, country) in self.completed
+
+    def record(self, origin: str, process_type: str, country: Optional[str], offset: int) -> None:
+        self.completed.add((origin, process_type, country))
+        self.last_offset = offset
+        self._append(
+            {"origin": origin, "process_type": process_type, "country": country, "offset": offset}
+        )
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        assert self._fh is not None
+        # One write per entry, so a crash cannot separate a line from its newline.
+        self._fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def truncate_output(self) -> None:
+        """
+        Cut the output file back to the last journaled record.
+        """
+        output_path = self.header["output_path"]
+        if not os.path.exists(output_path):
+            if self.last_offset:
+                raise FileNotFoundError(f"Output file for run {self.run_id} is missing: {output_path}")
+            return
+        if os.path.getsize(output_path) != self.last_offset:
+            LOGGER.info("Truncating %s to offset %d.", output_path, self.last_offset)
+            with open(output_path, "r+b") as f:
+                f.truncate(self.last_offset)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
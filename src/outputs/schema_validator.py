@@ -1,8 +1,12 @@
 import logging
-from typing import Any, Dict, Iterable, List
+import time
+from typing import Any, Dict, Iterable, List, Optional
 
 from jsonschema import Draft7Validator
 
+from src.parsers.record import EMPTY_SECTION, EMPTY_STATS, SpyfuRecord
+from src.services import metrics, profiler
+
 LOGGER = logging.getLogger(__name__)
 
 RECORD_SCHEMA: Dict[str, Any] = {
@@ -39,16 +43,160 @@ RECORD_SCHEMA: Dict[str, Any] = {
     "additionalProperties": True,
 }
 
-def validate_records(records: Iterable[Dict[str, Any]]) -> None:
-    data: List[Dict[str, Any]] = list(records)
-    validator = Draft7Validator(RECORD_SCHEMA)
+VALIDATION_MODES = ("full", "sampled", "fast")
+
+_STRING_FIELDS = ("origin", "domain", "process_type", "run_id")
+_LIST_FIELDS = (
+    "top_competitors",
+    "most_valuable_keywords",
+    "most_successful_keywords",
+    "newly_ranked_keywords",
+    "top_ads",
+)
+
+_VALIDATOR: Optional[Draft7Validator] = None
+
+def _get_validator() -> Draft7Validator:
+    global _VALIDATOR
+    if _VALIDATOR is None:
+        _VALIDATOR = Draft7Validator(RECORD_SCHEMA)
+    return _VALIDATOR
+
+def _fast_check_record(record: SpyfuRecord) -> bool:
+    for key in _STRING_FIELDS:
+        if type(getattr(record, key)) is not str:
+            return False
+    for key in _LIST_FIELDS:
+        value = getattr(record, key)
+        if value is not EMPTY_SECTION and type(value) is not list:
+            return False
+    if record.domain_stats is not EMPTY_STATS and type(record.domain_stats) is not dict:
+        return False
+    if record.country is not None and type(record.country) is not str:
+        return False
+    if type(record.timestamp) not in (int, float):
+        return False
+    return record.notes is None or type(record.notes) is str
+
+def _fast_check(record: Any) -> bool:
+    """
+    Hand-written equivalent of ``RECORD_SCHEMA`` for the ``build_record`` shape.
+
+    Returns ``True`` when the record is certainly valid. ``False`` only means
+    the record needs the full validator, which then produces the error messages.
+    """
+    if type(record) is SpyfuRecord:
+        return _fast_check_record(record)
+    if type(record) is not dict:
+        return False
+    try:
+        for key in _STRING_FIELDS:
+            if type(record[key]) is not str:
+                return False
+        for key in _LIST_FIELDS:
+            if type(record[key]) is not list:
+                return False
+        if type(record["domain_stats"]) is not dict:
+            return False
+        country = record["country"]
+        if country is not None and type(country) is not str:
+            return False
+        if type(record["timestamp"]) not in (int, float):
+            return False
+    except KeyError:
+        return False
+    notes = record.get("notes")
+    return notes is None or type(notes) is str
+
+class RecordValidator:
+    """
+    Reusable, incremental record validator.
+
+    ``mode="full"`` runs the precompiled JSON schema on every record.
+    ``mode="sampled"`` runs it on one record in ``sample_every``.
+    ``mode="fast"`` runs a hand-written type check on every record and falls
+    back to the schema only for records that fail it, so error messages are
+    the same as in full mode. Time spent validating is accumulated per mode;
+    see ``stats()``.
+    """
+
+    def __init__(self, mode: str = "full", sample_every: int = 100) -> None:
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unsupported validation mode: {mode}")
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self.seen = 0
+        self.checked = 0
+        self.invalid = 0
+        self.seconds = 0.0
+        self._schema = _get_validator()
+
+    def errors(self, record: Dict[str, Any], index: int = 0) -> List[str]:
+        """
+        Validate one record and return its error messages (empty when valid
+        or skipped by sampling).
+        """
+        self.seen += 1
+        if self.mode == "sampled" and (self.seen - 1) % self.sample_every:
+            return []
+        started = time.perf_counter()
+        self.checked += 1
+        with profiler.section("validate"):
+            if self.mode == "fast" and _fast_check(record):
+                errors: List[str] = []
+            else:
+                instance = record.to_dict() if isinstance(record, SpyfuRecord) else record
+                errors = [f"Record #{index}: {e.message}" for e in self._schema.iter_errors(instance)]
+        elapsed = time.perf_counter() - started
+        self.seconds += elapsed
+        metrics.observe("spyfu_stage_seconds", elapsed, stage="validate")
+        if errors:
+            self.invalid += 1
+            metrics.inc("spyfu_records_invalid_total")
+        return errors
+
+    def validate(self, record: Dict[str, Any], index: int = 0) -> None:
+        errors = self.errors(record, index)
+        if errors:
+            for e in errors:
+                LOGGER.error("Schema validation error: %s", e)
+            raise ValueError(f"Schema validation failed for {len(errors)} field(s).")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "seen": self.seen,
+            "checked": self.checked,
+            "invalid": self.invalid,
+            "seconds": round(self.seconds, 6),
+            "us_per_record": round(self.seconds * 1e6 / self.checked, 2) if self.checked else 0.0,
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        LOGGER.info(
+            "Validation (%s): %d of %d record(s) checked, %d invalid, %.3fs (%.1f us/record).",
+            stats["mode"],
+            stats["checked"],
+            stats["seen"],
+            stats["invalid"],
+            stats["seconds"],
+            stats["us_per_record"],
+        )
+
+def validate_records(
+    records: Iterable[Dict[str, Any]],
+    mode: str = "full",
+    sample_every: int = 100,
+    validator: Optional[RecordValidator] = None,
+) -> None:
+    validator = validator or RecordValidator(mode, sample_every)
     errors: List[str] = []
 
-    for idx, record in enumerate(data):
-        for error in validator.iter_errors(record):
-            errors.append(f"Record #{idx}: {error.message}")
+    for idx, record in enumerate(records):
+        errors.extend(validator.errors(record, idx))
 
     if errors:
         for e in errors:
             LOGGER.error("Schema validation error: %s", e)
-        raise ValueError(f"Schema validation failed for {len(errors)} field(s).")
\ No newline at end of file
+        raise ValueError(f"Schema validation failed for {len(errors)} field(s).")
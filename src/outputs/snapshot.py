@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.outputs.exporters import JsonLinesWriter
+from src.outputs.merge import iter_records
+from src.parsers.record import SpyfuRecord, record_from_dict
+
+LOGGER = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[str, Optional[str], str]
+
+# Keyword sections compared by position in the diff stream.
+_KEYWORD_SECTIONS = ("most_valuable_keywords", "newly_ranked_keywords")
+
+class Snapshot:
+    """
+    The records of a previous run indexed by ``(domain, country, process_type)``.
+
+    When the run wrote a domain more than once (several origins), the
+    newest record wins.
+    """
+
+    def __init__(self, records: Iterable[Mapping[str, Any]] = ()) -> None:
+        self.records: Dict[SnapshotKey, SpyfuRecord] = {}
+        for values in records:
+            record = values if isinstance(values, SpyfuRecord) else record_from_dict(values)
+            key = (record.domain, record.country, record.process_type)
+            current = self.records.get(key)
+            if current is None or record.timestamp >= current.timestamp:
+                self.records[key] = record
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        """
+        Index a JSON, JSON Lines or work queue output file.
+        """
+        snapshot = cls(iter_records(path))
+        LOGGER.info("Loaded %d previous records from %s", len(snapshot), path)
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, domain: str, country: Optional[str], process_type: str) -> Optional[SpyfuRecord]:
+        return self.records.get((domain, country, process_type))
+
+def _keyed(items: Iterable[Any], field: str) -> Dict[Any, Any]:
+    return {item.get(field): item for item in items if isinstance(item, dict) and item.get(field)}
+
+def diff_records(old: Mapping[str, Any], new: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Changes from ``old`` to ``new``: competitors gained and lost, keyword
+    positions that moved (``from``/``to`` is ``None`` for keywords that
+    appeared or dropped out) and new ads. Empty when nothing changed.
+    """
+    changes: Dict[str, Any] = {}
+
+    old_rivals = _keyed(old["top_competitors"], "domain")
+    new_rivals = _keyed(new["top_competitors"], "domain")
+    added = [domain for domain in new_rivals if domain not in old_rivals]
+    lost = [domain for domain in old_rivals if domain not in new_rivals]
+    if added:
+        changes["competitors_added"] = added
+    if lost:
+        changes["competitors_lost"] = lost
+
+    moves: List[Dict[str, Any]] = []
+    for section in _KEYWORD_SECTIONS:
+        before = {k: item.get("position") for k, item in _keyed(old[section], "keyword").items()}
+        after = {k: item.get("position") for k, item in _keyed(new[section], "keyword").items()}
+        for keyword, position in after.items():
+            if before.get(keyword, object()) != position:
+                moves.append(
+                    {"section": section, "keyword": keyword, "from": before.get(keyword), "to": position}
+                )
+        for keyword, position in before.items():
+            if keyword not in after:
+                moves.append({"section": section, "keyword": keyword, "from": position, "to": None})
+    if moves:
+        changes["keyword_positions"] = moves
+
+    old_ads = {
+        (ad.get("headline"), ad.get("landing_page_url")) for ad in old["top_ads"] if isinstance(ad, dict)
+    }
+    new_ads = [
+        ad
+        for ad in new["top_ads"]
+        if isinstance(ad, dict) and (ad.get("headline"), ad.get("landing_page_url")) not in old_ads
+    ]
+    if new_ads:
+        changes["ads_added"] = new_ads
+    return changes
+
+class DeltaRun:
+    """
+    Incremental run against a previous ``Snapshot``.
+
+    ``fresh_record`` returns the previous record when it is younger than
+    ``max_age_seconds``; the runner copies it forward instead of fetching
+    the domain again. It keeps its original timestamp and run id, so it
+    becomes stale on schedule. Every fetched record is passed to ``observe``.
+    It is compared with the previous record and one diff line per changed
+    (or new) domain is written to ``diff_path`` as JSON Lines.
+    """
+
+    def __init__(
+        self,
+        snapshot: Snapshot,
+        max_age_seconds: float = 86400,
+        diff_path: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        self.snapshot = snapshot
+        self.max_age_seconds = max_age_seconds
+        self.cutoff_ms = ((now if now is not None else time.time()) - max_age_seconds) * 1000
+        self.carried = 0
+        self.fetched = 0
+        self.changed = 0
+        self._lock = threading.Lock()
+        self._diff = JsonLinesWriter(diff_path) if diff_path else None
+
+    def fresh_record(self, domain: str, country: Optional[str], process_type: str) -> Optional[SpyfuRecord]:
+        record = self.snapshot.get(domain, country, process_type)
+        if record is None or record.timestamp < self.cutoff_ms:
+            return None
+        with self._lock:
+            self.carried += 1
+        return record
+
+    def observe(self, record: Mapping[str, Any]) -> None:
+        previous = self.snapshot.get(record["domain"], record["country"], record["process_type"])
+        if previous is None:
+            entry: Dict[str, Any] = {"status": "new"}
+        else:
+            entry = diff_records(previous, record)
+            if not entry:
+                with self._lock:
+                    self.fetched += 1
+                return
+            entry = {"status": "changed", "previous_timestamp": previous.timestamp, **entry}
+        line = {
+            "domain": record["domain"],
+            "country": record["country"],
+            "process_type": record["process_type"],
+            "timestamp": record["timestamp"],
+            **entry,
+        }
+        with self._lock:
+            self.fetched += 1
+            self.changed += 1
+            if self._diff is not None:
+                self._diff.write(line)
+
+    def stats(self) -> Dict[str, int]:
+        return {"carried": self.carried, "fetched": self.fetched, "changed": self.changed}
+
+    def close(self) -> None:
+        if self._diff is not None:
+            self._diff.close()
+            LOGGER.info("Wrote %d diff entries to %s", self._diff.count, self._diff.output_path)
+        LOGGER.info(
+            "Delta run: %d domain(s) copied forward, %d fetched, %d new or changed.",
+            self.carried,
+            self.fetched,
+            self.changed,
+        )
@@ -0,0 +1,168 @@
+import functools
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 65536
+
+def extract_host(url: str) -> str:
+    """
+    Return the host part of ``url`` (scheme optional) without parsing the
+    rest of it. Userinfo, port and any IPv6 brackets are removed.
+    """
+    rest = url.strip()
+    scheme_end = rest.find("://")
+    if scheme_end != -1:
+        rest = rest[scheme_end + 3 :]
+    elif rest.startswith("//"):
+        rest = rest[2:]
+
+    end = len(rest)
+    for separator in "/?#":
+        index = rest.find(separator, 0, end)
+        if index != -1:
+            end = index
+    netloc = rest[:end]
+    host = netloc[netloc.rfind("@") + 1 :]
+
+    if host.startswith("["):
+        close = host.find("]")
+        if close == -1:
+            raise ValueError(f"Invalid IPv6 URL: {url}")
+        return host[1:close]
+    colon = host.rfind(":")
+    if colon != -1:
+        host = host[:colon]
+    return host
+
+def canonical_host(host: str) -> str:
+    """
+    Lowercase ``host``, drop a trailing dot and IDNA-encode non-ASCII labels,
+    so ``WWW.Example.COM.`` and ``www.example.com`` compare equal.
+    """
+    host = host.lower().rstrip(".")
+    if host.isascii():
+        return host
+    try:
+        return host.encode("idna").decode("ascii")
+    except UnicodeError as exc:
+        raise ValueError(f"Invalid internationalized host: {host}") from exc
+
+def _is_ip(host: str) -> bool:
+    return ":" in host or host.replace(".", "").isdigit()
+
+class PublicSuffixList:
+    """
+    Rules of a Mozilla public suffix list file (``public_suffix_list.dat``).
+
+    The list is read from disk only; nothing is downloaded. Wildcard
+    (``*.ck``) and exception (``!www.ck``) rules are supported. A host that
+    matches no rule falls back to the implicit ``*`` rule, so its last label
+    is treated as the suffix.
+    """
+
+    def __init__(self, rules: Iterable[str]) -> None:
+        exact: Set[str] = set()
+        wildcards: Set[str] = set()
+        exceptions: Set[str] = set()
+        for rule in rules:
+            if rule.startswith("!"):
+                exceptions.add(canonical_host(rule[1:]))
+            elif rule.startswith("*."):
+                wildcards.add(canonical_host(rule[2:]))
+            else:
+                exact.add(canonical_host(rule))
+        self.exact: FrozenSet[str] = frozenset(exact)
+        self.wildcards: FrozenSet[str] = frozenset(wildcards)
+        self.exceptions: FrozenSet[str] = frozenset(exceptions)
+
+    @classmethod
+    def load(cls, path: str) -> "PublicSuffixList":
+        rules: List[str] = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("//"):
+                    rules.append(line.split()[0])
+        LOGGER.info("Loaded %d public suffix rules from %s", len(rules), path)
+        return cls(rules)
+
+    def public_suffix(self, host: str) -> str:
+        labels = host.split(".")
+        for index in range(len(labels)):
+            candidate = ".".join(labels[index:])
+            if candidate in self.exceptions:
+                return ".".join(labels[index + 1 :])
+            if candidate in self.exact:
+                return candidate
+            if index + 1 < len(labels) and ".".join(labels[index + 1 :]) in self.wildcards:
+                return candidate
+        return labels[-1]
+
+    def registrable_domain(self, host: str) -> str:
+        """
+        The public suffix plus one label (``blog.x.co.uk`` -> ``x.co.uk``).
+        A host that is itself a public suffix is returned unchanged.
+        """
+        suffix = self.public_suffix(host)
+        if len(suffix) >= len(host):
+            return host
+        head = host[: -len(suffix) - 1]
+        return f"{head.rsplit('.', 1)[-1]}.{suffix}"
+
+class DomainNormalizer:
+    """
+    Maps input URLs to the domain that is queried.
+
+    Hosts are canonicalized (lowercase, IDNA) and a leading ``www.`` is
+    removed. With a ``suffix_list`` every host is reduced to its registrable
+    domain instead, so ``blog.x.co.uk`` and ``x.co.uk`` share one domain.
+    Results are memoized per host in a bounded LRU cache of ``cache_size``
+    entries. Only the host is cut out of each URL, which is cheap string
+    work, so even inputs where every URL is different hit the cache whenever
+    the host repeats.
+    """
+
+    def __init__(
+        self,
+        suffix_list: Optional[PublicSuffixList] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.suffix_list = suffix_list
+        self._domain_for_host = functools.lru_cache(maxsize=max(1, cache_size))(self._resolve)
+
+    def _resolve(self, host: str) -> str:
+        host = canonical_host(host)
+        if self.suffix_list is not None and host and not _is_ip(host):
+            return self.suffix_list.registrable_domain(host)
+        if host.startswith("www."):
+            host = host[4:]
+        return host
+
+    def normalize(self, url: str) -> str:
+        host = extract_host(url)
+        return self._domain_for_host(host) if host else url.strip()
+
+    def normalize_batch(self, urls: Iterable[str]) -> List[str]:
+        """
+        Normalize many URLs at once, in order.
+        """
+        normalize = self.normalize
+        return [normalize(url) for url in urls]
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self._domain_for_host.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+@functools.lru_cache(maxsize=8)
+def get_normalizer(
+    suffix_list_path: Optional[str] = None,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> DomainNormalizer:
+    """
+    Shared normalizer for a configuration, so its cache lives across runs
+    and chunks and the suffix list is read once.
+    """
+    suffix_list = PublicSuffixList.load(suffix_list_path) if suffix_list_path else None
+    return DomainNormalizer(suffix_list, cache_size)
@@ -1,26 +1,124 @@
 import json
 import logging
 import re
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, List, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
-JSON_BLOCK_RE = re.compile(r"(\{.*\})", re.DOTALL)
+SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+SCRIPT_TYPE_RE = re.compile(r"""\btype\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+JSON_SCRIPT_TYPES = ("application/json", "application/ld+json")
+
+# An object can only be JSON if its first non-blank character opens a key or
+# closes it; this rejects CSS rules and JS object literals without decoding.
+_OBJECT_START_RE = re.compile(r"\{(?=\s*[\"}])")
+_BRACE_OR_QUOTE_RE = re.compile(r'[{}"]')
+# JSON strings cannot span lines, so a quote left open at the end of a line
+# is treated as a stray character rather than swallowing the rest of the text.
+_STRING_TAIL_RE = re.compile(r'(?:[^"\\\n]|\\.)*"')
+
+def iter_script_blocks(html: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield ``(type, body)`` for every ``<script>`` element; ``type`` is
+    lowercased and empty when the tag has none.
+    """
+    for match in SCRIPT_RE.finditer(html):
+        type_match = SCRIPT_TYPE_RE.search(match.group(1))
+        yield (type_match.group(1).lower() if type_match else ""), match.group(2)
+
+def _closing_braces(text: str) -> Dict[int, int]:
+    """
+    Map the index of every ``{`` that gets closed to the index just past its
+    matching ``}``, in one forward pass with a stack; braces inside strings
+    are skipped. Unclosed braces are absent.
+    """
+    closes: Dict[int, int] = {}
+    opened: List[int] = []
+    pos = 0
+    while True:
+        match = _BRACE_OR_QUOTE_RE.search(text, pos)
+        if match is None:
+            return closes
+        pos = match.end()
+        char = match.group()
+        if char == '"':
+            tail = _STRING_TAIL_RE.match(text, pos)
+            if tail is not None:
+                pos = tail.end()
+        elif char == "{":
+            opened.append(match.start())
+        elif opened:
+            closes[opened.pop()] = pos
+
+def iter_json_objects(text: str) -> Iterator[Any]:
+    """
+    Yield every non-empty JSON object embedded in ``text`` (for example
+    ``window.__DATA__ = {...};``), left to right.
+
+    Braces are matched once for the whole text, and only candidates that
+    are closed are decoded, each as its own slice. A candidate that is not
+    JSON therefore costs its own length, not the length of the text around
+    it (which is what ``JSONDecodeError`` spends computing line numbers),
+    and an unclosed one costs nothing. Each decoded object is skipped over
+    whole, so nested objects are not reported separately.
+    """
+    closes = _closing_braces(text)
+    pos = 0
+    while True:
+        match = _OBJECT_START_RE.search(text, pos)
+        if match is None:
+            return
+        start = match.start()
+        end = closes.get(start)
+        if end is None:
+            pos = start + 1
+            continue
+        try:
+            value = json.loads(text[start:end])
+        except json.JSONDecodeError:
+            pos = start + 1
+            continue
+        except RecursionError:
+            # Too deeply nested to decode; so is everything inside it.
+            pos = end
+            continue
+        if value:
+            yield value
+        pos = end
+
+def extract_all_json_from_html(html: str) -> List[Any]:
+    """
+    Return every JSON payload embedded in an HTML document, in document order.
+
+    ``application/json`` and ``application/ld+json`` scripts are decoded
+    whole (any JSON value). The other scripts are scanned for JSON objects.
+    A document without script tags is scanned as a whole, which covers a
+    bare JSON body served as HTML.
+    """
+    payloads: List[Any] = []
+    found_script = False
+    for script_type, body in iter_script_blocks(html):
+        found_script = True
+        if script_type in JSON_SCRIPT_TYPES:
+            try:
+                payloads.append(json.loads(body))
+            except (json.JSONDecodeError, RecursionError):
+                LOGGER.warning("Failed to decode %s script block from HTML.", script_type)
+        elif script_type in ("", "text/javascript", "application/javascript", "module"):
+            payloads.extend(iter_json_objects(body))
+    if not found_script:
+        payloads.extend(iter_json_objects(html))
+    return payloads
 
 def extract_json_from_html(html: str) -> Any:
     """
     Very small helper that tries to extract the first JSON object from an HTML document.
 
-    This is a fallback for cases where SpyFu exposes JSON inside script tags.
+    This is a fallback for cases where SpyFu exposes JSON inside script tags;
+    see ``extract_all_json_from_html`` for every payload.
     """
-    match = JSON_BLOCK_RE.search(html)
-    if not match:
+    payloads = extract_all_json_from_html(html)
+    if not payloads:
         LOGGER.debug("No JSON block found in HTML.")
         return {}
-
-    block = match.group(1)
-    try:
-        return json.loads(block)
-    except json.JSONDecodeError:
-        LOGGER.warning("Failed to decode JSON block from HTML snippet.")
-        return {}
\ No newline at end of file
+    return payloads[0]
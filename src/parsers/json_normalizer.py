@@ -1,54 +1,83 @@
 import time
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.parsers.domain_normalizer import get_normalizer
+from src.parsers.record import EMPTY_SECTION, EMPTY_STATS, SECTION_FIELDS, SpyfuRecord
+from src.services import metrics, profiler
+
 
 def normalize_domain(url: str) -> str:
     """
     Normalize input URL to a root domain.
-    """
-    parsed = urlparse(url.strip())
-    if not parsed.scheme:
-        parsed = urlparse("https://" + url.strip())
 
-    host = parsed.hostname or ""
-    if host.startswith("www."):
-        host = host[4:]
-    return host or url.strip()
+    Uses the shared default ``DomainNormalizer``; the runner uses one built
+    from settings instead (see ``build_domain_normalizer``).
+    """
+    return get_normalizer().normalize(url)
 
 def build_record(
     origin: str,
     domain: str,
     country: Optional[str],
     process_type: str,
-    top_competitors: List[Dict[str, Any]],
-    most_valuable_keywords: List[Dict[str, Any]],
-    most_successful_keywords: List[Dict[str, Any]],
-    newly_ranked_keywords: List[Dict[str, Any]],
-    top_ads: List[Dict[str, Any]],
-    domain_stats: Dict[str, Any],
+    top_competitors: Optional[List[Dict[str, Any]]] = None,
+    most_valuable_keywords: Optional[List[Dict[str, Any]]] = None,
+    most_successful_keywords: Optional[List[Dict[str, Any]]] = None,
+    newly_ranked_keywords: Optional[List[Dict[str, Any]]] = None,
+    top_ads: Optional[List[Dict[str, Any]]] = None,
+    domain_stats: Optional[Dict[str, Any]] = None,
     timestamp_ms: Optional[int] = None,
     run_id: Optional[str] = None,
     notes: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> SpyfuRecord:
     """
     Build a normalized record matching the README example schema.
+
+    Sections that are omitted or empty share one immutable empty value.
     """
-    if timestamp_ms is None:
-        timestamp_ms = int(time.time() * 1000)
-
-    record: Dict[str, Any] = {
-        "origin": origin,
-        "domain": domain,
-        "country": country,
-        "process_type": process_type,
-        "top_competitors": top_competitors or [],
-        "most_valuable_keywords": most_valuable_keywords or [],
-        "most_successful_keywords": most_successful_keywords or [],
-        "newly_ranked_keywords": newly_ranked_keywords or [],
-        "top_ads": top_ads or [],
-        "domain_stats": domain_stats or {},
-        "timestamp": int(timestamp_ms),
-        "run_id": run_id or "",
-        "notes": notes,
-    }
-    return record
\ No newline at end of file
+    with metrics.stage("build_record"), profiler.section("normalize"):
+        if timestamp_ms is None:
+            timestamp_ms = int(time.time() * 1000)
+
+        record = SpyfuRecord(
+            origin,
+            domain,
+            country,
+            process_type,
+            top_competitors or EMPTY_SECTION,
+            most_valuable_keywords or EMPTY_SECTION,
+            most_successful_keywords or EMPTY_SECTION,
+            newly_ranked_keywords or EMPTY_SECTION,
+            top_ads or EMPTY_SECTION,
+            domain_stats or EMPTY_STATS,
+            int(timestamp_ms),
+            run_id or "",
+            notes,
+        )
+    return record
+
+def merge_records(
+    records: Sequence[SpyfuRecord],
+    process_type: str,
+    notes: Optional[str] = None,
+) -> SpyfuRecord:
+    """
+    Combine single-process records for the same domain into one record.
+
+    Each section is taken from the first record that filled it in.
+    """
+    first = records[0]
+    sections: Dict[str, Any] = {}
+    for field in SECTION_FIELDS:
+        sections[field] = next((r[field] for r in records if r.get(field)), None)
+
+    return build_record(
+        origin=first["origin"],
+        domain=first["domain"],
+        country=first["country"],
+        process_type=process_type,
+        timestamp_ms=max(r["timestamp"] for r in records),
+        run_id=first["run_id"],
+        notes=notes,
+        **sections,
+    )
@@ -0,0 +1,162 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+SECTION_FIELDS = (
+    "top_competitors",
+    "most_valuable_keywords",
+    "most_successful_keywords",
+    "newly_ranked_keywords",
+    "top_ads",
+    "domain_stats",
+)
+
+RECORD_FIELDS = (
+    "origin",
+    "domain",
+    "country",
+    "process_type",
+    *SECTION_FIELDS,
+    "timestamp",
+    "run_id",
+    "notes",
+)
+
+# Shared, immutable stand-ins for sections a record does not fill; every
+# record that lacks a section points at the same object.
+EMPTY_SECTION: Sequence[Any] = ()
+EMPTY_STATS: Mapping = MappingProxyType({})
+
+_FIELD_SET = frozenset(RECORD_FIELDS)
+
+class SpyfuRecord(Mapping):
+    """
+    One output record, stored in ``__slots__`` instead of a dict.
+
+    Sections a processor does not fill point at the shared ``EMPTY_SECTION``
+    / ``EMPTY_STATS`` sentinels (``build_record`` substitutes them for empty
+    values), so a single-process record carries no empty containers. The
+    record is a ``Mapping`` with the same keys, in the same order, as the
+    README schema; it has no item assignment, and although its slots can be
+    set, records are shared between origins, so change them with
+    ``replace()``. ``record["top_ads"]`` returns a new empty list for an
+    empty section, so code written for plain dicts keeps working.
+    ``to_dict()`` builds the plain dict only when one is needed (for JSON
+    encoding or schema validation); ``sparse=True`` leaves out empty
+    sections.
+    """
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        process_type: str,
+        top_competitors: Sequence[Any] = EMPTY_SECTION,
+        most_valuable_keywords: Sequence[Any] = EMPTY_SECTION,
+        most_successful_keywords: Sequence[Any] = EMPTY_SECTION,
+        newly_ranked_keywords: Sequence[Any] = EMPTY_SECTION,
+        top_ads: Sequence[Any] = EMPTY_SECTION,
+        domain_stats: Mapping = EMPTY_STATS,
+        timestamp: int = 0,
+        run_id: str = "",
+        notes: Optional[str] = None,
+    ) -> None:
+        self.origin = origin
+        self.domain = domain
+        self.country = country
+        self.process_type = process_type
+        self.top_competitors = top_competitors
+        self.most_valuable_keywords = most_valuable_keywords
+        self.most_successful_keywords = most_successful_keywords
+        self.newly_ranked_keywords = newly_ranked_keywords
+        self.top_ads = top_ads
+        self.domain_stats = domain_stats
+        self.timestamp = timestamp
+        self.run_id = run_id
+        self.notes = notes
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is EMPTY_SECTION:
+            return []
+        if value is EMPTY_STATS:
+            return {}
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RECORD_FIELDS)
+
+    def __len__(self) -> int:
+        return len(RECORD_FIELDS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET
+
+    def __repr__(self) -> str:
+        return (
+            f"SpyfuRecord(origin={self.origin!r}, domain={self.domain!r}, "
+            f"process_type={self.process_type!r})"
+        )
+
+    def __reduce__(self) -> Any:
+        # The stats sentinel cannot be pickled; empty sections travel as
+        # plain empties and are swapped back for the sentinels on load.
+        return (record_from_dict, (self.to_dict(),))
+
+    def replace(self, **changes: Any) -> "SpyfuRecord":
+        """
+        Copy with some fields changed; sections are shared, not copied.
+        """
+        values = {name: getattr(self, name) for name in RECORD_FIELDS}
+        values.update(changes)
+        return SpyfuRecord(**values)
+
+    def to_dict(self, sparse: bool = False) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name in RECORD_FIELDS:
+            value = getattr(self, name)
+            if value is EMPTY_SECTION:
+                if sparse:
+                    continue
+                value = []
+            elif value is EMPTY_STATS:
+                if sparse:
+                    continue
+                value = {}
+            out[name] = value
+        return out
+
+_DEFAULTS: Dict[str, Any] = {"timestamp": 0, "run_id": "", "notes": None}
+
+def record_from_dict(values: Mapping) -> SpyfuRecord:
+    """
+    ``SpyfuRecord`` from a record dict, e.g. one read back from an output
+    file. Missing or empty sections (as in sparse output) become the shared
+    sentinels; keys outside the schema are dropped.
+    """
+    fields: Dict[str, Any] = {}
+    for name in RECORD_FIELDS:
+        if name in SECTION_FIELDS:
+            value = values.get(name)
+            if name not in values or (value is not None and not value):
+                value = EMPTY_STATS if name == "domain_stats" else EMPTY_SECTION
+            fields[name] = value
+        else:
+            fields[name] = values.get(name, _DEFAULTS.get(name))
+    return SpyfuRecord(**fields)
+
+def as_dict(record: Mapping, sparse: bool = False) -> Dict[str, Any]:
+    """
+    Plain dict for a ``SpyfuRecord`` or a record dict (e.g. read back from
+    a JSON file). ``sparse`` drops empty sections.
+    """
+    if isinstance(record, SpyfuRecord):
+        return record.to_dict(sparse)
+    if sparse:
+        return {k: v for k, v in record.items() if not (k in SECTION_FIELDS and not v)}
+    return record  # type: ignore[return-value]
@@ -1,9 +1,10 @@
 import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from src.services.spyfu_client import SpyfuClient
 from src.parsers.json_normalizer import build_record
+from src.parsers.record import SpyfuRecord
 
 LOGGER = logging.getLogger(__name__)
 
@@ -17,21 +18,36 @@ class AdsProcessor:
         domain: str,
         country: Optional[str],
         run_id: str,
-    ) -> Dict[str, Any]:
+    ) -> SpyfuRecord:
         LOGGER.debug("Fetching top ads for %s", domain)
         ads = self.client.get_top_ads(domain, country)
+        return self._build(origin, domain, country, run_id, ads)
 
+    async def process_async(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+    ) -> SpyfuRecord:
+        LOGGER.debug("Fetching top ads for %s", domain)
+        ads = await self.client.get_top_ads(domain, country)
+        return self._build(origin, domain, country, run_id, ads)
+
+    def _build(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+        ads: List[Dict[str, Any]],
+    ) -> SpyfuRecord:
         record = build_record(
             origin=origin,
             domain=domain,
             country=country,
             process_type="top_ads",
-            top_competitors=[],
-            most_valuable_keywords=[],
-            most_successful_keywords=[],
-            newly_ranked_keywords=[],
             top_ads=ads,
-            domain_stats={},
             timestamp_ms=int(time.time() * 1000),
             run_id=run_id,
             notes=None,
@@ -1,9 +1,10 @@
 import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from src.services.spyfu_client import SpyfuClient
 from src.parsers.json_normalizer import build_record
+from src.parsers.record import SpyfuRecord
 
 LOGGER = logging.getLogger(__name__)
 
@@ -17,21 +18,36 @@ class CompetitorsProcessor:
         domain: str,
         country: Optional[str],
         run_id: str,
-    ) -> Dict[str, Any]:
+    ) -> SpyfuRecord:
         LOGGER.debug("Fetching top competitors for %s", domain)
         competitors = self.client.get_top_competitors(domain, country)
+        return self._build(origin, domain, country, run_id, competitors)
 
+    async def process_async(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+    ) -> SpyfuRecord:
+        LOGGER.debug("Fetching top competitors for %s", domain)
+        competitors = await self.client.get_top_competitors(domain, country)
+        return self._build(origin, domain, country, run_id, competitors)
+
+    def _build(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+        competitors: List[Dict[str, Any]],
+    ) -> SpyfuRecord:
         record = build_record(
             origin=origin,
             domain=domain,
             country=country,
             process_type="top_competitors",
             top_competitors=competitors,
-            most_valuable_keywords=[],
-            most_successful_keywords=[],
-            newly_ranked_keywords=[],
-            top_ads=[],
-            domain_stats={},
             timestamp_ms=int(time.time() * 1000),
             run_id=run_id,
             notes=None,
@@ -4,6 +4,7 @@ from typing import Any, Dict, Optional
 
 from src.services.spyfu_client import SpyfuClient
 from src.parsers.json_normalizer import build_record
+from src.parsers.record import SpyfuRecord
 
 LOGGER = logging.getLogger(__name__)
 
@@ -17,20 +18,35 @@ class DomainStatsProcessor:
         domain: str,
         country: Optional[str],
         run_id: str,
-    ) -> Dict[str, Any]:
+    ) -> SpyfuRecord:
         LOGGER.debug("Fetching domain stats for %s", domain)
         stats = self.client.get_domain_stats(domain, country)
+        return self._build(origin, domain, country, run_id, stats)
 
+    async def process_async(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+    ) -> SpyfuRecord:
+        LOGGER.debug("Fetching domain stats for %s", domain)
+        stats = await self.client.get_domain_stats(domain, country)
+        return self._build(origin, domain, country, run_id, stats)
+
+    def _build(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+        stats: Dict[str, Any],
+    ) -> SpyfuRecord:
         record = build_record(
             origin=origin,
             domain=domain,
             country=country,
             process_type="domain_stats",
-            top_competitors=[],
-            most_valuable_keywords=[],
-            most_successful_keywords=[],
-            newly_ranked_keywords=[],
-            top_ads=[],
             domain_stats=stats,
             timestamp_ms=int(time.time() * 1000),
             run_id=run_id,
@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional
 
 from src.services.spyfu_client import SpyfuClient
 from src.parsers.json_normalizer import build_record
+from src.parsers.record import SpyfuRecord
 
 LOGGER = logging.getLogger(__name__)
 
@@ -26,9 +27,52 @@ class KeywordsProcessor:
         domain: str,
         country: Optional[str],
         run_id: str,
-    ) -> Dict[str, Any]:
+    ) -> SpyfuRecord:
         LOGGER.debug("Fetching most valuable keywords for %s", domain)
         valuable = self.client.get_most_valuable_keywords(domain, country)
+        return self._build_most_valuable(origin, domain, country, run_id, valuable)
+
+    async def process_most_valuable_async(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+    ) -> SpyfuRecord:
+        LOGGER.debug("Fetching most valuable keywords for %s", domain)
+        valuable = await self.client.get_most_valuable_keywords(domain, country)
+        return self._build_most_valuable(origin, domain, country, run_id, valuable)
+
+    def process_newly_ranked(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+    ) -> SpyfuRecord:
+        LOGGER.debug("Fetching newly ranked keywords for %s", domain)
+        newly_ranked = self.client.get_newly_ranked_keywords(domain, country)
+        return self._build_newly_ranked(origin, domain, country, run_id, newly_ranked)
+
+    async def process_newly_ranked_async(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+    ) -> SpyfuRecord:
+        LOGGER.debug("Fetching newly ranked keywords for %s", domain)
+        newly_ranked = await self.client.get_newly_ranked_keywords(domain, country)
+        return self._build_newly_ranked(origin, domain, country, run_id, newly_ranked)
+
+    def _build_most_valuable(
+        self,
+        origin: str,
+        domain: str,
+        country: Optional[str],
+        run_id: str,
+        valuable: List[Dict[str, Any]],
+    ) -> SpyfuRecord:
         successful = self._derive_successful_keywords(valuable)
 
         record = build_record(
@@ -36,39 +80,28 @@ class KeywordsProcessor:
             domain=domain,
             country=country,
             process_type="most_valuable_keywords",
-            top_competitors=[],
             most_valuable_keywords=valuable,
             most_successful_keywords=successful,
-            newly_ranked_keywords=[],
-            top_ads=[],
-            domain_stats={},
             timestamp_ms=int(time.time() * 1000),
             run_id=run_id,
             notes=None,
         )
         return record
 
-    def process_newly_ranked(
+    def _build_newly_ranked(
         self,
         origin: str,
         domain: str,
         country: Optional[str],
         run_id: str,
-    ) -> Dict[str, Any]:
-        LOGGER.debug("Fetching newly ranked keywords for %s", domain)
-        newly_ranked = self.client.get_newly_ranked_keywords(domain, country)
-
+        newly_ranked: List[Dict[str, Any]],
+    ) -> SpyfuRecord:
         record = build_record(
             origin=origin,
             domain=domain,
             country=country,
             process_type="newly_ranked_keywords",
-            top_competitors=[],
-            most_valuable_keywords=[],
-            most_successful_keywords=[],
             newly_ranked_keywords=newly_ranked,
-            top_ads=[],
-            domain_stats={},
             timestamp_ms=int(time.time() * 1000),
             run_id=run_id,
             notes=None,
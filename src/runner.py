@@ -1,21 +1,58 @@
 import argparse
+import asyncio
+import itertools
 import json
 import logging
 import logging.config
 import os
+import secrets
+import sys
 import time
-from typing import Any, Dict, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+from src.services import json_codec, metrics, profiler
+from src.services.api_server import ApiServer
 from src.services.spyfu_client import SpyfuClient
+from src.services.async_spyfu_client import AsyncSpyfuClient
 from src.services.proxy_manager import ProxyManager
 from src.services.request_throttler import RequestThrottler
+from src.services.response_cache import ResponseCache
+from src.services.retry_policy import RetryPolicy
+from src.services.session_pool import SessionPool
+from src.services.sharding import filter_shard, parse_shard
+from src.services.work_queue import Job, LeaseKeeper, WorkQueue, default_worker_id
 from src.processors.competitors_processor import CompetitorsProcessor
 from src.processors.keywords_processor import KeywordsProcessor
 from src.processors.ads_processor import AdsProcessor
 from src.processors.domain_stats_processor import DomainStatsProcessor
-from src.outputs.exporters import export_records
-from src.outputs.schema_validator import validate_records
-from src.parsers.json_normalizer import normalize_domain
+from src.outputs.dead_letter import DeadLetterFile
+from src.outputs.exporters import (
+    CSV_LAYOUTS,
+    JsonLinesWriter,
+    RecordWriter,
+    export_records,
+    open_record_writer,
+)
+from src.outputs.merge import merge_outputs
+from src.outputs.run_journal import RunJournal
+from src.outputs.snapshot import DeltaRun, Snapshot
+from src.outputs.schema_validator import VALIDATION_MODES, RecordValidator, validate_records
+from src.parsers.domain_normalizer import DEFAULT_CACHE_SIZE, DomainNormalizer, get_normalizer
+from src.parsers.json_normalizer import merge_records
 
 LOGGER = logging.getLogger(__name__)
 
@@ -43,159 +80,1217 @@ def load_settings(settings_path: Optional[str]) -> Dict[str, Any]:
             LOGGER.error("Failed to parse settings file %s: %s", settings_path, exc)
             return {}
 
-def read_urls_from_file(path: str) -> List[str]:
+def iter_urls_from_file(path: str) -> Iterator[str]:
+    """
+    Lazily yield URLs from ``path``, skipping blank lines and ``#`` comments.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"Input URLs file not found: {path}")
+    return _iter_url_lines(path)
 
-    urls: List[str] = []
+def _iter_url_lines(path: str) -> Iterator[str]:
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
             if line and not line.startswith("#"):
-                urls.append(line)
+                yield line
 
+def read_urls_from_file(path: str) -> List[str]:
+    urls = list(iter_urls_from_file(path))
     if not urls:
         raise ValueError(f"No URLs found in input file: {path}")
 
     return urls
 
-def build_spyfu_client(settings: Dict[str, Any]) -> SpyfuClient:
+def build_response_cache(settings: Dict[str, Any]) -> Optional[ResponseCache]:
+    if not settings.get("cache_enabled", False):
+        return None
+    return ResponseCache(
+        path=settings.get("cache_path", "data/cache/responses.sqlite"),
+        ttl_seconds=float(settings.get("cache_ttl_seconds", 86400)),
+        ttl_by_endpoint=settings.get("cache_ttl_by_endpoint"),
+        max_entries=int(settings.get("cache_max_entries", 100000)),
+        refresh=bool(settings.get("cache_refresh", False)),
+    )
+
+def build_retry_policy(settings: Dict[str, Any]) -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=int(settings.get("retry_max_attempts", 4)),
+        base_delay=float(settings.get("retry_base_delay_seconds", 0.5)),
+        max_delay=float(settings.get("retry_max_delay_seconds", 30)),
+        max_retry_after=float(settings.get("retry_max_retry_after_seconds", 120)),
+    )
+
+def _client_kwargs(settings: Dict[str, Any]) -> Dict[str, Any]:
     base_url = settings.get("spyfu_base_url", "https://www.spyfu.com")
     api_key = settings.get("spyfu_api_key") or os.getenv("SPYFU_API_KEY")
     use_sample_data = settings.get("use_sample_data", True)
     timeout = int(settings.get("timeout_seconds", 20))
 
     proxy_cfg = settings.get("proxies") or {}
-    proxy_manager = ProxyManager(proxy_cfg)
+    proxy_manager = ProxyManager(
+        proxy_cfg,
+        failure_threshold=int(settings.get("proxy_failure_threshold", 3)),
+        cooldown_seconds=float(settings.get("proxy_cooldown_seconds", 30)),
+    )
 
     rpm = int(settings.get("requests_per_minute", 60))
-    throttler = RequestThrottler(rate_per_minute=rpm)
+    throttler = RequestThrottler(
+        rate_per_minute=rpm,
+        burst=int(settings.get("burst", 1)),
+        proxy_rate_per_minute=settings.get("proxy_requests_per_minute"),
+        endpoint_rates_per_minute=settings.get("endpoint_requests_per_minute"),
+    )
 
-    client = SpyfuClient(
-        base_url=base_url,
-        api_key=api_key,
-        proxy_manager=proxy_manager,
-        throttler=throttler,
-        use_sample_data=use_sample_data,
-        timeout=timeout,
+    session_pool = SessionPool(
+        pool_size=int(settings.get("http_pool_size", 10)),
+        keep_alive=bool(settings.get("http_keep_alive", True)),
     )
+
+    return {
+        "base_url": base_url,
+        "api_key": api_key,
+        "proxy_manager": proxy_manager,
+        "throttler": throttler,
+        "use_sample_data": use_sample_data,
+        "timeout": timeout,
+        "session_pool": session_pool,
+        "cache": build_response_cache(settings),
+        "retry_policy": build_retry_policy(settings),
+    }
+
+def build_spyfu_client(settings: Dict[str, Any]) -> SpyfuClient:
+    client = SpyfuClient(**_client_kwargs(settings))
     return client
 
-def process_urls(
-    urls: Iterable[str],
-    country: Optional[str],
-    process_type: str,
-    settings: Dict[str, Any],
-) -> List[Dict[str, Any]]:
-    client = build_spyfu_client(settings)
+def build_domain_normalizer(settings: Dict[str, Any]) -> DomainNormalizer:
+    """
+    Shared normalizer for the run's settings. With ``registrable_domain``
+    every host is reduced to its registrable domain using the offline
+    ``public_suffix_list`` file.
+    """
+    suffix_list = None
+    if settings.get("registrable_domain"):
+        suffix_list = settings.get("public_suffix_list")
+        if not suffix_list:
+            raise ValueError(
+                "registrable_domain needs public_suffix_list, the path to a local copy of "
+                "https://publicsuffix.org/list/public_suffix_list.dat"
+            )
+    return get_normalizer(suffix_list, int(settings.get("domain_cache_size", DEFAULT_CACHE_SIZE)))
+
+def build_async_spyfu_client(settings: Dict[str, Any]) -> AsyncSpyfuClient:
+    max_connections = int(settings.get("max_connections", 100))
+    client = AsyncSpyfuClient(max_connections=max_connections, **_client_kwargs(settings))
+    return client
+
+PROCESS_TYPES = (
+    "top_competitors",
+    "most_valuable_keywords",
+    "newly_ranked_keywords",
+    "top_ads",
+    "domain_stats",
+)
+
+ProcessTypes = Union[str, Sequence[str]]
 
+def _build_dispatch(client: SpyfuClient, use_async: bool = False) -> Dict[str, Callable[..., Any]]:
     competitors_processor = CompetitorsProcessor(client)
     keywords_processor = KeywordsProcessor(client)
     ads_processor = AdsProcessor(client)
     domain_stats_processor = DomainStatsProcessor(client)
 
-    processors = {
-        "top_competitors": competitors_processor,
-        "most_valuable_keywords": keywords_processor,
-        "newly_ranked_keywords": keywords_processor,
-        "top_ads": ads_processor,
-        "domain_stats": domain_stats_processor,
+    if use_async:
+        return {
+            "top_competitors": competitors_processor.process_async,
+            "most_valuable_keywords": keywords_processor.process_most_valuable_async,
+            "newly_ranked_keywords": keywords_processor.process_newly_ranked_async,
+            "top_ads": ads_processor.process_async,
+            "domain_stats": domain_stats_processor.process_async,
+        }
+    return {
+        "top_competitors": competitors_processor.process,
+        "most_valuable_keywords": keywords_processor.process_most_valuable,
+        "newly_ranked_keywords": keywords_processor.process_newly_ranked,
+        "top_ads": ads_processor.process,
+        "domain_stats": domain_stats_processor.process,
     }
 
-    if process_type not in processors:
+def resolve_process_types(process_type: ProcessTypes) -> List[str]:
+    """
+    Turn a process type, a list of them (or a comma-separated string) or
+    ``"all"`` into a validated list in canonical order.
+    """
+    if isinstance(process_type, str):
+        requested = [p.strip() for p in process_type.split(",") if p.strip()]
+    else:
+        requested = list(process_type)
+
+    if "all" in requested:
+        return list(PROCESS_TYPES)
+
+    unknown = [p for p in requested if p not in PROCESS_TYPES]
+    if unknown or not requested:
         raise ValueError(
-            f"Unsupported process_type '{process_type}'. "
-            f"Supported types: {', '.join(sorted(processors.keys()))}"
+            f"Unsupported process_type '{', '.join(unknown) or process_type}'. "
+            f"Supported types: {', '.join(sorted(PROCESS_TYPES))}, all"
         )
+    return [p for p in PROCESS_TYPES if p in requested]
+
+def _combine_results(
+    results: Sequence[Optional[Dict[str, Any]]],
+    process_types: List[str],
+) -> Optional[Dict[str, Any]]:
+    """
+    Merge the per-type records of one domain; a single type passes through.
+    """
+    if len(process_types) == 1:
+        return results[0]
+
+    done = [record for record in results if record is not None]
+    if not done:
+        return None
+    failed = [ptype for ptype, record in zip(process_types, results) if record is None]
+    notes = f"Failed process types: {', '.join(failed)}" if failed else None
+    return merge_records(done, ",".join(process_types), notes=notes)
+
+def _group_results(
+    results: List[Optional[Dict[str, Any]]],
+    process_types: List[str],
+) -> List[Optional[Dict[str, Any]]]:
+    width = len(process_types)
+    return [
+        _combine_results(results[i : i + width], process_types)
+        for i in range(0, len(results), width)
+    ]
 
-    processor = processors[process_type]
-    run_id = f"spyfu-bulk-urls-{int(time.time())}"
+def _resolve_workers(settings: Dict[str, Any], workers: Optional[int]) -> int:
+    if workers is None:
+        workers = int(settings.get("concurrency", 1))
+    return max(1, int(workers))
+
+def _normalize_or_none(
+    normalizer: DomainNormalizer,
+    url: str,
+    dead_letter: Optional[DeadLetterFile],
+) -> Optional[str]:
+    try:
+        return normalizer.normalize(url)
+    except ValueError as exc:
+        LOGGER.warning("Skipping %s: %s", url, exc)
+        if dead_letter is not None:
+            dead_letter.add(url)
+        return None
+
+def _plan_jobs(
+    urls: Iterable[str],
+    country: Optional[str],
+    dedupe: bool,
+    normalizer: Optional[DomainNormalizer] = None,
+    dead_letter: Optional[DeadLetterFile] = None,
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Normalize every URL and work out which ``(origin, domain)`` pairs to fetch.
+
+    Returns all entries in input order plus the jobs to run. With ``dedupe``
+    only the first origin of each ``(domain, country)`` key becomes a job.
+    URLs whose host cannot be normalized (e.g. it fails IDNA encoding) are
+    logged, added to ``dead_letter`` and left out.
+    """
+    urls = list(urls)
+    normalizer = normalizer or get_normalizer()
+    with profiler.section("normalize"):
+        try:
+            domains: List[Optional[str]] = list(normalizer.normalize_batch(urls))
+        except ValueError:
+            domains = [_normalize_or_none(normalizer, url, dead_letter) for url in urls]
+
+    entries: List[Tuple[str, str]] = []
+    jobs: List[Tuple[str, str]] = []
+    seen: Set[Tuple[str, Optional[str]]] = set()
+    for url, domain in zip(urls, domains):
+        if domain is None:
+            continue
+        entry = (url, domain)
+        entries.append(entry)
+        key = (domain, country)
+        if not dedupe or key not in seen:
+            seen.add(key)
+            jobs.append(entry)
+
+    saved = len(entries) - len(jobs)
+    if saved:
+        LOGGER.info(
+            "Deduplicated %d URLs to %d unique domains; saved %d calls.",
+            len(entries),
+            len(jobs),
+            saved,
+        )
+    return entries, jobs
+
+def _fan_out(
+    entries: List[Tuple[str, str]],
+    jobs: List[Tuple[str, str]],
+    results: List[Optional[Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    """
+    Map job results back onto every input entry, one record per origin.
+    """
+    if len(jobs) == len(entries):
+        return [record for record in results if record is not None]
+
+    by_domain = {domain: record for (_, domain), record in zip(jobs, results)}
     records: List[Dict[str, Any]] = []
+    for origin, domain in entries:
+        record = by_domain[domain]
+        if record is None:
+            continue
+        records.append(record if record["origin"] == origin else record.replace(origin=origin))
+    return records
+
+def _dead_letter_failures(
+    entries: List[Tuple[str, str]],
+    jobs: List[Tuple[str, str]],
+    results: List[Optional[Dict[str, Any]]],
+    width: int,
+    dead_letter: DeadLetterFile,
+) -> None:
+    """
+    Add every origin whose domain had a failed call (any process type).
+    """
+    failed = {
+        domain
+        for index, (_, domain) in enumerate(jobs)
+        if any(result is None for result in results[index * width : (index + 1) * width])
+    }
+    for origin, domain in entries:
+        if domain in failed:
+            dead_letter.add(origin)
+
+def _split_fresh(
+    jobs: List[Tuple[str, str]],
+    country: Optional[str],
+    process_types: List[str],
+    delta: Optional[DeltaRun],
+) -> Tuple[List[Tuple[str, str]], Dict[str, Dict[str, Any]]]:
+    """
+    Separate the jobs to fetch from those whose previous record is still
+    fresh enough to copy forward (``--since``).
+    """
+    if delta is None:
+        return jobs, {}
+    label = ",".join(process_types)
+    fetch: List[Tuple[str, str]] = []
+    carried: Dict[str, Dict[str, Any]] = {}
+    for job in jobs:
+        previous = delta.fresh_record(job[1], country, label)
+        if previous is None:
+            fetch.append(job)
+        else:
+            carried[job[1]] = previous
+    return fetch, carried
 
-    for url in urls:
-        domain = normalize_domain(url)
-        LOGGER.info("Processing %s (%s) for %s", url, domain, process_type)
+def _settle_chunk(
+    entries: List[Tuple[str, str]],
+    jobs: List[Tuple[str, str]],
+    fetch: List[Tuple[str, str]],
+    carried: Dict[str, Dict[str, Any]],
+    results: List[Optional[Dict[str, Any]]],
+    process_types: List[str],
+    dead_letter: Optional[DeadLetterFile],
+    delta: Optional[DeltaRun],
+) -> List[Dict[str, Any]]:
+    if dead_letter is not None:
+        _dead_letter_failures(entries, fetch, results, len(process_types), dead_letter)
+    fetched = _group_results(results, process_types)
+    if delta is not None:
+        for record in fetched:
+            if record is not None:
+                delta.observe(record)
+    if not carried:
+        return _fan_out(entries, jobs, fetched)
+    # Copied-forward records still carry the previous run's origin.
+    remaining = iter(fetched)
+    combined: List[Optional[Dict[str, Any]]] = []
+    for origin, domain in jobs:
+        previous = carried.get(domain)
+        if previous is None:
+            combined.append(next(remaining))
+        else:
+            combined.append(previous if previous["origin"] == origin else previous.replace(origin=origin))
+    return _fan_out(entries, jobs, combined)
+
+def new_run_id() -> str:
+    # The random suffix keeps journals of runs started in the same second apart.
+    return f"spyfu-bulk-urls-{int(time.time())}-{secrets.token_hex(3)}"
+
+def _chunks(items: Iterable[str], size: Optional[int]) -> Iterator[List[str]]:
+    """
+    Split ``items`` into lists of ``size`` (all at once when ``size`` is None).
+    """
+    if not size:
+        chunk = list(items)
+        if chunk:
+            yield chunk
+        return
+    it = iter(items)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _run_chunk(
+    urls: List[str],
+    country: Optional[str],
+    process_types: List[str],
+    settings: Dict[str, Any],
+    dispatch: Dict[str, Callable[..., Any]],
+    run_id: str,
+    executor: Optional[ThreadPoolExecutor],
+    dead_letter: Optional[DeadLetterFile] = None,
+    delta: Optional[DeltaRun] = None,
+) -> List[Dict[str, Any]]:
+    entries, jobs = _plan_jobs(
+        urls,
+        country,
+        bool(settings.get("dedupe_domains", True)),
+        build_domain_normalizer(settings),
+        dead_letter,
+    )
+    fetch, carried = _split_fresh(jobs, country, process_types, delta)
+    # One call per (domain, process type); calls for the same domain are adjacent.
+    calls = [(job, ptype) for job in fetch for ptype in process_types]
+
+    def process_one(call: Tuple[Tuple[str, str], str]) -> Optional[Dict[str, Any]]:
+        (url, domain), ptype = call
+        LOGGER.info("Processing %s (%s) for %s", url, domain, ptype)
         try:
-            if process_type == "top_competitors":
-                record = competitors_processor.process(
-                    origin=url,
-                    domain=domain,
-                    country=country,
-                    run_id=run_id,
-                )
-            elif process_type == "most_valuable_keywords":
-                record = keywords_processor.process_most_valuable(
-                    origin=url,
-                    domain=domain,
-                    country=country,
-                    run_id=run_id,
-                )
-            elif process_type == "newly_ranked_keywords":
-                record = keywords_processor.process_newly_ranked(
+            return dispatch[ptype](
+                origin=url,
+                domain=domain,
+                country=country,
+                run_id=run_id,
+            )
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.exception("Failed to process %s: %s", url, exc)
+            return None
+
+    if executor is None:
+        results = [process_one(call) for call in calls]
+    else:
+        # Executor.map yields results in submission order.
+        results = list(executor.map(process_one, calls))
+
+    return _settle_chunk(
+        entries, jobs, fetch, carried, results, process_types, dead_letter, delta
+    )
+
+def iter_process_urls(
+    urls: Iterable[str],
+    country: Optional[str],
+    process_type: ProcessTypes,
+    settings: Dict[str, Any],
+    workers: Optional[int] = None,
+    client: Optional[SpyfuClient] = None,
+    chunk_size: Optional[int] = None,
+    run_id: Optional[str] = None,
+    dead_letter: Optional[DeadLetterFile] = None,
+    delta: Optional[DeltaRun] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield records for ``urls``, reading the input ``chunk_size`` URLs
+    at a time so memory stays bounded however long the input is.
+
+    Domain de-duplication applies within a chunk. Without ``chunk_size`` the
+    whole input is a single chunk. URLs with a failed call are added to
+    ``dead_letter`` when one is given. With ``delta`` (a ``DeltaRun``),
+    domains whose previous record is still fresh are copied forward instead
+    of fetched.
+    """
+    process_types = resolve_process_types(process_type)
+    owns_client = client is None
+    if client is None:
+        client = build_spyfu_client(settings)
+    dispatch = _build_dispatch(client)
+    run_id = run_id or new_run_id()
+    max_workers = _resolve_workers(settings, workers)
+    executor: Optional[ThreadPoolExecutor] = None
+    if max_workers > 1:
+        LOGGER.info("Processing with %d workers.", max_workers)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    try:
+        for chunk in _chunks(urls, chunk_size):
+            yield from _run_chunk(
+                chunk, country, process_types, settings, dispatch, run_id, executor, dead_letter, delta
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if owns_client:
+            client.close()
+
+def process_urls(
+    urls: Iterable[str],
+    country: Optional[str],
+    process_type: ProcessTypes,
+    settings: Dict[str, Any],
+    workers: Optional[int] = None,
+    client: Optional[SpyfuClient] = None,
+    dead_letter: Optional[DeadLetterFile] = None,
+    delta: Optional[DeltaRun] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run the selected processor(s) over every URL.
+
+    ``process_type`` may name several types (or ``"all"``). In that case every
+    endpoint is fetched for each domain and merged into one record.
+    With more than one worker the processor calls run on a thread pool that
+    shares a single client (and therefore its throttler and proxy manager).
+    Records are returned in input order. URLs that still fail after the
+    client's retries are logged, skipped and added to ``dead_letter``.
+    URLs that normalize to the same domain are fetched once and the result is
+    copied to each origin (disable with the ``dedupe_domains`` setting).
+    A client built here is closed before returning; a passed-in ``client`` is
+    left open for the caller.
+    """
+    return list(
+        iter_process_urls(
+            urls, country, process_type, settings, workers, client, dead_letter=dead_letter, delta=delta
+        )
+    )
+
+async def _run_chunk_async(
+    urls: List[str],
+    country: Optional[str],
+    process_types: List[str],
+    settings: Dict[str, Any],
+    dispatch: Dict[str, Callable[..., Any]],
+    run_id: str,
+    semaphore: asyncio.Semaphore,
+    dead_letter: Optional[DeadLetterFile] = None,
+    delta: Optional[DeltaRun] = None,
+) -> List[Dict[str, Any]]:
+    entries, jobs = _plan_jobs(
+        urls,
+        country,
+        bool(settings.get("dedupe_domains", True)),
+        build_domain_normalizer(settings),
+        dead_letter,
+    )
+    fetch, carried = _split_fresh(jobs, country, process_types, delta)
+    calls = [(job, ptype) for job in fetch for ptype in process_types]
+
+    async def process_one(call: Tuple[Tuple[str, str], str]) -> Optional[Dict[str, Any]]:
+        (url, domain), ptype = call
+        async with semaphore:
+            LOGGER.info("Processing %s (%s) for %s", url, domain, ptype)
+            try:
+                return await dispatch[ptype](
                     origin=url,
                     domain=domain,
                     country=country,
                     run_id=run_id,
                 )
-            elif process_type == "top_ads":
-                record = ads_processor.process(
-                    origin=url,
-                    domain=domain,
-                    country=country,
-                    run_id=run_id,
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.exception("Failed to process %s: %s", url, exc)
+                return None
+
+    results = list(await asyncio.gather(*(process_one(call) for call in calls)))
+    return _settle_chunk(
+        entries, jobs, fetch, carried, results, process_types, dead_letter, delta
+    )
+
+async def iter_process_urls_async(
+    urls: Iterable[str],
+    country: Optional[str],
+    process_type: ProcessTypes,
+    settings: Dict[str, Any],
+    concurrency: Optional[int] = None,
+    client: Optional[AsyncSpyfuClient] = None,
+    chunk_size: Optional[int] = None,
+    run_id: Optional[str] = None,
+    dead_letter: Optional[DeadLetterFile] = None,
+    delta: Optional[DeltaRun] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async-generator counterpart of ``iter_process_urls``.
+    """
+    process_types = resolve_process_types(process_type)
+    owns_client = client is None
+    if client is None:
+        client = build_async_spyfu_client(settings)
+    dispatch = _build_dispatch(client, use_async=True)
+    run_id = run_id or new_run_id()
+    semaphore = asyncio.Semaphore(_resolve_workers(settings, concurrency))
+
+    try:
+        for chunk in _chunks(urls, chunk_size):
+            records = await _run_chunk_async(
+                chunk, country, process_types, settings, dispatch, run_id, semaphore, dead_letter, delta
+            )
+            for record in records:
+                yield record
+    finally:
+        if owns_client:
+            await client.close()
+
+async def process_urls_async(
+    urls: Iterable[str],
+    country: Optional[str],
+    process_type: ProcessTypes,
+    settings: Dict[str, Any],
+    concurrency: Optional[int] = None,
+    client: Optional[AsyncSpyfuClient] = None,
+    dead_letter: Optional[DeadLetterFile] = None,
+    delta: Optional[DeltaRun] = None,
+) -> List[Dict[str, Any]]:
+    """
+    asyncio counterpart of ``process_urls``.
+
+    At most ``concurrency`` requests are in flight at once (guarded by a
+    semaphore); pacing is still done by the shared ``RequestThrottler``.
+    Records are returned in input order. As with ``process_urls``, only a
+    client built here is closed on return.
+    """
+    return [
+        record
+        async for record in iter_process_urls_async(
+            urls, country, process_type, settings, concurrency, client, dead_letter=dead_letter, delta=delta
+        )
+    ]
+
+def _log_run_stats(client: SpyfuClient) -> None:
+    if client.proxy_manager:
+        client.proxy_manager.log_stats()
+    if client.cache is not None:
+        LOGGER.info("Response cache: %s", client.cache.stats())
+
+def _writer_options(settings: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "csv_layout": settings.get("csv_layout", "flat"),
+        "row_group_size": int(settings.get("row_group_size", 10000)),
+        "compression": settings.get("columnar_compression", "zstd"),
+        "sparse": bool(settings.get("sparse_output", False)),
+    }
+
+def build_record_validator(settings: Dict[str, Any]) -> RecordValidator:
+    return RecordValidator(
+        mode=settings.get("validation_mode", "full"),
+        sample_every=int(settings.get("validation_sample_every", 100)),
+    )
+
+class _StreamSink:
+    """
+    Validates records one at a time and hands them to a ``RecordWriter``.
+
+    Invalid records are logged and skipped instead of aborting a long run.
+    With a journal, every written record is flushed and checkpointed.
+    """
+
+    def __init__(
+        self,
+        writer: RecordWriter,
+        journal: Optional[RunJournal] = None,
+        validator: Optional[RecordValidator] = None,
+    ) -> None:
+        self.writer = writer
+        self.journal = journal
+        self.validator = validator or RecordValidator()
+        self.seen = 0
+        self.invalid = 0
+
+    def consume(self, record: Dict[str, Any]) -> None:
+        index = self.seen
+        self.seen += 1
+        try:
+            self.validator.validate(record, index)
+        except ValueError:
+            self.invalid += 1
+            return
+        with metrics.stage("export"), profiler.section("export"):
+            self.writer.write(record)
+        metrics.inc("spyfu_records_total")
+        if self.journal is not None and isinstance(self.writer, JsonLinesWriter):
+            self.writer.flush()
+            self.journal.record(
+                record["origin"], record["process_type"], record["country"], self.writer.offset
+            )
+
+async def _run_async(
+    urls: Iterable[str],
+    country: Optional[str],
+    process_type: ProcessTypes,
+    settings: Dict[str, Any],
+    workers: Optional[int],
+    sink: Optional[_StreamSink] = None,
+    run_id: Optional[str] = None,
+    dead_letter: Optional[DeadLetterFile] = None,
+    delta: Optional[DeltaRun] = None,
+) -> List[Dict[str, Any]]:
+    async with build_async_spyfu_client(settings) as client:
+        try:
+            if sink is None:
+                return await process_urls_async(
+                    urls,
+                    country,
+                    process_type,
+                    settings,
+                    concurrency=workers,
+                    client=client,
+                    dead_letter=dead_letter,
+                    delta=delta,
                 )
-            elif process_type == "domain_stats":
-                record = domain_stats_processor.process(
-                    origin=url,
-                    domain=domain,
-                    country=country,
-                    run_id=run_id,
+            async for record in iter_process_urls_async(
+                urls,
+                country,
+                process_type,
+                settings,
+                concurrency=workers,
+                client=client,
+                chunk_size=int(settings.get("stream_chunk_size", 1000)),
+                run_id=run_id,
+                dead_letter=dead_letter,
+                delta=delta,
+            ):
+                sink.consume(record)
+            return []
+        finally:
+            _log_run_stats(client)
+
+def _start_metrics(settings: Dict[str, Any]) -> Optional[metrics.MetricsServer]:
+    """
+    Enable the metrics registry when any metrics output is configured and
+    start the ``/metrics`` endpoint if ``metrics_port`` is set.
+    """
+    port = settings.get("metrics_port")
+    if not (
+        settings.get("metrics_enabled")
+        or settings.get("metrics_textfile")
+        or settings.get("metrics_summary")
+        or port is not None
+    ):
+        return None
+    registry = metrics.enable()
+    if port is None:
+        return None
+    return metrics.MetricsServer(registry, int(port)).start()
+
+def _finish_metrics(settings: Dict[str, Any], server: Optional[metrics.MetricsServer]) -> None:
+    registry = metrics.registry()
+    if registry is None:
+        return
+    try:
+        if settings.get("metrics_textfile"):
+            registry.write_textfile(settings["metrics_textfile"])
+            LOGGER.info("Wrote Prometheus metrics to %s", settings["metrics_textfile"])
+        if settings.get("metrics_summary"):
+            registry.write_summary(settings["metrics_summary"])
+            LOGGER.info("Wrote metrics summary to %s", settings["metrics_summary"])
+    finally:
+        if server is not None:
+            server.stop()
+        metrics.disable()
+
+def _default_dead_letter_path(output_path: str) -> str:
+    return f"{os.path.splitext(output_path)[0]}.failed.txt"
+
+def _run_stream(
+    urls: Iterable[str],
+    country: Optional[str],
+    process_type: ProcessTypes,
+    output_format: str,
+    output_path: str,
+    settings: Dict[str, Any],
+    workers: Optional[int],
+    engine: str,
+    resume: Optional[str] = None,
+    dead_letter_path: Optional[str] = None,
+    delta: Optional[DeltaRun] = None,
+) -> None:
+    journal: Optional[RunJournal] = None
+    journal_dir = settings.get("journal_dir", "data/runs")
+    process_label = ",".join(resolve_process_types(process_type))
+
+    if resume:
+        journal = RunJournal.load(journal_dir, resume)
+        if journal.header.get("output_format") != "jsonl":
+            raise ValueError(f"Run {resume} did not write jsonl output and cannot be resumed.")
+        if journal.header.get("process_type") != process_label or journal.header.get("country") != country:
+            raise ValueError(
+                f"Run {resume} was started with process_type={journal.header.get('process_type')} "
+                f"country={journal.header.get('country')}; pass the same values to resume it."
+            )
+        output_path = journal.header["output_path"]
+        output_format = "jsonl"
+        journal.truncate_output()
+        done = journal
+        urls = (url for url in urls if not done.is_done(url, process_label, country))
+        run_id = journal.run_id
+    else:
+        run_id = new_run_id()
+        if output_format == "jsonl":
+            journal = RunJournal.create(
+                journal_dir,
+                run_id,
+                output_path=output_path,
+                output_format=output_format,
+                process_type=process_label,
+                country=country,
+            )
+            LOGGER.info("Journaling run %s; resume with --resume %s", run_id, run_id)
+
+    dead_letter = DeadLetterFile(
+        dead_letter_path or _default_dead_letter_path(output_path), append=bool(resume)
+    )
+    try:
+        with open_record_writer(
+            output_path,
+            output_format,
+            append=bool(resume),
+            **_writer_options(settings),
+        ) as writer:
+            sink = _StreamSink(writer, journal, build_record_validator(settings))
+            if engine == "async":
+                asyncio.run(
+                    _run_async(
+                        urls,
+                        country,
+                        process_type,
+                        settings,
+                        workers,
+                        sink=sink,
+                        run_id=run_id,
+                        dead_letter=dead_letter,
+                        delta=delta,
+                    )
                 )
             else:
-                raise RuntimeError("Unexpected process_type dispatch error.")
-
-            records.append(record)
-        except Exception as exc:  # noqa: BLE001
-            LOGGER.exception("Failed to process %s: %s", url, exc)
+                client = build_spyfu_client(settings)
+                try:
+                    for record in iter_process_urls(
+                        urls,
+                        country,
+                        process_type,
+                        settings,
+                        workers=workers,
+                        client=client,
+                        chunk_size=int(settings.get("stream_chunk_size", 1000)),
+                        run_id=run_id,
+                        dead_letter=dead_letter,
+                        delta=delta,
+                    ):
+                        sink.consume(record)
+                finally:
+                    _log_run_stats(client)
+                    client.close()
+    finally:
+        dead_letter.close()
+        if journal is not None:
+            journal.close()
 
-    return records
+    sink.validator.log_stats()
+    if sink.invalid:
+        LOGGER.warning("Skipped %d record(s) that failed schema validation.", sink.invalid)
+    LOGGER.info("Run complete. Streamed %d records to %s", writer.count, output_path)
 
 def run_bulk(
     input_file: str,
     country: Optional[str],
-    process_type: str,
+    process_type: ProcessTypes,
     output_format: str,
     output_path: str,
     settings_path: Optional[str],
     log_config_path: str,
+    workers: Optional[int] = None,
+    engine: Optional[str] = None,
+    use_cache: bool = True,
+    refresh_cache: bool = False,
+    stream: bool = False,
+    resume: Optional[str] = None,
+    csv_layout: Optional[str] = None,
+    validation_mode: Optional[str] = None,
+    dead_letter_path: Optional[str] = None,
+    metrics_textfile: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    metrics_summary: Optional[str] = None,
+    profile: Optional[str] = None,
+    profile_stages: Optional[Union[str, Sequence[str]]] = None,
+    profile_output: Optional[str] = None,
+    profile_collapsed: Optional[str] = None,
+    shard: Optional[str] = None,
+    since: Optional[str] = None,
+    max_age: Optional[float] = None,
+    diff_output: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
+    """
+    Run a full bulk job and return the exported records.
+
+    With ``stream`` enabled URLs are read lazily and each record is validated
+    and written as soon as it is produced, so memory use does not grow with
+    the input. Records are not retained in that mode and an empty list is
+    returned. Streaming jsonl runs are journaled; ``resume`` continues such a
+    run by id, skipping finished work and appending to its original output.
+    URLs that still fail after retries are listed in ``dead_letter_path``
+    (default: ``<output>.failed.txt``). Per-stage metrics are collected only
+    when a metrics output (textfile, ``/metrics`` port or summary) is set.
+    ``profile`` (``"cpu"`` or ``"mem"``) profiles ``profile_stages`` (default:
+    all of fetch, normalize, validate, export) and writes the reports under
+    ``profile_output`` (default: ``<output>.profile``). ``shard="K/N"``
+    keeps only the URLs whose domain hashes to shard K of N. ``since`` names
+    a previous output file. Domains whose record there is younger than
+    ``max_age`` seconds are copied forward instead of fetched. Changes in
+    the refetched domains are written to ``diff_output`` (default:
+    ``<output>.diff.jsonl``).
+    """
     configure_logging(log_config_path)
     LOGGER.info("Starting SpyFu bulk run")
     LOGGER.info(
-        "Params: input_file=%s country=%s process_type=%s output_format=%s output_path=%s",
+        "Params: input_file=%s country=%s process_type=%s output_format=%s output_path=%s "
+        "workers=%s engine=%s stream=%s resume=%s",
         input_file,
         country,
         process_type,
         output_format,
         output_path,
+        workers,
+        engine,
+        stream,
+        resume,
     )
 
     settings = load_settings(settings_path)
-    urls = read_urls_from_file(input_file)
-    records = process_urls(urls, country, process_type, settings)
+    if not use_cache:
+        settings["cache_enabled"] = False
+    if refresh_cache:
+        settings["cache_refresh"] = True
+    if csv_layout:
+        settings["csv_layout"] = csv_layout
+    if validation_mode:
+        settings["validation_mode"] = validation_mode
+    dead_letter_path = dead_letter_path or settings.get("dead_letter_path")
+    if metrics_textfile:
+        settings["metrics_textfile"] = metrics_textfile
+    if metrics_port is not None:
+        settings["metrics_port"] = metrics_port
+    if metrics_summary:
+        settings["metrics_summary"] = metrics_summary
+    json_codec.configure(settings.get("json_codec", "auto"))
+    engine = engine or settings.get("engine", "threads")
+    if engine not in ("threads", "async"):
+        raise ValueError(f"Unsupported engine: {engine}")
+    shard_spec = parse_shard(shard) if shard else None
+    if since and resume:
+        raise ValueError("since cannot be combined with resume.")
 
-    if not records:
-        LOGGER.warning("No records generated for this run.")
-        return []
+    delta: Optional[DeltaRun] = None
+    if since:
+        delta = DeltaRun(
+            Snapshot.load(since),
+            max_age_seconds=float(
+                max_age if max_age is not None else settings.get("delta_max_age_seconds", 86400)
+            ),
+            diff_path=diff_output
+            or settings.get("diff_output_path")
+            or f"{os.path.splitext(output_path)[0]}.diff.jsonl",
+        )
 
-    validate_records(records)
-    export_records(records, output_path, output_format)
-    LOGGER.info("Run complete. Exported %d records to %s", len(records), output_path)
-    return records
+    stage_profiler = None
+    if profile:
+        stage_profiler = profiler.StageProfiler(
+            profile,
+            profile_output or f"{os.path.splitext(output_path)[0]}.profile",
+            stages=profile_stages,
+            collapsed_path=profile_collapsed,
+        )
+        stage_profiler.start()
+        profiler.activate(stage_profiler)
+
+    metrics_server = _start_metrics(settings)
+    try:
+        if stream or resume:
+            urls_iter = iter_urls_from_file(input_file)
+            if shard_spec:
+                urls_iter = filter_shard(urls_iter, *shard_spec, normalizer=build_domain_normalizer(settings))
+            _run_stream(
+                urls_iter,
+                country,
+                process_type,
+                output_format,
+                output_path,
+                settings,
+                workers,
+                engine,
+                resume=resume,
+                dead_letter_path=dead_letter_path,
+                delta=delta,
+            )
+            return []
+
+        urls = read_urls_from_file(input_file)
+        if shard_spec:
+            urls = list(filter_shard(urls, *shard_spec, normalizer=build_domain_normalizer(settings)))
+        with DeadLetterFile(dead_letter_path or _default_dead_letter_path(output_path)) as dead_letter:
+            if engine == "async":
+                records = asyncio.run(
+                    _run_async(
+                        urls, country, process_type, settings, workers, dead_letter=dead_letter, delta=delta
+                    )
+                )
+            else:
+                client = build_spyfu_client(settings)
+                try:
+                    records = process_urls(
+                        urls,
+                        country,
+                        process_type,
+                        settings,
+                        workers=workers,
+                        client=client,
+                        dead_letter=dead_letter,
+                        delta=delta,
+                    )
+                finally:
+                    _log_run_stats(client)
+                    client.close()
+
+        if not records:
+            LOGGER.warning("No records generated for this run.")
+            return []
+
+        validator = build_record_validator(settings)
+        validate_records(records, validator=validator)
+        validator.log_stats()
+        with metrics.stage("export"), profiler.section("export"):
+            export_records(records, output_path, output_format, **_writer_options(settings))
+        metrics.inc("spyfu_records_total", len(records))
+        LOGGER.info("Run complete. Exported %d records to %s", len(records), output_path)
+        return records
+    finally:
+        if delta is not None:
+            delta.close()
+        _finish_metrics(settings, metrics_server)
+        if stage_profiler is not None:
+            profiler.activate(None)
+            stage_profiler.stop()
+
+def open_work_queue(settings: Dict[str, Any], queue_path: Optional[str] = None) -> WorkQueue:
+    return WorkQueue(
+        queue_path or settings.get("queue_path", "data/queue/jobs.sqlite"),
+        visibility_timeout=float(settings.get("queue_visibility_timeout_seconds", 300)),
+        max_attempts=int(settings.get("queue_max_attempts", 5)),
+    )
+
+def enqueue_urls(
+    queue: WorkQueue,
+    urls: Iterable[str],
+    country: Optional[str],
+    process_type: ProcessTypes,
+    normalizer: Optional[DomainNormalizer] = None,
+) -> int:
+    """
+    Add one job per URL to ``queue`` and return how many were new.
+
+    URLs whose domain cannot be parsed are logged and skipped.
+    """
+    process_label = ",".join(resolve_process_types(process_type))
+    normalizer = normalizer or get_normalizer()
+
+    def jobs() -> Iterator[Tuple[str, str]]:
+        for url in urls:
+            try:
+                yield url, normalizer.normalize(url)
+            except ValueError as exc:
+                LOGGER.warning("Skipping %s: %s", url, exc)
+
+    added = queue.enqueue(jobs(), process_label, country)
+    LOGGER.info("Enqueued %d new job(s) in %s; queue: %s", added, queue.path, queue.counts())
+    return added
+
+def _work_batch(
+    queue: WorkQueue,
+    owner: str,
+    jobs: List[Job],
+    settings: Dict[str, Any],
+    dispatch: Dict[str, Callable[..., Any]],
+    run_id: str,
+    executor: Optional[ThreadPoolExecutor],
+    validator: RecordValidator,
+) -> int:
+    """
+    Run a batch of leased jobs and settle each lease; returns the number completed.
+    """
+    groups: Dict[Tuple[str, Optional[str]], List[Job]] = {}
+    for job in jobs:
+        groups.setdefault((job.process_type, job.country), []).append(job)
+
+    completed = 0
+    for (process_label, country), group in groups.items():
+        records = _run_chunk(
+            [job.origin for job in group],
+            country,
+            resolve_process_types(process_label),
+            settings,
+            dispatch,
+            run_id,
+            executor,
+        )
+        by_origin = {record["origin"]: record for record in records}
+        for job in group:
+            record = by_origin.get(job.origin)
+            if record is None:
+                queue.fail(owner, job.id, "no record produced; see the worker log")
+                continue
+            try:
+                validator.validate(record, job.id)
+            except ValueError as exc:
+                # Retrying will not fix a record that does not match the schema.
+                queue.fail(owner, job.id, str(exc), retry=False)
+                continue
+            with metrics.stage("export"), profiler.section("export"):
+                done = queue.complete(owner, job.id, record)
+            if done:
+                completed += 1
+                metrics.inc("spyfu_records_total")
+    return completed
+
+def run_worker(
+    settings: Dict[str, Any],
+    queue_path: Optional[str] = None,
+    worker_id: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    drain: bool = False,
+) -> int:
+    """
+    Lease jobs from the work queue and process them until stopped.
+
+    Jobs are leased ``batch_size`` at a time and run through the same
+    processors as a normal run, on ``workers`` threads. Leases are extended
+    while the batch is in flight. A job whose worker crashes becomes
+    leasable again once its visibility timeout passes. Each record is
+    validated and stored in the queue when its job completes. With ``drain``
+    the worker exits once no job is pending or leased; otherwise it keeps
+    polling for new jobs. Returns the number of jobs this worker completed.
+    """
+    owner = worker_id or default_worker_id()
+    max_workers = _resolve_workers(settings, workers)
+    batch_size = int(batch_size or settings.get("queue_batch_size", max_workers * 4))
+    poll_seconds = float(settings.get("queue_poll_seconds", 2))
+    run_id = new_run_id()
+    completed = 0
+    json_codec.configure(settings.get("json_codec", "auto"))
+
+    queue = open_work_queue(settings, queue_path)
+    client = build_spyfu_client(settings)
+    dispatch = _build_dispatch(client)
+    validator = build_record_validator(settings)
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    metrics_server = _start_metrics(settings)
+    LOGGER.info("Worker %s polling %s (%d threads, batches of %d).", owner, queue.path, max_workers, batch_size)
+    try:
+        with LeaseKeeper(queue, owner) as keeper:
+            while True:
+                jobs = queue.lease(owner, batch_size)
+                if not jobs:
+                    if drain and not queue.has_open_jobs():
+                        break
+                    time.sleep(poll_seconds)
+                    continue
+                keeper.hold(job.id for job in jobs)
+                completed += _work_batch(
+                    queue, owner, jobs, settings, dispatch, run_id, executor, validator
+                )
+                keeper.hold(())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        _log_run_stats(client)
+        client.close()
+        validator.log_stats()
+        LOGGER.info("Worker %s completed %d job(s); queue: %s", owner, completed, queue.counts())
+        queue.close()
+        _finish_metrics(settings, metrics_server)
+    return completed
+
+def build_api_server(
+    settings: Dict[str, Any],
+    client: SpyfuClient,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> ApiServer:
+    """
+    ``ApiServer`` whose batches run through ``iter_process_urls`` on the
+    shared ``client``.
+
+    Records are validated like a streaming run; invalid ones are logged and
+    left out. They are produced ``serve_chunk_size`` URLs at a time (default:
+    the worker count), so the first lines reach the caller while the rest of
+    the batch is still being fetched.
+    """
+    max_workers = _resolve_workers(settings, workers)
+    chunk_size = int(settings.get("serve_chunk_size") or max_workers)
+
+    def process(
+        urls: List[str], country: Optional[str], process_type: ProcessTypes
+    ) -> Iterator[Dict[str, Any]]:
+        process_types = resolve_process_types(process_type)
+
+        def records() -> Iterator[Dict[str, Any]]:
+            validator = build_record_validator(settings)
+            for index, record in enumerate(
+                iter_process_urls(
+                    urls,
+                    country,
+                    process_types,
+                    settings,
+                    workers=max_workers,
+                    client=client,
+                    chunk_size=chunk_size,
+                )
+            ):
+                try:
+                    validator.validate(record, index)
+                except ValueError:
+                    continue
+                yield record
+
+        return records()
+
+    return ApiServer(
+        process,
+        port=int(settings.get("serve_port", 8765)) if port is None else port,
+        host=host or settings.get("serve_host", "127.0.0.1"),
+        max_urls=int(settings.get("serve_max_urls", 10000)),
+    )
+
+def run_server(
+    settings: Dict[str, Any],
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> None:
+    """
+    Serve the HTTP API until interrupted, keeping one client (and its
+    throttler, proxies, sessions and response cache) warm across requests.
+    """
+    json_codec.configure(settings.get("json_codec", "auto"))
+    client = build_spyfu_client(settings)
+    server = build_api_server(settings, client, host=host, port=port, workers=workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        LOGGER.info("Shutting down after %d request(s).", server.requests_served)
+    finally:
+        _log_run_stats(client)
+        client.close()
 
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="SpyFu (Bulk URLs) scraper CLI",
+        epilog="Other commands: merge, enqueue, worker, serve (see 'spyfu-bulk-urls <command> --help').",
     )
     parser.add_argument(
         "-i",
@@ -216,14 +1311,12 @@ def build_arg_parser() -> argparse.ArgumentParser:
         "--process",
         dest="process_type",
         required=True,
-        choices=[
-            "top_competitors",
-            "most_valuable_keywords",
-            "newly_ranked_keywords",
-            "top_ads",
-            "domain_stats",
-        ],
-        help="Type of SpyFu-based process to run.",
+        nargs="+",
+        choices=[*PROCESS_TYPES, "all"],
+        help=(
+            "Type(s) of SpyFu-based process to run. Several types (or 'all') produce "
+            "one merged record per domain."
+        ),
     )
     parser.add_argument(
         "-o",
@@ -236,10 +1329,170 @@ def build_arg_parser() -> argparse.ArgumentParser:
         "-f",
         "--format",
         dest="output_format",
-        choices=["json", "csv"],
+        choices=["json", "jsonl", "csv", "parquet", "arrow"],
         default="json",
         help="Output format.",
     )
+    parser.add_argument(
+        "--csv-layout",
+        dest="csv_layout",
+        choices=list(CSV_LAYOUTS),
+        default=None,
+        help=(
+            "CSV layout: 'flat' (nested sections as JSON strings) or 'normalized' "
+            "(one child CSV per nested section)."
+        ),
+    )
+    parser.add_argument(
+        "--validate",
+        dest="validation_mode",
+        choices=list(VALIDATION_MODES),
+        default=None,
+        help=(
+            "Schema validation mode: 'full' (every record), 'sampled' (1 in "
+            "validation_sample_every) or 'fast' (type check, schema on failure)."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        dest="stream",
+        action="store_true",
+        help="Read, validate and write records one at a time (constant memory).",
+    )
+    parser.add_argument(
+        "--resume",
+        dest="resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Resume an interrupted streaming jsonl run from its journal (implies --stream).",
+    )
+    parser.add_argument(
+        "--dead-letter",
+        dest="dead_letter_path",
+        metavar="PATH",
+        default=None,
+        help=(
+            "File listing URLs that still failed after retries "
+            "(default: <output>.failed.txt)."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        dest="metrics_textfile",
+        metavar="PATH",
+        default=None,
+        help="Write per-stage metrics in Prometheus text format to PATH at the end of the run.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        dest="metrics_port",
+        type=int,
+        default=None,
+        help="Serve live metrics at http://127.0.0.1:PORT/metrics during the run.",
+    )
+    parser.add_argument(
+        "--metrics-summary",
+        dest="metrics_summary",
+        metavar="PATH",
+        default=None,
+        help="Write a JSON summary of the run's metrics (counts, p50/p95/p99) to PATH.",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        choices=list(profiler.PROFILE_MODES),
+        default=None,
+        help="Profile the run: 'cpu' (cProfile/pstats) or 'mem' (tracemalloc top allocators).",
+    )
+    parser.add_argument(
+        "--profile-stages",
+        dest="profile_stages",
+        default=None,
+        help=(
+            "Comma-separated stages to profile: "
+            f"{', '.join(profiler.PROFILE_STAGES)} (default: all)."
+        ),
+    )
+    parser.add_argument(
+        "--profile-output",
+        dest="profile_output",
+        metavar="PREFIX",
+        default=None,
+        help="Path prefix for profile reports (default: <output>.profile).",
+    )
+    parser.add_argument(
+        "--profile-collapsed",
+        dest="profile_collapsed",
+        metavar="PATH",
+        default=None,
+        help="With --profile cpu, also write collapsed stacks for flamegraph tools.",
+    )
+    parser.add_argument(
+        "--shard",
+        dest="shard",
+        metavar="K/N",
+        default=None,
+        help=(
+            "Only process shard K of N (1-based), chosen by a stable hash of the "
+            "normalized domain, so each domain always lands on the same node."
+        ),
+    )
+    parser.add_argument(
+        "--since",
+        dest="since",
+        metavar="PREVIOUS_OUTPUT",
+        default=None,
+        help=(
+            "Delta run against a previous output (JSON, JSONL or queue file): copy "
+            "forward domains whose record is younger than --max-age and write a diff "
+            "of the refetched ones."
+        ),
+    )
+    parser.add_argument(
+        "--max-age",
+        dest="max_age",
+        type=float,
+        metavar="SECONDS",
+        default=None,
+        help="With --since, how old a previous record may be and still be reused "
+        "(overrides the 'delta_max_age_seconds' setting, default: 86400).",
+    )
+    parser.add_argument(
+        "--diff-output",
+        dest="diff_output",
+        default=None,
+        help="With --since, where to write the JSONL diff (default: <output>.diff.jsonl).",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        type=int,
+        default=None,
+        help=(
+            "Number of concurrent workers, or in-flight requests with --engine async "
+            "(overrides the 'concurrency' setting)."
+        ),
+    )
+    parser.add_argument(
+        "--engine",
+        dest="engine",
+        choices=["threads", "async"],
+        default=None,
+        help="Execution engine (overrides the 'engine' setting, default: threads).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Bypass the on-disk response cache for this run.",
+    )
+    parser.add_argument(
+        "--refresh",
+        dest="refresh_cache",
+        action="store_true",
+        help="Ignore cached responses but store the fresh ones.",
+    )
     parser.add_argument(
         "--settings",
         dest="settings_path",
@@ -254,7 +1507,247 @@ def build_arg_parser() -> argparse.ArgumentParser:
     )
     return parser
 
+def build_merge_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="spyfu-bulk-urls merge",
+        description="Stream several shard outputs (JSON, JSONL or CSV) into one file.",
+    )
+    parser.add_argument("inputs", nargs="+", help="Shard output files to merge, in order.")
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output_path",
+        required=True,
+        help="Merged output file.",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="output_format",
+        choices=["json", "jsonl", "csv", "parquet", "arrow"],
+        default=None,
+        help="Output format (default: from the output file extension).",
+    )
+    parser.add_argument(
+        "--csv-layout",
+        dest="csv_layout",
+        choices=list(CSV_LAYOUTS),
+        default="flat",
+        help="CSV layout when merging JSON/JSONL shards into CSV.",
+    )
+    parser.add_argument(
+        "--log-config",
+        dest="log_config_path",
+        default="src/config/logging.conf",
+        help="Path to logging configuration file.",
+    )
+    return parser
+
+def merge_from_cli(argv: List[str]) -> None:
+    args = build_merge_arg_parser().parse_args(argv)
+    configure_logging(args.log_config_path)
+    merge_outputs(args.inputs, args.output_path, args.output_format, csv_layout=args.csv_layout)
+
+def _add_queue_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--queue",
+        dest="queue_path",
+        default=None,
+        help="Path to the SQLite job queue (setting: queue_path).",
+    )
+    parser.add_argument(
+        "--settings",
+        dest="settings_path",
+        default="src/config/settings.example.json",
+        help="Path to JSON settings file.",
+    )
+    parser.add_argument(
+        "--log-config",
+        dest="log_config_path",
+        default="src/config/logging.conf",
+        help="Path to logging configuration file.",
+    )
+
+def build_enqueue_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="spyfu-bulk-urls enqueue",
+        description="Add URLs to the work queue for 'spyfu-bulk-urls worker' processes.",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        dest="input_file",
+        default=None,
+        help="Path to input file containing website URLs (one per line).",
+    )
+    parser.add_argument(
+        "-c",
+        "--country",
+        dest="country",
+        default=None,
+        help="Target country code (e.g. US, UK, DE).",
+    )
+    parser.add_argument(
+        "-p",
+        "--process",
+        dest="process_type",
+        nargs="+",
+        choices=[*PROCESS_TYPES, "all"],
+        default=None,
+        help="Type(s) of SpyFu-based process to run for every URL.",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        dest="retry_failed",
+        action="store_true",
+        help="Put every failed job back in the queue with a fresh attempt budget.",
+    )
+    _add_queue_arguments(parser)
+    return parser
+
+def enqueue_from_cli(argv: List[str]) -> None:
+    parser = build_enqueue_arg_parser()
+    args = parser.parse_args(argv)
+    if args.input_file and not args.process_type:
+        parser.error("--process is required with --input")
+    if not args.input_file and not args.retry_failed:
+        parser.error("pass --input (with --process) and/or --retry-failed")
+    configure_logging(args.log_config_path)
+    settings = load_settings(args.settings_path)
+    with open_work_queue(settings, args.queue_path) as queue:
+        if args.retry_failed:
+            LOGGER.info("Requeued %d failed job(s).", queue.requeue_failed())
+        if args.input_file:
+            enqueue_urls(
+                queue,
+                iter_urls_from_file(args.input_file),
+                args.country,
+                args.process_type,
+                normalizer=build_domain_normalizer(settings),
+            )
+
+def build_worker_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="spyfu-bulk-urls worker",
+        description=(
+            "Process jobs from the work queue. Start as many workers as needed on "
+            "the host that holds the queue file (it must be local, not on a network "
+            "filesystem); export results with 'spyfu-bulk-urls merge <queue> -o <output>'."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        default=None,
+        help="Threads in this worker (default: settings 'concurrency').",
+    )
+    parser.add_argument(
+        "--batch-size",
+        dest="batch_size",
+        type=int,
+        default=None,
+        help="Jobs leased at a time (setting: queue_batch_size).",
+    )
+    parser.add_argument(
+        "--visibility-timeout",
+        dest="visibility_timeout",
+        type=float,
+        default=None,
+        help="Seconds before an unextended lease can be taken by another worker.",
+    )
+    parser.add_argument(
+        "--worker-id",
+        dest="worker_id",
+        default=None,
+        help="Name recorded on leases (default: <hostname>-<pid>).",
+    )
+    parser.add_argument(
+        "--drain",
+        dest="drain",
+        action="store_true",
+        help="Exit once the queue has no pending or leased jobs instead of polling.",
+    )
+    _add_queue_arguments(parser)
+    return parser
+
+def worker_from_cli(argv: List[str]) -> None:
+    args = build_worker_arg_parser().parse_args(argv)
+    configure_logging(args.log_config_path)
+    settings = load_settings(args.settings_path)
+    if args.visibility_timeout is not None:
+        settings["queue_visibility_timeout_seconds"] = args.visibility_timeout
+    run_worker(
+        settings,
+        queue_path=args.queue_path,
+        worker_id=args.worker_id,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        drain=args.drain,
+    )
+
+def build_serve_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="spyfu-bulk-urls serve",
+        description=(
+            "Serve a local HTTP API that keeps one SpyFu client warm. POST "
+            '{"urls": [...], "country": "US", "process_type": "top_ads"} to /process '
+            "and read the records back as NDJSON."
+        ),
+    )
+    parser.add_argument(
+        "--host",
+        dest="host",
+        default=None,
+        help="Interface to bind (setting: serve_host, default: 127.0.0.1).",
+    )
+    parser.add_argument(
+        "--port",
+        dest="port",
+        type=int,
+        default=None,
+        help="Port to listen on (setting: serve_port, default: 8765).",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        default=None,
+        help="Threads per request (default: settings 'concurrency').",
+    )
+    parser.add_argument(
+        "--settings",
+        dest="settings_path",
+        default="src/config/settings.example.json",
+        help="Path to JSON settings file.",
+    )
+    parser.add_argument(
+        "--log-config",
+        dest="log_config_path",
+        default="src/config/logging.conf",
+        help="Path to logging configuration file.",
+    )
+    return parser
+
+def serve_from_cli(argv: List[str]) -> None:
+    args = build_serve_arg_parser().parse_args(argv)
+    configure_logging(args.log_config_path)
+    run_server(load_settings(args.settings_path), host=args.host, port=args.port, workers=args.workers)
+
+# Subcommands take precedence over the default "run" arguments.
+SUBCOMMANDS: Dict[str, Callable[[List[str]], None]] = {
+    "merge": merge_from_cli,
+    "enqueue": enqueue_from_cli,
+    "worker": worker_from_cli,
+    "serve": serve_from_cli,
+}
+
 def main_from_cli(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in SUBCOMMANDS:
+        SUBCOMMANDS[argv[0]](argv[1:])
+        return
+
     parser = build_arg_parser()
     args = parser.parse_args(argv)
     run_bulk(
@@ -265,6 +1758,26 @@ def main_from_cli(argv: Optional[List[str]] = None) -> None:
         output_path=args.output_path,
         settings_path=args.settings_path,
         log_config_path=args.log_config_path,
+        workers=args.workers,
+        engine=args.engine,
+        use_cache=args.use_cache,
+        refresh_cache=args.refresh_cache,
+        stream=args.stream,
+        resume=args.resume,
+        csv_layout=args.csv_layout,
+        validation_mode=args.validation_mode,
+        dead_letter_path=args.dead_letter_path,
+        metrics_textfile=args.metrics_textfile,
+        metrics_port=args.metrics_port,
+        metrics_summary=args.metrics_summary,
+        profile=args.profile,
+        profile_stages=args.profile_stages,
+        profile_output=args.profile_output,
+        profile_collapsed=args.profile_collapsed,
+        shard=args.shard,
+        since=args.since,
+        max_age=args.max_age,
+        diff_output=args.diff_output,
     )
 
 if __name__ == "__main__":
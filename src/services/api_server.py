@@ -0,0 +1,169 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from src.parsers.record import as_dict
+from src.services import json_codec
+
+LOGGER = logging.getLogger(__name__)
+
+# (urls, country, process_type) -> records. Raises ValueError for a bad
+# request before the first record is produced.
+BatchProcessor = Callable[[List[str], Optional[str], Union[str, List[str]]], Iterable[Dict[str, Any]]]
+
+class ApiServer:
+    """
+    Local HTTP API in front of a warm ``SpyfuClient``.
+
+    ``POST /process`` takes ``{"urls": [...], "country": "US", "process_type":
+    "top_ads"}`` (``process_type`` may be a list or ``"all"``). It streams the
+    records back as NDJSON, one line per record, using chunked transfer
+    encoding, so a client can read each record as soon as it is written.
+    ``GET /health`` answers ``{"status": "ok"}``. Requests are served on
+    separate threads that share ``process`` and therefore the client, its
+    throttler, proxies and caches.
+    """
+
+    def __init__(
+        self,
+        process: BatchProcessor,
+        port: int = 8765,
+        host: str = "127.0.0.1",
+        max_urls: int = 10000,
+    ) -> None:
+        self.host = host
+        self.max_urls = max_urls
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _api_handler(self, process))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "ApiServer":
+        """
+        Serve from a daemon thread and return immediately.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        LOGGER.info("Serving the SpyFu API at %s/process", self.url)
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Serve on the calling thread until interrupted.
+        """
+        LOGGER.info("Serving the SpyFu API at %s/process", self.url)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests_served += 1
+
+# Generous per-URL allowance used to cap the request body size.
+_MAX_BYTES_PER_URL = 4096
+
+def _content_length(value: Optional[str], max_urls: int) -> int:
+    try:
+        length = int(value or 0)
+    except ValueError:
+        raise ValueError(f"Invalid Content-Length: {value!r}") from None
+    if length < 0:
+        raise ValueError(f"Invalid Content-Length: {value!r}")
+    if length > max_urls * _MAX_BYTES_PER_URL:
+        raise ValueError(f"Request body too large ({length} bytes).")
+    return length
+
+def _parse_batch(body: bytes, max_urls: int) -> Dict[str, Any]:
+    try:
+        payload = json_codec.loads(body or b"{}")
+    except ValueError as exc:
+        raise ValueError(f"Request body is not valid JSON: {exc}") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object.")
+    urls = payload.get("urls")
+    if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+        raise ValueError("'urls' must be a list of strings.")
+    urls = [url.strip() for url in urls if url.strip()]
+    if len(urls) > max_urls:
+        raise ValueError(f"At most {max_urls} URLs per request; got {len(urls)}.")
+    country = payload.get("country")
+    if country is not None and not isinstance(country, str):
+        raise ValueError("'country' must be a string or null.")
+    process_type = payload.get("process_type", "all")
+    if not isinstance(process_type, str) and not (
+        isinstance(process_type, list) and all(isinstance(p, str) for p in process_type)
+    ):
+        raise ValueError("'process_type' must be a string or a list of strings.")
+    return {"urls": urls, "country": country, "process_type": process_type}
+
+def _api_handler(server: ApiServer, process: BatchProcessor) -> type:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?")[0] != "/health":
+                self._send_json(404, {"error": "Not found"})
+                return
+            self._send_json(200, {"status": "ok", "requests_served": server.requests_served})
+
+        def do_POST(self) -> None:  # noqa: N802
+            if self.path.split("?")[0] != "/process":
+                self._send_json(404, {"error": "Not found"})
+                return
+            try:
+                length = _content_length(self.headers.get("Content-Length"), server.max_urls)
+                batch = _parse_batch(self.rfile.read(length), server.max_urls)
+                records = iter(process(batch["urls"], batch["country"], batch["process_type"]))
+            except ValueError as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+            server._count_request()
+            self._stream(records)
+
+        def _stream(self, records: Iterator[Dict[str, Any]]) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            count = 0
+            try:
+                for record in records:
+                    line = json_codec.dumps(as_dict(record)) + b"\n"
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    self.wfile.flush()
+                    count += 1
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                LOGGER.warning("Client went away after %d record(s); stopping the batch.", count)
+                self.close_connection = True
+            finally:
+                close = getattr(records, "close", None)
+                if close is not None:
+                    close()
+            LOGGER.info("Streamed %d record(s) to %s", count, self.client_address[0])
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json_codec.dumps(payload)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            pass
+
+    return _Handler
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None  # type: ignore[assignment]
+
+from src.services import metrics, profiler
+from src.services.request_throttler import parse_retry_after
+from src.services.spyfu_client import SpyfuClient
+
+LOGGER = logging.getLogger(__name__)
+
+@dataclass
+class AsyncSpyfuClient(SpyfuClient):
+    """
+    asyncio variant of ``SpyfuClient`` backed by ``aiohttp``.
+
+    Exposes the same ``get_*`` methods as coroutines. A single
+    ``aiohttp.ClientSession`` is opened lazily and shared by every request; its
+    connector pools up to ``max_connections`` connections and honours
+    ``session_pool.keep_alive``. Call ``close()`` (or use ``async with``) when done.
+    """
+
+    max_connections: int = 100
+    _session: Optional[Any] = field(default=None, init=False, repr=False)
+
+    async def __aenter__(self) -> "AsyncSpyfuClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> Any:
+        if aiohttp is None:
+            raise RuntimeError(
+                "AsyncSpyfuClient requires aiohttp. Install it with "
+                "'pip install spyfu-bulk-urls[async]'."
+            )
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                force_close=not self.session_pool.keep_alive,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:  # type: ignore[override]
+        super().close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _classify_error(self, exc: Exception) -> Tuple[bool, Optional[float]]:
+        if aiohttp is not None and isinstance(exc, aiohttp.ClientResponseError):
+            retry_after = parse_retry_after((exc.headers or {}).get("Retry-After"))
+            return self.retry_policy.is_retryable_status(exc.status), retry_after
+        if isinstance(exc, asyncio.TimeoutError) or (
+            aiohttp is not None
+            and isinstance(exc, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+        ):
+            return True, None
+        return super()._classify_error(exc)
+
+    async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Any:  # type: ignore[override]
+        with profiler.section("fetch"):
+            return await self._fetch(endpoint, params)
+
+    async def _fetch(self, endpoint: str, params: Dict[str, Any]) -> Any:  # type: ignore[override]
+        if self._should_use_sample_data():
+            LOGGER.debug(
+                "Using sample data mode for endpoint=%s domain=%s",
+                endpoint,
+                params.get("domain"),
+            )
+            return self._fake_response(endpoint, params)
+
+        hit, cached = self._cache_lookup(endpoint, params)
+        if hit:
+            return cached
+
+        url = self._build_url(endpoint)
+        headers = self._build_headers()
+
+        proxy: Optional[str] = None
+        attempt = 0
+        while True:
+            attempt += 1
+            with metrics.stage("proxy_select"):
+                proxy = self._next_proxy(exclude=proxy)
+            try:
+                data = await self._send(endpoint, url, params, headers, proxy)
+            except Exception as exc:  # noqa: BLE001
+                delay = self._retry_delay(endpoint, params, attempt, exc)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._cache_store(endpoint, params, data)
+            return data
+
+    async def _send(  # type: ignore[override]
+        self,
+        endpoint: str,
+        url: str,
+        params: Dict[str, Any],
+        headers: Dict[str, str],
+        proxy: Optional[str],
+    ) -> Any:
+        if self.throttler:
+            with metrics.stage("throttle_wait"):
+                await self.throttler.acquire_async(proxy=proxy, endpoint=endpoint)
+
+        session = self._get_session()
+        LOGGER.debug("Requesting %s with params=%s", url, params)
+        started = time.monotonic()
+        try:
+            async with session.get(url, params=params, headers=headers, proxy=proxy) as resp:
+                body = await resp.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            self._report_error(proxy, endpoint, time.monotonic() - started)
+            raise
+        self._report_response(
+            proxy, endpoint, resp.status, resp.headers, time.monotonic() - started
+        )
+        resp.raise_for_status()
+        return self._decode_body(endpoint, resp.headers.get("Content-Type", ""), body)
+
+    async def get_top_competitors(  # type: ignore[override]
+        self,
+        domain: str,
+        country: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        return await self._make_request("top_competitors", self._build_params(domain, country))
+
+    async def get_most_valuable_keywords(  # type: ignore[override]
+        self,
+        domain: str,
+        country: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        return await self._make_request("most_valuable_keywords", self._build_params(domain, country))
+
+    async def get_newly_ranked_keywords(  # type: ignore[override]
+        self,
+        domain: str,
+        country: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        return await self._make_request("newly_ranked_keywords", self._build_params(domain, country))
+
+    async def get_top_ads(  # type: ignore[override]
+        self,
+        domain: str,
+        country: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        return await self._make_request("top_ads", self._build_params(domain, country))
+
+    async def get_domain_stats(  # type: ignore[override]
+        self,
+        domain: str,
+        country: Optional[str],
+    ) -> Dict[str, Any]:
+        return await self._make_request("domain_stats", self._build_params(domain, country))
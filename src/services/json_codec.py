@@ -0,0 +1,121 @@
+import json
+import logging
+from typing import Any, List, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+JSON_CODECS = ("auto", "orjson", "ujson", "json")
+
+class JsonCodec:
+    """
+    JSON encoding and decoding through the standard library.
+
+    ``loads`` accepts ``bytes`` or ``str``. ``dumps`` returns UTF-8 ``bytes``
+    with non-ASCII text kept as is. Decode errors are ``ValueError``
+    subclasses for every codec.
+    """
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def dumps_pretty(self, obj: Any) -> bytes:
+        """
+        Two-space indented output, as used for ``.json`` exports.
+        """
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+class OrjsonCodec(JsonCodec):
+    """
+    orjson: the fastest option; output is compact.
+    """
+
+    name = "orjson"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def dumps_pretty(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+    def dumps_pretty(self, obj: Any) -> bytes:
+        return ujson.dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False, indent=2
+        ).encode("utf-8")
+
+def available_codecs() -> List[str]:
+    names = ["json"]
+    if ujson is not None:
+        names.insert(0, "ujson")
+    if orjson is not None:
+        names.insert(0, "orjson")
+    return names
+
+def get_codec(name: str = "auto") -> JsonCodec:
+    """
+    Codec by name; ``"auto"`` picks orjson, then ujson, then the standard library.
+    """
+    if name not in JSON_CODECS:
+        raise ValueError(f"Unsupported JSON codec: {name}. Choose from: {', '.join(JSON_CODECS)}")
+    if name == "auto":
+        name = available_codecs()[0]
+    if name == "orjson":
+        if orjson is None:
+            raise RuntimeError(
+                "json_codec 'orjson' needs orjson. Install it with: pip install spyfu-bulk-urls[fastjson]"
+            )
+        return OrjsonCodec()
+    if name == "ujson":
+        if ujson is None:
+            raise RuntimeError("json_codec 'ujson' needs ujson. Install it with: pip install ujson")
+        return UjsonCodec()
+    return JsonCodec()
+
+# The codec used by the client, cache and exporters.
+_ACTIVE: JsonCodec = get_codec("auto")
+
+def configure(name: str = "auto") -> JsonCodec:
+    global _ACTIVE
+    codec = get_codec(name)
+    if codec.name != _ACTIVE.name:
+        LOGGER.info("Using JSON codec: %s", codec.name)
+    _ACTIVE = codec
+    return codec
+
+def active() -> JsonCodec:
+    return _ACTIVE
+
+def loads(data: Union[bytes, str]) -> Any:
+    return _ACTIVE.loads(data)
+
+def dumps(obj: Any) -> bytes:
+    return _ACTIVE.dumps(obj)
+
+def dumps_pretty(obj: Any) -> bytes:
+    return _ACTIVE.dumps_pretty(obj)
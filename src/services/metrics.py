@@ -0,0 +1,282 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+LOGGER = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Upper bounds in seconds; wide enough for microsecond stages and slow requests.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+HELP = {
+    "spyfu_stage_seconds": "Time spent per pipeline stage.",
+    "spyfu_http_request_seconds": "HTTP request latency by endpoint and proxy.",
+    "spyfu_http_responses_total": "HTTP responses by endpoint and status.",
+    "spyfu_http_errors_total": "Requests that failed without a response.",
+    "spyfu_retries_total": "Retried requests by endpoint.",
+    "spyfu_cache_lookups_total": "Response cache lookups by result.",
+    "spyfu_records_total": "Records written.",
+    "spyfu_records_invalid_total": "Records that failed schema validation.",
+}
+
+def proxy_label(proxy: Optional[str]) -> str:
+    """
+    ``host:port`` of a proxy URL, never its credentials.
+    """
+    if not proxy:
+        return "direct"
+    parts = urlsplit(proxy)
+    return f"{parts.hostname}:{parts.port}" if parts.port else str(parts.hostname)
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.max
+            if bucket_count and seen + bucket_count >= target:
+                return min(lower + (upper - lower) * (target - seen) / bucket_count, self.max)
+            seen += bucket_count
+            lower = upper
+        return self.max
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms keyed by metric name and labels.
+
+    Metrics are created on first use. ``render_prometheus()`` produces the
+    text exposition format and ``summary()`` a JSON-friendly digest with
+    estimated percentiles.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.started = time.time()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        labels = _format_labels(key + (("le", f"{bound:g}"),))
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = _format_labels(key + (("le", "+Inf"),))
+                    lines.append(f"{name}_bucket{labels} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        counters: Dict[str, List[Dict[str, Any]]] = {}
+        histograms: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                counters[name] = [
+                    {"labels": dict(key), "value": value} for key, value in sorted(series.items())
+                ]
+            for name, series in sorted(self._histograms.items()):
+                histograms[name] = [
+                    {
+                        "labels": dict(key),
+                        "count": h.count,
+                        "sum_seconds": round(h.sum, 6),
+                        "mean_ms": round(h.sum / h.count * 1000, 3) if h.count else 0.0,
+                        "p50_ms": round(h.quantile(0.50) * 1000, 3),
+                        "p95_ms": round(h.quantile(0.95) * 1000, 3),
+                        "p99_ms": round(h.quantile(0.99) * 1000, 3),
+                        "max_ms": round(h.max * 1000, 3),
+                    }
+                    for key, h in sorted(series.items())
+                ]
+        return {
+            "started": self.started,
+            "elapsed_seconds": round(time.time() - self.started, 3),
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Write the Prometheus text format atomically (for node_exporter's
+        textfile collector).
+        """
+        _write_atomic(path, self.render_prometheus())
+
+    def write_summary(self, path: str) -> None:
+        _write_atomic(path, json.dumps(self.summary(), indent=2) + "\n")
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+def _write_atomic(path: str, text: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+# The active registry. ``None`` means metrics are disabled and every helper
+# below returns after a single global lookup.
+_REGISTRY: Optional[MetricsRegistry] = None
+
+def enable(buckets: Sequence[float] = DEFAULT_BUCKETS) -> MetricsRegistry:
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = MetricsRegistry(buckets)
+    return _REGISTRY
+
+def disable() -> None:
+    global _REGISTRY
+    _REGISTRY = None
+
+def registry() -> Optional[MetricsRegistry]:
+    return _REGISTRY
+
+def inc(name: str, value: float = 1.0, **labels: str) -> None:
+    if _REGISTRY is not None:
+        _REGISTRY.inc(name, value, labels)
+
+def observe(name: str, value: float, **labels: str) -> None:
+    if _REGISTRY is not None:
+        _REGISTRY.observe(name, value, labels)
+
+class _Timer:
+    __slots__ = ("registry", "stage", "started")
+
+    def __init__(self, registry: MetricsRegistry, stage: str) -> None:
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.registry.observe(
+            "spyfu_stage_seconds", time.perf_counter() - self.started, {"stage": self.stage}
+        )
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+_NULL_TIMER = _NullTimer()
+
+def stage(name: str) -> Any:
+    """
+    Context manager timing one pipeline stage into ``spyfu_stage_seconds``.
+    """
+    if _REGISTRY is None:
+        return _NULL_TIMER
+    return _Timer(_REGISTRY, name)
+
+class MetricsServer:
+    """
+    Serves the active registry at ``http://<host>:<port>/metrics`` from a
+    daemon thread.
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = "127.0.0.1") -> None:
+        self.host = host
+        self._server = ThreadingHTTPServer((host, port), _metrics_handler(registry))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        LOGGER.info("Serving metrics at http://%s:%d/metrics", self.host, self.port)
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+def _metrics_handler(registry: MetricsRegistry) -> type:
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            pass
+
+    return _Handler
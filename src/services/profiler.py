@@ -0,0 +1,306 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cpu", "mem")
+PROFILE_STAGES = ("fetch", "normalize", "validate", "export")
+
+# Source files whose allocations are attributed to each stage in memory reports.
+STAGE_FILES: Dict[str, Tuple[str, ...]] = {
+    "fetch": ("*/src/services/*",),
+    "normalize": ("*/src/parsers/*", "*/src/processors/*"),
+    "validate": ("*/src/outputs/schema_validator.py",),
+    "export": ("*/src/outputs/exporters.py", "*/src/outputs/arrow_exporter.py"),
+}
+
+def parse_stages(value: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """
+    Turn ``"fetch,export"`` (or a list of names) into a validated tuple;
+    empty means every stage.
+    """
+    if not value:
+        return PROFILE_STAGES
+    names = value.split(",") if isinstance(value, str) else list(value)
+    stages = [n.strip() for n in names if n.strip()]
+    unknown = [s for s in stages if s not in PROFILE_STAGES]
+    if unknown:
+        raise ValueError(
+            f"Unknown profile stage(s): {', '.join(unknown)}. "
+            f"Choose from: {', '.join(PROFILE_STAGES)}"
+        )
+    return tuple(s for s in PROFILE_STAGES if s in stages)
+
+class StageProfiler:
+    """
+    Profiles selected pipeline stages of a run.
+
+    ``mode="cpu"`` runs ``cProfile`` only while a targeted stage is executing.
+    Each thread gets its own profiler and the results are merged. The output
+    is ``<output_prefix>.prof`` (pstats) plus a text report
+    ``<output_prefix>.txt``, and optionally a collapsed-stack file for
+    flamegraph tools. ``mode="mem"`` traces allocations with ``tracemalloc``.
+    For every stage it records the net memory growth per call. At the end it
+    writes the top allocators within that stage's source files to
+    ``<output_prefix>.mem.txt``.
+
+    With the threaded or async engine several stages overlap in time, so the
+    attribution is approximate.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        output_prefix: str,
+        stages: Optional[Iterable[str]] = None,
+        collapsed_path: Optional[str] = None,
+        top: int = 25,
+        frames: int = 25,
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unsupported profile mode: {mode}")
+        self.mode = mode
+        self.output_prefix = output_prefix
+        self.stages = parse_stages(stages)
+        self.collapsed_path = collapsed_path
+        self.top = top
+        self.frames = frames
+        self.files: List[str] = []
+        self._profiles: List[cProfile.Profile] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._mem: Dict[str, Dict[str, int]] = {
+            s: {"calls": 0, "growth_bytes": 0, "max_growth_bytes": 0} for s in self.stages
+        }
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if self.mode == "mem" and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        LOGGER.info("Profiling (%s) stages: %s", self.mode, ", ".join(self.stages))
+
+    def section(self, stage: str) -> Any:
+        if stage not in self.stages:
+            return _NULL_SECTION
+        if self.mode == "cpu":
+            return _CpuSection(self)
+        return _MemSection(self, stage)
+
+    def _thread_profile(self) -> cProfile.Profile:
+        profile = getattr(self._local, "profile", None)
+        if profile is None:
+            profile = cProfile.Profile()
+            self._local.profile = profile
+            self._local.depth = 0
+            with self._lock:
+                self._profiles.append(profile)
+        return profile
+
+    def _record_growth(self, stage: str, growth: int) -> None:
+        with self._lock:
+            entry = self._mem[stage]
+            entry["calls"] += 1
+            entry["growth_bytes"] += growth
+            entry["max_growth_bytes"] = max(entry["max_growth_bytes"], growth)
+
+    def stop(self) -> List[str]:
+        """
+        Write the reports and return their paths.
+        """
+        directory = os.path.dirname(os.path.abspath(self.output_prefix))
+        os.makedirs(directory, exist_ok=True)
+        if self.mode == "cpu":
+            self._write_cpu_reports()
+        else:
+            self._write_mem_report()
+        for path in self.files:
+            LOGGER.info("Wrote %s profile to %s", self.mode, path)
+        return self.files
+
+    def _write_cpu_reports(self) -> None:
+        profiles = [p for p in self._profiles if _has_data(p)]
+        if not profiles:
+            LOGGER.warning("No profiled stage ran; nothing to report.")
+            return
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+
+        prof_path = f"{self.output_prefix}.prof"
+        stats.dump_stats(prof_path)
+        self.files.append(prof_path)
+
+        report = io.StringIO()
+        stats.stream = report  # type: ignore[attr-defined]
+        report.write(f"Stages: {', '.join(self.stages)}\n\n")
+        stats.sort_stats("cumulative").print_stats(self.top)
+        stats.sort_stats("tottime").print_stats(self.top)
+        txt_path = f"{self.output_prefix}.txt"
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        self.files.append(txt_path)
+
+        if self.collapsed_path:
+            write_collapsed_stacks(stats, self.collapsed_path)
+            self.files.append(self.collapsed_path)
+
+    def _write_mem_report(self) -> None:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+
+        lines = [
+            f"Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB",
+            "",
+        ]
+        for stage in self.stages:
+            entry = self._mem[stage]
+            mean = entry["growth_bytes"] / entry["calls"] if entry["calls"] else 0
+            lines.append(
+                f"== {stage}: {entry['calls']} call(s), net growth "
+                f"{entry['growth_bytes'] / 1024:.1f} KiB, mean {mean:.0f} B, "
+                f"max {entry['max_growth_bytes'] / 1024:.1f} KiB"
+            )
+            filters = [tracemalloc.Filter(True, p, all_frames=True) for p in STAGE_FILES[stage]]
+            for stat in snapshot.filter_traces(filters).statistics("lineno")[: self.top]:
+                lines.append(f"  {stat}")
+            lines.append("")
+        lines.append(f"== top {self.top} allocators overall")
+        lines.extend(f"  {stat}" for stat in snapshot.statistics("lineno")[: self.top])
+
+        path = f"{self.output_prefix}.mem.txt"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        self.files.append(path)
+
+def _has_data(profile: cProfile.Profile) -> bool:
+    profile.create_stats()
+    return bool(profile.stats)  # type: ignore[attr-defined]
+
+class _CpuSection:
+    __slots__ = ("profiler",)
+
+    def __init__(self, profiler: StageProfiler) -> None:
+        self.profiler = profiler
+
+    def __enter__(self) -> None:
+        profile = self.profiler._thread_profile()
+        local = self.profiler._local
+        local.depth += 1
+        if local.depth == 1:
+            try:
+                profile.enable()
+                local.enabled = True
+            except ValueError:
+                # Python 3.12+ allows one active profiler per interpreter and it
+                # already sees every thread; let that one record this section.
+                local.enabled = False
+
+    def __exit__(self, *exc_info: Any) -> None:
+        local = self.profiler._local
+        local.depth -= 1
+        if local.depth == 0 and local.enabled:
+            local.profile.disable()
+
+class _MemSection:
+    __slots__ = ("profiler", "stage", "before")
+
+    def __init__(self, profiler: StageProfiler, stage: str) -> None:
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self) -> None:
+        self.before = tracemalloc.get_traced_memory()[0]
+
+    def __exit__(self, *exc_info: Any) -> None:
+        growth = tracemalloc.get_traced_memory()[0] - self.before
+        self.profiler._record_growth(self.stage, growth)
+
+class _NullSection:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+_NULL_SECTION = _NullSection()
+
+def _label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+def write_collapsed_stacks(stats: pstats.Stats, path: str, max_depth: int = 64) -> None:
+    """
+    Write approximate collapsed stacks (``a;b;c <microseconds>``) for
+    flamegraph.pl / speedscope.
+
+    cProfile only records caller/callee pairs, so each function's time is
+    split across its callers in proportion to the time spent under each one.
+    """
+    raw: Dict[Any, Any] = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[Any, List[Any]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+
+    totals: Dict[str, float] = {}
+
+    def walk(func: Any, stack: Sequence[str], share: float) -> None:
+        _, _, tottime, cumtime, _ = raw[func]
+        if cumtime * share < 1e-6:
+            return
+        path_key = ";".join(stack)
+        totals[path_key] = totals.get(path_key, 0.0) + tottime * share
+        if len(stack) >= max_depth:
+            return
+        for callee in callees.get(func, ()):
+            if _label(callee) in stack:
+                continue  # recursion
+            callee_cum = raw[callee][3]
+            edge_cum = raw[callee][4][func][3]
+            if callee_cum <= 0 or edge_cum <= 0:
+                continue
+            walk(callee, [*stack, _label(callee)], share * edge_cum / callee_cum)
+
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    for root in roots:
+        walk(root, [_label(root)], 1.0)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, seconds in sorted(totals.items()):
+            micros = int(seconds * 1_000_000)
+            if micros > 0:
+                f.write(f"{stack} {micros}\n")
+
+# The active profiler, if any; ``section`` is a no-op without one.
+_ACTIVE: Optional[StageProfiler] = None
+
+def activate(profiler: Optional[StageProfiler]) -> None:
+    global _ACTIVE
+    _ACTIVE = profiler
+
+def section(stage: str) -> Any:
+    """
+    Context manager marking a pipeline stage for the active profiler.
+    """
+    if _ACTIVE is None:
+        return _NULL_SECTION
+    return _ACTIVE.section(stage)
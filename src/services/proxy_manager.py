@@ -1,12 +1,76 @@
-import itertools
 import logging
-from typing import Dict, Iterable, Optional
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 
 LOGGER = logging.getLogger(__name__)
 
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Weight given to the newest sample in the latency / error-rate moving averages.
+EWMA_ALPHA = 0.2
+# Latency assumed for proxies that have not answered yet, in seconds.
+DEFAULT_LATENCY = 1.0
+
+@dataclass
+class ProxyHealth:
+    url: str
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_ewma: Optional[float] = None
+    error_ewma: float = 0.0
+    state: str = CLOSED
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+
+    def record(self, ok: bool, latency: Optional[float]) -> None:
+        self.requests += 1
+        self.error_ewma += EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_ewma)
+        if latency is not None:
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma += EWMA_ALPHA * (latency - self.latency_ewma)
+        if ok:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+    @property
+    def score(self) -> float:
+        """
+        Selection weight: favours proxies that answer quickly and rarely fail.
+        """
+        latency = self.latency_ewma if self.latency_ewma is not None else DEFAULT_LATENCY
+        success = 1.0 - self.error_ewma
+        return max(success * success, 0.01) / max(latency, 0.05)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "proxy": self.url,
+            "state": self.state,
+            "requests": self.requests,
+            "failures": self.failures,
+            "error_rate": round(self.failures / self.requests, 4) if self.requests else 0.0,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "score": round(self.score, 4),
+        }
+
 class ProxyManager:
     """
-    Simple round-robin proxy manager.
+    Health-aware proxy manager.
+
+    Tracks latency and error rate for every proxy and picks proxies at random,
+    weighted by health. After ``failure_threshold`` consecutive failures a proxy
+    is taken out of rotation (circuit open) for ``cooldown_seconds``. After
+    that it gets a single probe request (half-open), which either returns it
+    to rotation or opens the circuit again.
 
     Expected configuration format:
 
@@ -25,31 +89,126 @@ class ProxyManager:
     }
     """
 
-    def __init__(self, config: Dict) -> None:
-        self._proxies: Iterable[str] = []
-        self._it: Optional[Iterable[str]] = None
+    def __init__(
+        self,
+        config: Dict,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._proxies: List[str] = []
+        self._health: Dict[str, ProxyHealth] = {}
+        self._lock = threading.Lock()
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = max(0.0, cooldown_seconds)
+        self._rng = rng or random.Random()
 
         if not config:
             LOGGER.info("ProxyManager initialized without proxies.")
             return
 
         if "rotating" in config:
-            self._proxies = list(config.get("rotating") or [])
+            # Repeated entries would share one health record; keep the first.
+            self._proxies = list(dict.fromkeys(config.get("rotating") or []))
         else:
             urls = set()
             for key in ("http", "https"):
                 urls.update(config.get(key) or [])
-            self._proxies = list(urls)
+            self._proxies = sorted(urls)
 
         if self._proxies:
             LOGGER.info("ProxyManager loaded %d proxies.", len(self._proxies))
-            self._it = itertools.cycle(self._proxies)
+            self._health = {url: ProxyHealth(url) for url in self._proxies}
         else:
             LOGGER.info("ProxyManager received empty proxy list.")
 
-    def get_proxy(self) -> Optional[str]:
-        if not self._it:
+    def get_proxy(self, exclude: Optional[str] = None) -> Optional[str]:
+        """
+        Pick a proxy. ``exclude`` (e.g. the proxy a failed attempt used) is
+        avoided whenever another healthy proxy is available.
+        """
+        if not self._health:
             return None
-        proxy = next(self._it)
+        with self._lock:
+            proxy = self._select(time.monotonic(), exclude)
         LOGGER.debug("Using proxy: %s", proxy)
-        return proxy
\ No newline at end of file
+        return proxy
+
+    def _select(self, now: float, exclude: Optional[str] = None) -> str:
+        healthy: List[ProxyHealth] = []
+        excluded_probe: Optional[ProxyHealth] = None
+        for health in self._health.values():
+            if health.state == OPEN and now - health.opened_at >= self.cooldown_seconds:
+                health.state = HALF_OPEN
+                health.probe_in_flight = False
+            if health.state == HALF_OPEN and not health.probe_in_flight:
+                if health.url == exclude:
+                    # Probe it only if nothing else is usable.
+                    excluded_probe = health
+                    continue
+                # Send exactly one probe through a recovering proxy.
+                health.probe_in_flight = True
+                LOGGER.debug("Probing half-open proxy %s", health.url)
+                return health.url
+            if health.state == CLOSED:
+                healthy.append(health)
+
+        if exclude is not None and len(healthy) > 1:
+            healthy = [h for h in healthy if h.url != exclude]
+        if healthy:
+            weights = [h.score for h in healthy]
+            return self._rng.choices(healthy, weights=weights, k=1)[0].url
+        if excluded_probe is not None:
+            excluded_probe.probe_in_flight = True
+            LOGGER.debug("Probing half-open proxy %s", excluded_probe.url)
+            return excluded_probe.url
+
+        # Every circuit is open: use the proxy whose cooldown ends first rather
+        # than silently falling back to a direct connection.
+        return min(self._health.values(), key=lambda h: h.opened_at).url
+
+    def report_success(self, proxy: Optional[str], latency: Optional[float] = None) -> None:
+        if not proxy or proxy not in self._health:
+            return
+        with self._lock:
+            health = self._health[proxy]
+            health.record(True, latency)
+            if health.state != CLOSED:
+                LOGGER.info("Proxy %s recovered; closing circuit.", proxy)
+            health.state = CLOSED
+            health.probe_in_flight = False
+
+    def report_failure(self, proxy: Optional[str], latency: Optional[float] = None) -> None:
+        if not proxy or proxy not in self._health:
+            return
+        with self._lock:
+            health = self._health[proxy]
+            health.record(False, latency)
+            health.probe_in_flight = False
+            if health.state == HALF_OPEN or (
+                health.state == CLOSED and health.consecutive_failures >= self.failure_threshold
+            ):
+                health.state = OPEN
+                health.opened_at = time.monotonic()
+                LOGGER.warning(
+                    "Proxy %s failed %d time(s) in a row; cooling down for %.0fs.",
+                    proxy,
+                    health.consecutive_failures,
+                    self.cooldown_seconds,
+                )
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._health[url].as_dict() for url in self._proxies]
+
+    def log_stats(self) -> None:
+        for entry in self.stats():
+            LOGGER.info(
+                "Proxy %s: state=%s requests=%d failures=%d error_rate=%.2f latency=%sms",
+                entry["proxy"],
+                entry["state"],
+                entry["requests"],
+                entry["failures"],
+                entry["error_rate"],
+                entry["latency_ewma_ms"],
+            )
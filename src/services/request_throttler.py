@@ -1,26 +1,187 @@
+import asyncio
+import email.utils
 import logging
 import threading
 import time
+from typing import Dict, Optional, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
+# Floor for the adaptive slow-down: a bucket never drops below this fraction of
+# its configured rate, however many 429s it sees.
+MIN_RATE_FACTOR = 0.1
+# Fraction of the configured rate regained after each successful request.
+RECOVERY_STEP = 0.05
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header (delta-seconds or HTTP-date) into seconds.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        LOGGER.debug("Ignoring unparseable Retry-After header: %r", value)
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations.
+
+    ``reserve`` always takes a token and returns how long the caller must wait
+    for it, letting the balance go negative. Callers can therefore sleep
+    without holding any lock while later callers queue up behind them.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1) -> None:
+        self.rate_per_minute = max(1.0, float(rate_per_minute))
+        self.capacity = float(max(1, burst))
+        self.rate_factor = 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    @property
+    def rate_per_second(self) -> float:
+        return self.rate_per_minute * self.rate_factor / 60.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+            self._updated = now
+
+    def reserve(self, now: float) -> float:
+        self._refill(now)
+        self._tokens -= 1.0
+        wait = -self._tokens / self.rate_per_second if self._tokens < 0 else 0.0
+        return max(wait, self._paused_until - now)
+
+    def slow_down(self, now: float, retry_after: Optional[float] = None) -> None:
+        self._refill(now)
+        self.rate_factor = max(MIN_RATE_FACTOR, self.rate_factor / 2.0)
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+    def recover(self, now: float) -> None:
+        if self.rate_factor < 1.0:
+            self._refill(now)
+            self.rate_factor = min(1.0, self.rate_factor + RECOVERY_STEP)
+
 class RequestThrottler:
     """
-    Simple time-based throttler to enforce a maximum rate per minute.
+    Token-bucket rate limiter.
+
+    Every request draws from a global bucket (``rate_per_minute`` with up to
+    ``burst`` requests at once) and, when configured, from a bucket for its
+    proxy and one for its endpoint. The caller waits for whichever bucket is
+    furthest behind. Waiting happens outside the lock, so callers do not block
+    each other. Threads use ``acquire`` and asyncio code uses
+    ``acquire_async``; both share the same buckets.
+
+    ``report_throttled`` halves the rate of the affected bucket and honours
+    ``Retry-After``; ``report_success`` gradually restores it.
     """
 
-    def __init__(self, rate_per_minute: int = 60) -> None:
+    def __init__(
+        self,
+        rate_per_minute: int = 60,
+        burst: int = 1,
+        proxy_rate_per_minute: Optional[int] = None,
+        endpoint_rates_per_minute: Optional[Dict[str, int]] = None,
+    ) -> None:
         self.rate_per_minute = max(1, rate_per_minute)
+        self.burst = max(1, burst)
+        self.proxy_rate_per_minute = proxy_rate_per_minute
         self._lock = threading.Lock()
-        self._min_interval = 60.0 / float(self.rate_per_minute)
-        self._last_request_ts = 0.0
+        self._global = TokenBucket(self.rate_per_minute, self.burst)
+        self._proxy_buckets: Dict[str, TokenBucket] = {}
+        self._endpoint_buckets: Dict[str, TokenBucket] = {
+            endpoint: TokenBucket(rpm, self.burst)
+            for endpoint, rpm in (endpoint_rates_per_minute or {}).items()
+        }
+
+    def _proxy_bucket(self, proxy: Optional[str], create: bool = False) -> Optional[TokenBucket]:
+        if not proxy:
+            return None
+        bucket = self._proxy_buckets.get(proxy)
+        if bucket is None and (create or self.proxy_rate_per_minute):
+            rpm = self.proxy_rate_per_minute or self.rate_per_minute
+            bucket = TokenBucket(rpm, self.burst)
+            self._proxy_buckets[proxy] = bucket
+        return bucket
+
+    def _buckets(
+        self,
+        proxy: Optional[str],
+        endpoint: Optional[str],
+        create: bool = False,
+    ) -> Tuple[TokenBucket, ...]:
+        buckets = [self._global]
+        proxy_bucket = self._proxy_bucket(proxy, create=create)
+        if proxy_bucket is not None:
+            buckets.append(proxy_bucket)
+        if endpoint and endpoint in self._endpoint_buckets:
+            buckets.append(self._endpoint_buckets[endpoint])
+        return tuple(buckets)
+
+    def reserve(self, proxy: Optional[str] = None, endpoint: Optional[str] = None) -> float:
+        """
+        Claim one request from every applicable bucket and return the number of
+        seconds the caller has to wait before sending it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return max(bucket.reserve(now) for bucket in self._buckets(proxy, endpoint))
+
+    def acquire(self, proxy: Optional[str] = None, endpoint: Optional[str] = None) -> None:
+        sleep_for = self.reserve(proxy, endpoint)
+        if sleep_for > 0:
+            LOGGER.debug("Throttling for %.3f seconds.", sleep_for)
+            time.sleep(sleep_for)
+
+    async def acquire_async(self, proxy: Optional[str] = None, endpoint: Optional[str] = None) -> None:
+        sleep_for = self.reserve(proxy, endpoint)
+        if sleep_for > 0:
+            LOGGER.debug("Throttling for %.3f seconds.", sleep_for)
+            await asyncio.sleep(sleep_for)
+
+    def report_throttled(
+        self,
+        proxy: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """
+        Slow down after a 429 (or a ``Retry-After`` response).
+
+        The proxy's bucket is penalised when the request went through a proxy,
+        so one banned exit node does not slow down the others. Otherwise the
+        global bucket is. An endpoint bucket, if configured, is penalised too.
+        """
+        with self._lock:
+            now = time.monotonic()
+            target = self._proxy_bucket(proxy, create=True) or self._global
+            target.slow_down(now, retry_after)
+            if endpoint and endpoint in self._endpoint_buckets:
+                self._endpoint_buckets[endpoint].slow_down(now, retry_after)
+            LOGGER.warning(
+                "Rate limited (proxy=%s endpoint=%s retry_after=%s); rate now %.0f%%.",
+                proxy,
+                endpoint,
+                retry_after,
+                target.rate_factor * 100,
+            )
 
-    def acquire(self) -> None:
+    def report_success(self, proxy: Optional[str] = None, endpoint: Optional[str] = None) -> None:
         with self._lock:
             now = time.monotonic()
-            elapsed = now - self._last_request_ts
-            if elapsed < self._min_interval:
-                sleep_for = self._min_interval - elapsed
-                LOGGER.debug("Throttling for %.3f seconds.", sleep_for)
-                time.sleep(sleep_for)
-            self._last_request_ts = time.monotonic()
\ No newline at end of file
+            for bucket in self._buckets(proxy, endpoint):
+                bucket.recover(now)
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.services import json_codec
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for decoded SpyFu responses.
+
+    Entries are keyed by endpoint plus request params (domain, country) and
+    expire after ``ttl_seconds``, or after the endpoint's value in
+    ``ttl_by_endpoint`` (0 disables caching for that endpoint). Once the cache
+    holds more than ``max_entries`` rows, the least recently used ones are
+    evicted. With ``refresh`` enabled lookups always miss, but fresh responses
+    are still written back.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = 86400,
+        ttl_by_endpoint: Optional[Dict[str, float]] = None,
+        max_entries: int = 100000,
+        refresh: bool = False,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.ttl_by_endpoint = dict(ttl_by_endpoint or {})
+        self.max_entries = max(1, max_entries)
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        LOGGER.info("Response cache at %s holds %d entries.", path, self._size)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        return endpoint + "|" + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+    def ttl_for(self, endpoint: str) -> float:
+        return float(self.ttl_by_endpoint.get(endpoint, self.ttl_seconds))
+
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Return ``(True, value)`` on a fresh hit and ``(False, None)`` otherwise.
+        """
+        if self.refresh or self.ttl_for(endpoint) <= 0:
+            with self._lock:
+                self.misses += 1
+            return False, None
+
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._size -= 1
+                self.misses += 1
+                return False, None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        LOGGER.debug("Cache hit for %s", key)
+        return True, json_codec.loads(row[0])
+
+    def set(self, endpoint: str, params: Dict[str, Any], value: Any) -> None:
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        payload = json_codec.dumps(value).decode("utf-8")
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, endpoint, payload, now + ttl, now),
+            )
+            if not exists:
+                self._size += 1
+            if self._size > self.max_entries:
+                self._evict(self._size - self.max_entries)
+            self._conn.commit()
+
+    def _evict(self, count: int) -> None:
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+            (count,),
+        )
+        self._size -= count
+        self.evictions += count
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,49 @@
+import random
+from typing import Iterable, Optional
+
+# Statuses worth another attempt: timeouts, throttling and transient upstream errors.
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait first.
+
+    Attempts are capped at ``max_attempts`` (the first try included). Delays
+    use capped exponential backoff with full jitter: a random wait between 0
+    and ``min(max_delay, base_delay * 2 ** (attempt - 1))``. A ``Retry-After``
+    from the server is honoured as a lower bound, up to ``max_retry_after``.
+    Only network errors and ``retry_statuses`` are retryable; anything else
+    (4xx, malformed responses, ...) fails at once.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        max_retry_after: float = 120.0,
+        retry_statuses: Iterable[int] = RETRYABLE_STATUSES,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(0.0, max_delay)
+        self.max_retry_after = max(0.0, max_retry_after)
+        self.retry_statuses = frozenset(retry_statuses)
+        self._rng = rng or random.Random()
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def should_retry(self, attempt: int, retryable: bool) -> bool:
+        return retryable and attempt < self.max_attempts
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait after failed attempt number ``attempt`` (1-based).
+        """
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = self._rng.uniform(0.0, cap)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
@@ -0,0 +1,56 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LOGGER = logging.getLogger(__name__)
+
+class SessionPool:
+    """
+    Keeps one ``requests.Session`` per proxy URL so TCP/TLS connections are
+    reused across requests instead of being re-established every call.
+
+    ``pool_size`` bounds the number of keep-alive connections per host for each
+    session. With ``keep_alive`` disabled every request asks the server to
+    close the connection (the pre-pool behaviour).
+    """
+
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True) -> None:
+        self.pool_size = max(1, pool_size)
+        self.keep_alive = keep_alive
+        self._sessions: Dict[Optional[str], requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _new_session(self, proxy: Optional[str]) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if proxy:
+            session.proxies = {"http": proxy, "https": proxy}
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def get(self, proxy: Optional[str] = None) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(proxy)
+            if session is None:
+                LOGGER.debug("Opening HTTP session for proxy=%s", proxy)
+                session = self._new_session(proxy)
+                self._sessions[proxy] = session
+            return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+        if sessions:
+            LOGGER.debug("Closed %d HTTP session(s).", len(sessions))
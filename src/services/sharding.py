@@ -0,0 +1,55 @@
+import hashlib
+import logging
+from typing import Iterable, Iterator, Optional, Tuple
+
+from src.parsers.domain_normalizer import DomainNormalizer, get_normalizer
+
+LOGGER = logging.getLogger(__name__)
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parse ``"K/N"`` (1-based shard ``K`` of ``N``) into ``(K, N)``.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}'; expected K/N, e.g. 2/4.") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}'; K must be between 1 and N.")
+    return index, count
+
+def shard_of(domain: str, count: int) -> int:
+    """
+    Stable 1-based shard for ``domain``; the same on every host and run.
+    """
+    digest = hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+def _shard_key(url: str, normalizer: DomainNormalizer) -> str:
+    try:
+        return normalizer.normalize(url)
+    except ValueError:
+        return url.strip().lower()
+
+def filter_shard(
+    urls: Iterable[str],
+    index: int,
+    count: int,
+    normalizer: Optional[DomainNormalizer] = None,
+) -> Iterator[str]:
+    """
+    Yield the URLs whose normalized domain belongs to shard ``index`` of ``count``.
+
+    Pass the run's ``normalizer`` so shards agree with its notion of a
+    domain. All URLs of a domain land on the same shard, so per-domain
+    de-duplication and each node's response cache keep working.
+    """
+    normalizer = normalizer or get_normalizer()
+    kept = skipped = 0
+    for url in urls:
+        if shard_of(_shard_key(url, normalizer), count) == index:
+            kept += 1
+            yield url
+        else:
+            skipped += 1
+    LOGGER.info("Shard %d/%d: kept %d URLs, skipped %d.", index, count, kept, skipped)
@@ -1,13 +1,16 @@
-import json
 import logging
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import requests
 
+from src.services import json_codec, metrics, profiler
 from src.services.proxy_manager import ProxyManager
-from src.services.request_throttler import RequestThrottler
+from src.services.request_throttler import RequestThrottler, parse_retry_after
+from src.services.response_cache import ResponseCache
+from src.services.retry_policy import RetryPolicy
+from src.services.session_pool import SessionPool
 
 LOGGER = logging.getLogger(__name__)
 
@@ -19,20 +22,163 @@ class SpyfuClient:
     throttler: Optional[RequestThrottler] = None
     use_sample_data: bool = True
     timeout: int = 20
+    session_pool: SessionPool = field(default_factory=SessionPool)
+    cache: Optional[ResponseCache] = None
+    retry_policy: Optional[RetryPolicy] = None
 
-    def _get_proxies(self) -> Optional[Dict[str, str]]:
+    def _next_proxy(self, exclude: Optional[str] = None) -> Optional[str]:
         if not self.proxy_manager:
             return None
-        proxy_url = self.proxy_manager.get_proxy()
-        if not proxy_url:
+        return self.proxy_manager.get_proxy(exclude=exclude)
+
+    def close(self) -> None:
+        """
+        Close every pooled HTTP session and the response cache.
+        """
+        self.session_pool.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _should_use_sample_data(self) -> bool:
+        return self.use_sample_data or not self.api_key
+
+    def _build_url(self, endpoint: str) -> str:
+        return f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+
+    def _build_headers(self) -> Dict[str, str]:
+        headers = {"User-Agent": "SpyfuBulkUrlsClient/0.1.0"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    @staticmethod
+    def _build_params(domain: str, country: Optional[str]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"domain": domain}
+        if country:
+            params["country"] = country
+        return params
+
+    def _decode_body(self, endpoint: str, content_type: str, body: bytes) -> Any:
+        """
+        Decode a response body straight from bytes with the active JSON codec.
+        """
+        try:
+            with metrics.stage("decode"):
+                return json_codec.loads(body)
+        except ValueError:
+            if "application/json" in content_type:
+                raise
+            LOGGER.warning(
+                "Non-JSON response from SpyFu for %s. Returning raw text snippet.",
+                endpoint,
+            )
+            return {"raw": body[:4000].decode("utf-8", errors="replace")[:1000]}
+
+    def _cache_lookup(self, endpoint: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        if self.cache is None:
+            return False, None
+        hit, value = self.cache.get(endpoint, params)
+        metrics.inc("spyfu_cache_lookups_total", result="hit" if hit else "miss")
+        return hit, value
+
+    def _cache_store(self, endpoint: str, params: Dict[str, Any], data: Any) -> None:
+        # Non-JSON fallbacks ({"raw": ...}) are usually error pages; don't keep them.
+        if self.cache is not None and not (isinstance(data, dict) and list(data) == ["raw"]):
+            self.cache.set(endpoint, params, data)
+
+    def _report_response(
+        self,
+        proxy: Optional[str],
+        endpoint: str,
+        status: int,
+        headers: Mapping[str, str],
+        latency: float,
+    ) -> None:
+        """
+        Feed rate-limit and proxy health signals from a response back into the
+        throttler and proxy manager.
+        """
+        metrics.observe(
+            "spyfu_http_request_seconds", latency, endpoint=endpoint, proxy=metrics.proxy_label(proxy)
+        )
+        metrics.inc("spyfu_http_responses_total", endpoint=endpoint, status=str(status))
+        if self.proxy_manager:
+            if status == 429 or status >= 500:
+                self.proxy_manager.report_failure(proxy, latency)
+            else:
+                self.proxy_manager.report_success(proxy, latency)
+        if not self.throttler:
+            return
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if status == 429 or (retry_after is not None and status >= 500):
+            self.throttler.report_throttled(proxy=proxy, endpoint=endpoint, retry_after=retry_after)
+        elif status < 400:
+            self.throttler.report_success(proxy=proxy, endpoint=endpoint)
+
+    def _report_error(self, proxy: Optional[str], endpoint: str, latency: float) -> None:
+        """
+        Record a request that never produced a response (timeout, reset, ...).
+        """
+        metrics.inc("spyfu_http_errors_total", endpoint=endpoint, proxy=metrics.proxy_label(proxy))
+        if self.proxy_manager:
+            self.proxy_manager.report_failure(proxy, latency)
+
+    def _classify_error(self, exc: Exception) -> Tuple[bool, Optional[float]]:
+        """
+        Return ``(retryable, retry_after)`` for a failed attempt.
+        """
+        if isinstance(exc, requests.HTTPError) and exc.response is not None:
+            status = exc.response.status_code
+            retry_after = parse_retry_after(exc.response.headers.get("Retry-After"))
+            return self.retry_policy.is_retryable_status(status), retry_after
+        if isinstance(
+            exc,
+            (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError),
+        ):
+            return True, None
+        return False, None
+
+    def _retry_delay(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        attempt: int,
+        exc: Exception,
+    ) -> Optional[float]:
+        """
+        Seconds to wait before retrying after ``exc``, or ``None`` to give up.
+        """
+        if self.retry_policy is None:
             return None
-        return {
-            "http": proxy_url,
-            "https": proxy_url,
-        }
+        retryable, retry_after = self._classify_error(exc)
+        if not self.retry_policy.should_retry(attempt, retryable):
+            if retryable:
+                LOGGER.warning(
+                    "Giving up on %s for %s after %d attempt(s): %s",
+                    endpoint,
+                    params.get("domain"),
+                    attempt,
+                    exc,
+                )
+            return None
+        delay = self.retry_policy.delay(attempt, retry_after)
+        metrics.inc("spyfu_retries_total", endpoint=endpoint)
+        LOGGER.warning(
+            "Attempt %d of %s for %s failed (%s); retrying in %.2fs.",
+            attempt,
+            endpoint,
+            params.get("domain"),
+            exc,
+            delay,
+        )
+        return delay
 
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Any:
-        if self.use_sample_data or not self.api_key:
+        with profiler.section("fetch"):
+            return self._fetch(endpoint, params)
+
+    def _fetch(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        if self._should_use_sample_data():
             LOGGER.debug(
                 "Using sample data mode for endpoint=%s domain=%s",
                 endpoint,
@@ -40,40 +186,154 @@ class SpyfuClient:
             )
             return self._fake_response(endpoint, params)
 
-        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
-        headers = {"User-Agent": "SpyfuBulkUrlsClient/0.1.0"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
+        hit, cached = self._cache_lookup(endpoint, params)
+        if hit:
+            return cached
 
+        url = self._build_url(endpoint)
+        headers = self._build_headers()
+
+        proxy: Optional[str] = None
+        attempt = 0
+        while True:
+            attempt += 1
+            # Every retry goes out through a different proxy when one is available.
+            with metrics.stage("proxy_select"):
+                proxy = self._next_proxy(exclude=proxy)
+            try:
+                data = self._send(endpoint, url, params, headers, proxy)
+            except Exception as exc:  # noqa: BLE001
+                delay = self._retry_delay(endpoint, params, attempt, exc)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self._cache_store(endpoint, params, data)
+            return data
+
+    def _send(
+        self,
+        endpoint: str,
+        url: str,
+        params: Dict[str, Any],
+        headers: Dict[str, str],
+        proxy: Optional[str],
+    ) -> Any:
+        """
+        One attempt at a request: throttle, send, report and decode.
+        """
         if self.throttler:
-            self.throttler.acquire()
+            with metrics.stage("throttle_wait"):
+                self.throttler.acquire(proxy=proxy, endpoint=endpoint)
 
-        proxies = self._get_proxies()
+        session = self.session_pool.get(proxy)
         LOGGER.debug("Requesting %s with params=%s", url, params)
-        resp = requests.get(
-            url,
-            params=params,
-            headers=headers,
-            timeout=self.timeout,
-            proxies=proxies,
-        )
-        resp.raise_for_status()
-
-        ctype = resp.headers.get("Content-Type", "")
-        if "application/json" in ctype:
-            return resp.json()
+        started = time.monotonic()
         try:
-            return json.loads(resp.text)
-        except json.JSONDecodeError:
-            LOGGER.warning(
-                "Non-JSON response from SpyFu for %s. Returning raw text snippet.",
-                endpoint,
+            resp = session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=self.timeout,
             )
-            return {"raw": resp.text[:1000]}
+        except requests.RequestException:
+            self._report_error(proxy, endpoint, time.monotonic() - started)
+            raise
+        self._report_response(
+            proxy, endpoint, resp.status_code, resp.headers, time.monotonic() - started
+        )
+        resp.raise_for_status()
+        return self._decode_body(endpoint, resp.headers.get("Content-Type", ""), resp.content)
 
     def _fake_response(self, endpoint: str, params: Dict[str, Any]) -> Any:
         domain = params.get("domain", "example.com")
         country = params.get("country", "US")
         seed = hash((endpoint, domain, country, int(time.time()) // 3600)) & 0xFFFF
 
-        def pseudo_rand(n: int) -> float:
\ No newline at end of file
+        def pseudo_rand(n: int) -> float:
+            return (((seed * (n + 1)) % 1000) / 1000.0) + 0.01
+
+        if endpoint == "top_competitors":
+            return [
+                {
+                    "domain": f"{domain}-competitor-{i}.com",
+                    "overlap_score": round(pseudo_rand(i), 2),
+                    "estimated_monthly_clicks": int(5000 + pseudo_rand(i) * 20000),
+                    "organic_keywords": int(500 + pseudo_rand(i) * 2000),
+                    "paid_keywords": int(100 + pseudo_rand(i) * 800),
+                }
+                for i in range(1, 4)
+            ]
+
+        if endpoint == "most_valuable_keywords":
+            return [
+                {
+                    "keyword": f"{domain.split('.')[0]} keyword {i}",
+                    "search_volume": int(1000 + pseudo_rand(i) * 8000),
+                    "estimated_value": round(1.0 + pseudo_rand(i) * 9, 2),
+                    "position": i,
+                    "traffic_share": round(0.05 + pseudo_rand(i) * 0.2, 3),
+                }
+                for i in range(1, 6)
+            ]
+
+        if endpoint == "newly_ranked_keywords":
+            return [
+                {
+                    "keyword": f"{domain.split('.')[0]} new keyword {i}",
+                    "search_volume": int(500 + pseudo_rand(i) * 4000),
+                    "position": int(5 + pseudo_rand(i) * 40),
+                    "trend": "rising" if i % 2 == 0 else "stable",
+                }
+                for i in range(1, 5)
+            ]
+
+        if endpoint == "top_ads":
+            return [
+                {
+                    "headline": f"{domain} ad headline {i}",
+                    "description": f"Ad description {i} for {domain}",
+                    "ad_type": "text",
+                    "landing_page_url": f"https://{domain}/landing-{i}",
+                }
+                for i in range(1, 4)
+            ]
+
+        if endpoint == "domain_stats":
+            return {
+                "organic_keywords": int(2000 + pseudo_rand(1) * 10000),
+                "paid_keywords": int(500 + pseudo_rand(2) * 4000),
+                "estimated_monthly_clicks": int(8000 + pseudo_rand(3) * 40000),
+                "estimated_monthly_budget": round(3000 + pseudo_rand(4) * 12000, 2),
+            }
+
+        LOGGER.warning("Unknown endpoint %s for fake response", endpoint)
+        return {}
+
+    def get_top_competitors(self, domain: str, country: Optional[str]) -> List[Dict[str, Any]]:
+        params = self._build_params(domain, country)
+        return self._make_request("top_competitors", params)
+
+    def get_most_valuable_keywords(
+        self,
+        domain: str,
+        country: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        params = self._build_params(domain, country)
+        return self._make_request("most_valuable_keywords", params)
+
+    def get_newly_ranked_keywords(
+        self,
+        domain: str,
+        country: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        params = self._build_params(domain, country)
+        return self._make_request("newly_ranked_keywords", params)
+
+    def get_top_ads(self, domain: str, country: Optional[str]) -> List[Dict[str, Any]]:
+        params = self._build_params(domain, country)
+        return self._make_request("top_ads", params)
+
+    def get_domain_stats(self, domain: str, country: Optional[str]) -> Dict[str, Any]:
+        params = self._build_params(domain, country)
+        return self._make_request("domain_stats", params)
@@ -0,0 +1,308 @@
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.parsers.record import as_dict
+from src.services import json_codec
+
+LOGGER = logging.getLogger(__name__)
+
+JOB_STATES = ("pending", "leased", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    process_type TEXT NOT NULL,
+    country TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    UNIQUE (origin, process_type, country)
+);
+CREATE INDEX IF NOT EXISTS jobs_state_lease ON jobs (state, lease_expires);
+"""
+
+class Job(NamedTuple):
+    id: int
+    origin: str
+    domain: str
+    process_type: str
+    country: Optional[str]
+    attempts: int
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueue:
+    """
+    Durable job table in SQLite shared by any number of worker processes.
+
+    Each job is one ``(origin, process_type, country)``. ``process_type`` may
+    be a comma-joined list, which produces one merged record, as in a normal
+    run. A worker leases jobs for ``visibility_timeout`` seconds. If it does
+    not complete, fail or extend them in time (because it crashed or hung),
+    they become leasable again. A job leased ``max_attempts`` times without
+    success is marked ``failed``. Completed jobs keep their record, so the
+    queue file doubles as the run's output (see ``iter_results``).
+
+    The database runs in WAL mode, whose shared-memory index requires every
+    process to be on the same host. Any number of workers can share the
+    queue on one machine; it must not be opened from several hosts or over
+    a network filesystem (NFS, SMB). Use ``--shard`` to spread a run over
+    several hosts.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        visibility_timeout: float = 300,
+        max_attempts: int = 5,
+        busy_timeout: float = 30,
+    ) -> None:
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Autocommit mode; multi-statement updates use explicit transactions.
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def enqueue(
+        self,
+        jobs: Iterable[Tuple[str, str]],
+        process_type: str,
+        country: Optional[str],
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Add ``(origin, domain)`` jobs and return how many were new.
+
+        Jobs already in the queue (in any state) are left alone, so enqueueing
+        the same input twice is harmless.
+        """
+        added = 0
+        batch: List[Tuple[Any, ...]] = []
+        for origin, domain in jobs:
+            now = time.time()
+            batch.append((origin, domain, process_type, country or "", now, now))
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def _insert(self, rows: List[Tuple[Any, ...]]) -> int:
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO jobs "
+                    "(origin, domain, process_type, country, created, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def lease(self, owner: str, limit: int = 1) -> List[Job]:
+        """
+        Lease up to ``limit`` pending or expired jobs to ``owner``, oldest first.
+
+        Expired leases that already used up ``max_attempts`` are marked
+        ``failed`` instead of being handed out again.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                abandoned = self._conn.execute(
+                    "UPDATE jobs SET state = 'failed', lease_owner = NULL, updated = ?, "
+                    "error = 'lease expired after ' || attempts || ' attempt(s)' "
+                    "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                ).rowcount
+                rows = self._conn.execute(
+                    "SELECT id, origin, domain, process_type, country, attempts FROM jobs "
+                    "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                    "ORDER BY id LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    [(owner, now + self.visibility_timeout, now, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if abandoned:
+            LOGGER.warning("Gave up on %d job(s) whose leases kept expiring.", abandoned)
+        return [
+            Job(row[0], row[1], row[2], row[3], row[4] or None, row[5] + 1) for row in rows
+        ]
+
+    def extend(self, owner: str, job_ids: Iterable[int]) -> int:
+        """
+        Push back the lease expiry of ``owner``'s jobs; returns how many it still holds.
+        """
+        now = time.time()
+        with self._lock:
+            return self._conn.executemany(
+                "UPDATE jobs SET lease_expires = ?, updated = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                [(now + self.visibility_timeout, now, job_id, owner) for job_id in job_ids],
+            ).rowcount
+
+    def complete(self, owner: str, job_id: int, record: Dict[str, Any]) -> bool:
+        """
+        Store ``record`` and mark the job done.
+
+        Returns False (and stores nothing) when ``owner`` no longer holds the
+        lease because it expired and another worker took the job.
+        """
+        now = time.time()
+        payload = json_codec.dumps(as_dict(record)).decode("utf-8")
+        with self._lock:
+            changed = self._conn.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (payload, now, job_id, owner),
+            ).rowcount
+        if not changed:
+            LOGGER.warning("Lease on job %d was lost; dropping its result.", job_id)
+        return bool(changed)
+
+    def fail(self, owner: str, job_id: int, error: str, retry: bool = True) -> bool:
+        """
+        Release a job after a failed attempt.
+
+        The job goes back to ``pending`` while it has attempts left and
+        ``retry`` is true; otherwise it is marked ``failed``.
+        """
+        now = time.time()
+        with self._lock:
+            changed = self._conn.execute(
+                "UPDATE jobs SET state = CASE WHEN ? AND attempts < ? THEN 'pending' ELSE 'failed' END, "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (int(retry), self.max_attempts, error, now, job_id, owner),
+            ).rowcount
+        return bool(changed)
+
+    def requeue_failed(self) -> int:
+        """
+        Reset every failed job to pending with a fresh attempt budget.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, updated = ? WHERE state = 'failed'",
+                (time.time(),),
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {state: 0 for state in JOB_STATES}
+        counts.update(dict(rows))
+        return counts
+
+    def has_open_jobs(self) -> bool:
+        counts = self.counts()
+        return bool(counts["pending"] or counts["leased"])
+
+    def iter_results(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the records of completed jobs in enqueue order, a batch at a time.
+        """
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, result FROM jobs WHERE state = 'done' AND id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for _, result in rows:
+                yield json_codec.loads(result)
+            last_id = rows[-1][0]
+
+    def iter_failed(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yield ``(origin, error)`` for every failed job.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT origin, error FROM jobs WHERE state = 'failed' ORDER BY id"
+            ).fetchall()
+        yield from rows
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class LeaseKeeper:
+    """
+    Background thread that keeps extending a worker's leases while it is
+    still processing them, so a slow batch is not handed to another worker.
+    """
+
+    def __init__(self, queue: WorkQueue, owner: str, interval: Optional[float] = None) -> None:
+        self.queue = queue
+        self.owner = owner
+        self.interval = interval or max(1.0, queue.visibility_timeout / 3)
+        self._ids: List[int] = []
+        self._ids_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def hold(self, job_ids: Iterable[int]) -> None:
+        with self._ids_lock:
+            self._ids = list(job_ids)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._ids_lock:
+                ids = list(self._ids)
+            if ids:
+                try:
+                    self.queue.extend(self.owner, ids)
+                except sqlite3.Error as exc:
+                    LOGGER.warning("Could not extend leases: %s", exc)
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
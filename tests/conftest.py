@@ -0,0 +1,69 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+class _StubSpyfuHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        parsed = urlparse(self.path)
+        endpoint = parsed.path.strip("/")
+        domain = parse_qs(parsed.query).get("domain", ["example.com"])[0]
+        self.server.requests_seen.append((endpoint, domain))  # type: ignore[attr-defined]
+
+        # Scripted failures: (status, headers) answered before the normal payload.
+        planned = self.server.failures.get(domain)  # type: ignore[attr-defined]
+        if planned:
+            status, headers = planned.pop(0)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if endpoint == "domain_stats":
+            payload = {"organic_keywords": 10, "estimated_monthly_clicks": 100}
+        else:
+            payload = [{"domain": f"{domain}-rival.com", "keyword": domain, "position": 1}]
+
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+@pytest.fixture
+def stub_server() -> Iterator[ThreadingHTTPServer]:
+    """
+    Local HTTP server that mimics the SpyFu endpoints used by the client.
+
+    ``server.failures[domain]`` is a list of ``(status, headers)`` replies sent
+    in order before the real payload.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSpyfuHandler)
+    server.requests_seen = []  # type: ignore[attr-defined]
+    server.failures = {}  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@pytest.fixture
+def stub_settings(stub_server: ThreadingHTTPServer) -> dict:
+    host, port = stub_server.server_address[:2]
+    return {
+        "spyfu_base_url": f"http://{host}:{port}",
+        "spyfu_api_key": "test-key",
+        "use_sample_data": False,
+        "requests_per_minute": 60000,
+    }
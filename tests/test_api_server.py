@@ -0,0 +1,66 @@
+import http.client
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.runner import build_api_server, build_spyfu_client
+
+@pytest.fixture
+def api(stub_settings, tmp_path):
+    settings = {**stub_settings, "cache_enabled": True, "cache_path": str(tmp_path / "cache.sqlite")}
+    client = build_spyfu_client(settings)
+    server = build_api_server(settings, client, port=0, workers=2).start()
+    try:
+        yield server
+    finally:
+        server.stop()
+        client.close()
+
+def _post(server, payload):
+    request = urllib.request.Request(
+        f"{server.url}/process",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        assert response.headers["Content-Type"] == "application/x-ndjson"
+        return [json.loads(line) for line in response]
+
+def test_serve_streams_ndjson_and_keeps_the_client_warm(api, stub_server) -> None:
+    payload = {"urls": ["https://x.com/a", "y.com", "www.x.com/b"], "country": "US", "process_type": "top_ads"}
+
+    first = _post(api, payload)
+    second = _post(api, payload)
+
+    assert [r["origin"] for r in first] == payload["urls"]
+    assert [r["domain"] for r in first] == ["x.com", "y.com", "x.com"]
+    assert [r["top_ads"] for r in second] == [r["top_ads"] for r in first]
+    # The second batch is answered from the shared client's response cache.
+    assert sorted(stub_server.requests_seen) == [("top_ads", "x.com"), ("top_ads", "y.com")]
+    with urllib.request.urlopen(f"{api.url}/health", timeout=10) as response:
+        assert json.load(response) == {"status": "ok", "requests_served": 2}
+
+def test_serve_rejects_bad_batches(api) -> None:
+    for payload in (
+        {"urls": "x.com"},
+        {"urls": ["x.com"], "process_type": "nope"},
+        {"urls": ["x.com"], "country": 5},
+        {"urls": ["x.com"], "process_type": {"top_ads": True}},
+        {"urls": ["x.com"], "process_type": ["top_ads", 1]},
+    ):
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            _post(api, payload)
+        assert excinfo.value.code == 400
+        assert "error" in json.load(excinfo.value)
+
+    for length in ("abc", "-5", str(10**9)):
+        conn = http.client.HTTPConnection(api.host, api.port, timeout=10)
+        conn.putrequest("POST", "/process")
+        conn.putheader("Content-Length", length)
+        conn.endheaders()
+        response = conn.getresponse()
+        assert response.status == 400
+        assert "error" in json.load(response)
+        conn.close()
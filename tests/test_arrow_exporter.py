@@ -0,0 +1,37 @@
+import pytest
+
+from src.outputs.exporters import open_record_writer
+from src.runner import process_urls
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+def test_parquet_writer_emits_typed_nested_columns_in_row_groups(tmp_path) -> None:
+    records = process_urls(
+        [f"site{i}.com" for i in range(5)], "US", "all", {"use_sample_data": True}
+    )
+    path = tmp_path / "out.parquet"
+
+    with open_record_writer(str(path), "parquet", row_group_size=2) as writer:
+        for record in records:
+            writer.write(record)
+
+    parquet = pq.ParquetFile(str(path))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.num_rows == 5
+    assert pa.types.is_list(table.schema.field("top_competitors").type)
+    assert table.column("domain_stats").combine_chunks().field("paid_keywords").type == pa.int64()
+    assert table.to_pylist()[0]["most_valuable_keywords"] == records[0]["most_valuable_keywords"]
+
+def test_arrow_ipc_writer(tmp_path) -> None:
+    records = process_urls(["a.com", "b.com"], None, "top_ads", {"use_sample_data": True})
+    path = tmp_path / "out.arrow"
+
+    with open_record_writer(str(path), "arrow") as writer:
+        for record in records:
+            writer.write(record)
+
+    table = pa.ipc.open_file(str(path)).read_all()
+    assert table.column("domain").to_pylist() == ["a.com", "b.com"]
+    assert table.column("top_ads").to_pylist() == [r["top_ads"] for r in records]
@@ -0,0 +1,22 @@
+import asyncio
+
+import pytest
+
+from src.runner import process_urls_async
+
+pytest.importorskip("aiohttp")
+
+def test_process_urls_async_against_stub_server(stub_server, stub_settings) -> None:
+    urls = [f"https://www.site{i}.com/" for i in range(10)]
+
+    records = asyncio.run(
+        process_urls_async(urls, "US", "top_competitors", stub_settings, concurrency=5)
+    )
+
+    assert [r["origin"] for r in records] == urls
+    assert records[0]["top_competitors"] == [
+        {"domain": "site0.com-rival.com", "keyword": "site0.com", "position": 1}
+    ]
+    assert sorted(d for _, d in stub_server.requests_seen) == sorted(
+        f"site{i}.com" for i in range(10)
+    )
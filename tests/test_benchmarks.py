@@ -0,0 +1,34 @@
+from benchmarks.codec_benchmark import run_codec_benchmark
+from benchmarks.run_benchmarks import build_arg_parser, compare, percentile, run_benchmark
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) is None
+
+def test_benchmark_run_reports_metrics_and_flags_regressions() -> None:
+    args = build_arg_parser().parse_args(
+        ["--domains", "20", "--workers", "4", "--latency-ms", "0", "--jitter-ms", "0",
+         "--error-rate", "0.1", "--retry-base-delay", "0"]
+    )
+
+    result = run_benchmark(args)
+
+    stats = result["results"]
+    assert stats["records"] == 20
+    assert stats["server"]["errors"] > 0
+    assert stats["requests"] == stats["server"]["requests"]
+    assert stats["latency_ms"]["p50"] <= stats["latency_ms"]["p99"]
+    assert stats["cpu_ms_per_record"] > 0
+    assert compare(result, result, 0.1) == []
+    faster = {"results": dict(stats, domains_per_minute=stats["domains_per_minute"] * 2)}
+    assert compare(result, faster, 0.1)
+
+def test_codec_benchmark_reports_every_codec() -> None:
+    result = run_codec_benchmark(items=3, records=20, repeat=1, codecs=["json"])
+
+    stats = result["results"]["json"]
+    assert stats["decode_us_per_response"] > 0
+    assert stats["encode_speedup"] == 1.0
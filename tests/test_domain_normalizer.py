@@ -0,0 +1,59 @@
+import pytest
+
+from src.outputs.dead_letter import DeadLetterFile
+from src.parsers.domain_normalizer import DomainNormalizer, PublicSuffixList, extract_host
+from src.parsers.json_normalizer import normalize_domain
+from src.runner import build_domain_normalizer, process_urls
+
+PSL = """// test list
+uk
+co.uk
+*.ck
+!www.ck
+// ===BEGIN PRIVATE DOMAINS===
+blogspot.com
+"""
+
+def test_hosts_are_extracted_and_canonicalized() -> None:
+    assert extract_host("https://user:pw@Example.com:8443/a?b#c") == "Example.com"
+    assert extract_host("example.com:8080/path") == "example.com"
+    assert extract_host("http://[::1]:80/") == "::1"
+    assert normalize_domain("  HTTP://WWW.Example.COM./x ") == "example.com"
+    assert normalize_domain("https://bücher.de/") == "xn--bcher-kva.de"
+    assert normalize_domain("") == ""
+    with pytest.raises(ValueError):
+        normalize_domain("http://[::1")
+
+def test_registrable_domain_with_suffix_list() -> None:
+    rules = PublicSuffixList(line for line in PSL.splitlines() if line and not line.startswith("//"))
+    normalizer = DomainNormalizer(rules, cache_size=2)
+
+    assert normalizer.normalize_batch(
+        ["blog.x.co.uk", "https://www.x.co.uk/a", "a.b.foo.ck", "www.ck", "me.blogspot.com", "co.uk", "10.0.0.1"]
+    ) == ["x.co.uk", "x.co.uk", "b.foo.ck", "www.ck", "me.blogspot.com", "co.uk", "10.0.0.1"]
+    assert normalizer.normalize("deep.sub.example.com") == "example.com"
+    assert normalizer.cache_info()["size"] == 2
+
+def test_runner_collapses_subdomains_before_fetching(tmp_path) -> None:
+    psl = tmp_path / "public_suffix_list.dat"
+    psl.write_text(PSL, encoding="utf-8")
+    settings = {"use_sample_data": True, "registrable_domain": True, "public_suffix_list": str(psl)}
+
+    records = process_urls(["https://blog.x.co.uk/", "X.CO.UK"], "UK", "top_ads", settings)
+
+    assert [(r["origin"], r["domain"]) for r in records] == [
+        ("https://blog.x.co.uk/", "x.co.uk"),
+        ("X.CO.UK", "x.co.uk"),
+    ]
+    with pytest.raises(ValueError):
+        build_domain_normalizer({"registrable_domain": True})
+
+def test_unencodable_hosts_are_skipped_and_dead_lettered(stub_server, stub_settings, tmp_path) -> None:
+    bad = "https://" + "é" * 70 + ".com/x"
+    with DeadLetterFile(str(tmp_path / "failed.txt")) as dead_letter:
+        records = process_urls(
+            ["good.com", bad, "y.com"], "US", "top_ads", stub_settings, dead_letter=dead_letter
+        )
+
+    assert [r["domain"] for r in records] == ["good.com", "y.com"]
+    assert (tmp_path / "failed.txt").read_text(encoding="utf-8").split() == [bad]
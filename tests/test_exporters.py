@@ -0,0 +1,68 @@
+import csv
+import json
+
+from src.outputs.exporters import export_records, open_record_writer
+
+def test_streaming_json_array_writer_produces_valid_json(tmp_path) -> None:
+    path = tmp_path / "out.json"
+
+    with open_record_writer(str(path), "json") as writer:
+        writer.write({"domain": "a.com"})
+        writer.write({"domain": "b.com"})
+
+    assert writer.count == 2
+    assert json.loads(path.read_text(encoding="utf-8")) == [{"domain": "a.com"}, {"domain": "b.com"}]
+
+def test_streaming_json_array_writer_handles_no_records(tmp_path) -> None:
+    path = tmp_path / "empty.json"
+
+    with open_record_writer(str(path), "json"):
+        pass
+
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+def _record(domain: str, **extra) -> dict:
+    record = {
+        "origin": f"https://{domain}",
+        "domain": domain,
+        "run_id": "run-1",
+        "top_competitors": [{"domain": f"rival-of-{domain}", "overlap_score": 0.5}],
+        "domain_stats": {"organic_keywords": 10},
+    }
+    record.update(extra)
+    return record
+
+def test_csv_header_is_union_of_all_record_keys(tmp_path) -> None:
+    path = tmp_path / "out.csv"
+
+    export_records([_record("a.com"), _record("b.com", notes="late key")], str(path), "csv")
+
+    rows = list(csv.DictReader(path.open(encoding="utf-8")))
+    assert rows[0]["notes"] == ""
+    assert rows[1]["notes"] == "late key"
+    assert json.loads(rows[0]["top_competitors"])[0]["domain"] == "rival-of-a.com"
+    assert not list(tmp_path.glob(".spool-*"))
+
+def test_normalized_csv_layout_writes_child_tables(tmp_path) -> None:
+    path = tmp_path / "out.csv"
+
+    with open_record_writer(str(path), "csv", csv_layout="normalized") as writer:
+        writer.write(_record("a.com"))
+        writer.write(_record("b.com", top_competitors=[]))
+
+    parents = list(csv.DictReader(path.open(encoding="utf-8")))
+    assert [p["domain"] for p in parents] == ["a.com", "b.com"]
+    assert parents[0]["domain_stats.organic_keywords"] == "10"
+    assert "top_competitors" not in parents[0]
+
+    children = list(csv.DictReader((tmp_path / "out.top_competitors.csv").open(encoding="utf-8")))
+    assert children == [
+        {
+            "run_id": "run-1",
+            "domain": "a.com",
+            "origin": "https://a.com",
+            "item_index": "1",
+            "item_domain": "rival-of-a.com",
+            "overlap_score": "0.5",
+        }
+    ]
@@ -0,0 +1,60 @@
+import json
+import time
+
+from src.parsers.html_parser import extract_all_json_from_html, extract_json_from_html
+
+PAGE = """<html><head>
+<style>body { color: red; } .x { margin: 0 }</style>
+<script>var opts = {a: 1}; window.__DATA__ = {"domain": "x.com", "stats": {"clicks": 3}};
+function f() { return {"k": [1, 2]}; }</script>
+<script type="application/ld+json">[{"@type": "Organization"}]</script>
+<script type="text/template">{"ignored": true}</script>
+</head><body><p>{"not": "in a script"}</p></body></html>"""
+
+def test_extracts_every_payload_from_scripts_only() -> None:
+    assert extract_all_json_from_html(PAGE) == [
+        {"domain": "x.com", "stats": {"clicks": 3}},
+        {"k": [1, 2]},
+        [{"@type": "Organization"}],
+    ]
+    assert extract_json_from_html(PAGE) == {"domain": "x.com", "stats": {"clicks": 3}}
+    assert extract_json_from_html('{"bare": 1}') == {"bare": 1}
+    assert extract_json_from_html("<p>{broken}</p>") == {}
+
+def test_large_page_is_scanned_quickly() -> None:
+    css = "<style>" + ".c { color: red; }\n" * 100_000 + "</style>"
+    js = "<script>" + "if (a) { b({x: 1}); }\n" * 100_000
+    payload = {"rows": [{"i": i} for i in range(20_000)]}
+    html = css + js + "window.x = " + json.dumps(payload) + ";</script>"
+
+    started = time.perf_counter()
+    assert extract_all_json_from_html(html) == [payload]
+    assert time.perf_counter() - started < 2.0
+
+def test_rejected_candidates_scale_linearly() -> None:
+    def scan_time(count: int) -> float:
+        html = "<script>" + '{"k": x} ' * count + 'var d = {"ok": 1};</script>'
+        started = time.perf_counter()
+        assert extract_all_json_from_html(html) == [{"ok": 1}]
+        return time.perf_counter() - started
+
+    small, large = scan_time(10_000), scan_time(80_000)
+    assert large < 2.0
+    assert large < small * 8 * 3
+
+def test_deeply_nested_payloads_do_not_raise() -> None:
+    nested = '{"a": ' * 5000 + "1" + "}" * 5000
+    assert extract_json_from_html(nested) == {}
+    assert extract_json_from_html(f'<script type="application/json">{nested}</script>') == {}
+    assert extract_all_json_from_html(f'<script>x = {nested}; y = {{"ok": 1}};</script>') == [{"ok": 1}]
+
+def test_unclosed_candidates_scale_linearly() -> None:
+    def scan_time(count: int) -> float:
+        html = "<script>" + '{"a":1,' * count + '\nvar d = {"ok": 1};</script>'
+        started = time.perf_counter()
+        assert extract_all_json_from_html(html) == [{"ok": 1}]
+        return time.perf_counter() - started
+
+    small, large = scan_time(2_000), scan_time(16_000)
+    assert large < 1.0
+    assert large < small * 8 * 3
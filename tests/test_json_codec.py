@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from src.outputs.exporters import export_records
+from src.outputs.merge import iter_records
+from src.services import json_codec
+from src.services.json_codec import available_codecs, get_codec
+from src.services.spyfu_client import SpyfuClient
+
+RECORD = {"origin": "https://bücher.de/", "items": [{"k": "a/b", "v": 1.5}], "empty": None}
+
+@pytest.fixture(params=available_codecs())
+def codec(request):
+    previous = json_codec.active().name
+    yield json_codec.configure(request.param)
+    json_codec.configure(previous)
+
+def test_codecs_round_trip_bytes(codec) -> None:
+    encoded = codec.dumps(RECORD)
+    assert isinstance(encoded, bytes)
+    assert "bücher".encode("utf-8") in encoded
+    assert codec.loads(encoded) == RECORD
+    assert codec.loads(encoded.decode("utf-8")) == RECORD
+    assert json.loads(codec.dumps_pretty([RECORD])) == [RECORD]
+    with pytest.raises(ValueError):
+        codec.loads(b"<html>")
+
+def test_exports_and_client_use_the_active_codec(codec, tmp_path, stub_settings) -> None:
+    for fmt in ("json", "jsonl"):
+        path = str(tmp_path / f"out.{fmt}")
+        export_records([RECORD, RECORD], path, fmt)
+        assert list(iter_records(path)) == [RECORD, RECORD]
+
+    client = SpyfuClient(base_url=stub_settings["spyfu_base_url"], api_key="k", use_sample_data=False)
+    try:
+        assert client.get_top_ads("a.com", "US")
+    finally:
+        client.close()
+    assert client._decode_body("top_ads", "text/html", b"<p>busy</p>") == {"raw": "<p>busy</p>"}
+
+def test_unknown_codec_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        get_codec("simplejson")
+    assert get_codec("json").dumps({"a": 1}) == b'{"a": 1}'
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from src.runner import main_from_cli
+from src.services import profiler
+from src.services.profiler import StageProfiler, parse_stages
+
+def _run(tmp_path, *extra):
+    input_file = tmp_path / "urls.txt"
+    input_file.write_text("a.com\nb.com\nc.com\n", encoding="utf-8")
+    settings = tmp_path / "settings.json"
+    settings.write_text(json.dumps({"use_sample_data": True}))
+    main_from_cli(
+        [
+            "-i", str(input_file),
+            "-p", "top_ads",
+            "-o", str(tmp_path / "out.json"),
+            "--settings", str(settings),
+            "--log-config", str(tmp_path / "missing.conf"),
+            *extra,
+        ]
+    )
+
+def test_parse_stages() -> None:
+    assert parse_stages(None) == profiler.PROFILE_STAGES
+    assert parse_stages("export, fetch") == ("fetch", "export")
+    with pytest.raises(ValueError):
+        parse_stages("fetch,parse")
+
+def test_cpu_profile_of_selected_stage(tmp_path) -> None:
+    _run(
+        tmp_path,
+        "--profile", "cpu",
+        "--profile-stages", "validate",
+        "--profile-collapsed", str(tmp_path / "stacks.txt"),
+    )
+
+    report = (tmp_path / "out.profile.txt").read_text(encoding="utf-8")
+    assert "schema_validator.py" in report
+    assert "_fake_response" not in report
+    assert (tmp_path / "out.profile.prof").exists()
+    stacks = (tmp_path / "stacks.txt").read_text(encoding="utf-8").splitlines()
+    assert stacks and all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    assert profiler.section("validate") is profiler._NULL_SECTION
+
+def test_mem_profile_reports_every_stage(tmp_path) -> None:
+    _run(tmp_path, "--profile", "mem", "--profile-output", str(tmp_path / "prof" / "run"))
+
+    report = (tmp_path / "prof" / "run.mem.txt").read_text(encoding="utf-8")
+    for stage in profiler.PROFILE_STAGES:
+        assert f"== {stage}:" in report
+    assert "Traced memory" in report
+
+def test_section_is_a_no_op_for_untargeted_stage(tmp_path) -> None:
+    stage_profiler = StageProfiler("cpu", str(tmp_path / "p"), stages=["export"])
+
+    assert stage_profiler.section("fetch") is profiler._NULL_SECTION
@@ -0,0 +1,68 @@
+import random
+
+from src.services.proxy_manager import ProxyManager
+
+def _manager(**kwargs) -> ProxyManager:
+    config = {"rotating": ["http://good:1", "http://slow:2", "http://bad:3"]}
+    return ProxyManager(config, rng=random.Random(7), **kwargs)
+
+def test_selection_is_weighted_towards_healthy_proxies() -> None:
+    manager = _manager()
+    for _ in range(5):
+        manager.report_success("http://good:1", latency=0.1)
+        manager.report_success("http://slow:2", latency=2.0)
+
+    picks = [manager.get_proxy() for _ in range(500)]
+
+    assert picks.count("http://good:1") > 5 * picks.count("http://slow:2")
+
+def test_circuit_opens_then_half_open_probe_closes_it() -> None:
+    manager = _manager(failure_threshold=2, cooldown_seconds=60)
+    manager.report_failure("http://bad:3")
+    manager.report_failure("http://bad:3")
+
+    assert "http://bad:3" not in {manager.get_proxy() for _ in range(200)}
+
+    manager.cooldown_seconds = 0
+    assert manager.get_proxy() == "http://bad:3"  # the single half-open probe
+    manager.report_success("http://bad:3", latency=0.2)
+
+    stats = {entry["proxy"]: entry for entry in manager.stats()}
+    assert stats["http://bad:3"]["state"] == "closed"
+    assert stats["http://bad:3"]["failures"] == 2
+    assert stats["http://bad:3"]["requests"] == 3
+
+def test_failed_probe_reopens_circuit() -> None:
+    manager = _manager(failure_threshold=1, cooldown_seconds=0)
+    manager.report_failure("http://bad:3")
+
+    assert manager.get_proxy() == "http://bad:3"
+    manager.report_failure("http://bad:3")
+
+    assert {e["proxy"]: e["state"] for e in manager.stats()}["http://bad:3"] == "open"
+
+def test_excluded_proxy_is_avoided_while_others_are_healthy() -> None:
+    manager = _manager()
+
+    picks = {manager.get_proxy(exclude="http://good:1") for _ in range(100)}
+
+    assert "http://good:1" not in picks
+    single = ProxyManager({"rotating": ["http://only:1"]})
+    assert single.get_proxy(exclude="http://only:1") == "http://only:1"
+
+def test_repeated_proxies_are_reported_once() -> None:
+    manager = ProxyManager({"rotating": ["http://a:1", "http://b:2", "http://a:1"]})
+
+    assert [entry["proxy"] for entry in manager.stats()] == ["http://a:1", "http://b:2"]
+
+def test_half_open_probe_skips_the_excluded_proxy() -> None:
+    manager = _manager(failure_threshold=1, cooldown_seconds=0)
+    manager.report_failure("http://bad:3")
+
+    assert manager.get_proxy(exclude="http://bad:3") != "http://bad:3"
+    # The probe is still available to a caller that does not exclude it.
+    assert manager.get_proxy() == "http://bad:3"
+
+    single = ProxyManager({"rotating": ["http://only:1"]}, failure_threshold=1, cooldown_seconds=0)
+    single.report_failure("http://only:1")
+    assert single.get_proxy(exclude="http://only:1") == "http://only:1"
@@ -0,0 +1,43 @@
+import json
+import pickle
+
+from src.outputs.exporters import export_records
+from src.outputs.schema_validator import RecordValidator
+from src.parsers.json_normalizer import build_record, merge_records
+from src.parsers.record import EMPTY_SECTION, SpyfuRecord
+
+ADS = [{"headline": "h"}]
+
+def _ads_record(origin: str = "https://a.com") -> SpyfuRecord:
+    return build_record(origin, "a.com", "US", "top_ads", top_ads=ADS, timestamp_ms=5, run_id="r")
+
+def test_empty_sections_share_one_sentinel_and_read_like_a_dict() -> None:
+    first, second = _ads_record(), _ads_record("a.com")
+
+    assert first.top_competitors is EMPTY_SECTION and second.top_competitors is EMPTY_SECTION
+    assert not hasattr(first, "__dict__")
+    assert first["top_competitors"] == [] and first["domain_stats"] == {}
+    assert list(first) == list(first.to_dict()) and first.get("missing") is None
+    assert first == dict(first.to_dict()) and first != second
+    assert first.replace(origin="a.com") == second
+    assert pickle.loads(pickle.dumps(first)) == first
+
+def test_merge_and_sparse_serialization(tmp_path) -> None:
+    stats = build_record("a.com", "a.com", "US", "domain_stats", domain_stats={"clicks": 3}, timestamp_ms=9)
+    merged = merge_records([_ads_record("a.com"), stats], "top_ads,domain_stats")
+
+    assert merged.top_ads == ADS and merged.domain_stats == {"clicks": 3} and merged.timestamp == 9
+    assert merged.to_dict(sparse=True).keys() == {
+        "origin", "domain", "country", "process_type", "top_ads", "domain_stats", "timestamp", "run_id", "notes"
+    }
+
+    export_records([merged], str(tmp_path / "sparse.jsonl"), "jsonl", sparse=True)
+    export_records([merged], str(tmp_path / "full.json"), "json")
+    assert json.loads((tmp_path / "sparse.jsonl").read_text()) == merged.to_dict(sparse=True)
+    assert json.loads((tmp_path / "full.json").read_text()) == [merged.to_dict()]
+
+def test_validator_accepts_records_directly() -> None:
+    for mode in ("full", "fast"):
+        validator = RecordValidator(mode)
+        assert validator.errors(_ads_record()) == []
+        assert validator.errors(_ads_record().replace(top_ads=None))
@@ -0,0 +1,38 @@
+import pytest
+
+from src.services.request_throttler import RequestThrottler, parse_retry_after
+
+def test_burst_capacity_then_steady_rate() -> None:
+    throttler = RequestThrottler(rate_per_minute=60, burst=3)
+
+    waits = [throttler.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(1.0, abs=0.05)
+    assert waits[4] == pytest.approx(2.0, abs=0.05)
+
+def test_endpoint_and_proxy_budgets_are_separate() -> None:
+    throttler = RequestThrottler(
+        rate_per_minute=600000,
+        proxy_rate_per_minute=60,
+        endpoint_rates_per_minute={"top_ads": 30},
+    )
+
+    assert throttler.reserve(proxy="p1", endpoint="top_ads") == 0.0
+    assert throttler.reserve(proxy="p1") == pytest.approx(1.0, abs=0.05)
+    assert throttler.reserve(proxy="p2") == pytest.approx(0.0, abs=0.01)
+    assert throttler.reserve(proxy="p3", endpoint="top_ads") == pytest.approx(2.0, abs=0.05)
+
+def test_report_throttled_honours_retry_after_for_that_proxy_only() -> None:
+    throttler = RequestThrottler(rate_per_minute=6000, burst=10)
+
+    throttler.report_throttled(proxy="banned", retry_after=5)
+
+    assert throttler.reserve(proxy="banned") == pytest.approx(5.0, abs=0.05)
+    assert throttler.reserve(proxy="healthy") == 0.0
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
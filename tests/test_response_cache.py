@@ -0,0 +1,50 @@
+from src.services.response_cache import ResponseCache
+from src.services.spyfu_client import SpyfuClient
+
+def test_cache_ttl_per_endpoint_and_lru_eviction(tmp_path) -> None:
+    cache = ResponseCache(
+        str(tmp_path / "cache.sqlite"),
+        ttl_by_endpoint={"newly_ranked_keywords": 0},
+        max_entries=2,
+    )
+    params = {"domain": "a.com", "country": "US"}
+
+    assert cache.get("top_ads", params) == (False, None)
+    cache.set("top_ads", params, [{"headline": "x"}])
+    assert cache.get("top_ads", params) == (True, [{"headline": "x"}])
+
+    cache.set("newly_ranked_keywords", params, [1])
+    assert cache.get("newly_ranked_keywords", params) == (False, None)
+
+    cache.set("top_ads", {"domain": "b.com"}, [])
+    cache.set("top_ads", {"domain": "c.com"}, [])
+    assert len(cache) == 2
+    assert cache.get("top_ads", params) == (False, None)
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 1
+
+def test_client_serves_repeat_requests_from_cache(tmp_path, stub_server, stub_settings) -> None:
+    path = str(tmp_path / "cache.sqlite")
+    client = SpyfuClient(
+        base_url=stub_settings["spyfu_base_url"],
+        api_key="test-key",
+        use_sample_data=False,
+        cache=ResponseCache(path),
+    )
+    first = client.get_top_competitors("a.com", "US")
+    second = client.get_top_competitors("a.com", "US")
+    client.close()
+
+    assert first == second
+    assert len(stub_server.requests_seen) == 1
+
+    refreshing = SpyfuClient(
+        base_url=stub_settings["spyfu_base_url"],
+        api_key="test-key",
+        use_sample_data=False,
+        cache=ResponseCache(path, refresh=True),
+    )
+    refreshing.get_top_competitors("a.com", "US")
+    refreshing.close()
+
+    assert len(stub_server.requests_seen) == 2
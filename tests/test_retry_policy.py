@@ -0,0 +1,79 @@
+import asyncio
+import random
+
+import pytest
+import requests
+
+from src.outputs.dead_letter import DeadLetterFile
+from src.runner import build_async_spyfu_client, build_spyfu_client, process_urls
+from src.services.retry_policy import RetryPolicy
+
+def test_backoff_is_capped_jittered_and_honours_retry_after() -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, max_retry_after=10.0, rng=random.Random(3))
+
+    delays = [policy.delay(attempt) for attempt in range(1, 8) for _ in range(20)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert policy.delay(1, retry_after=7) == 7
+    assert policy.delay(1, retry_after=600) == 10.0
+    assert policy.should_retry(3, True) and not policy.should_retry(4, True)
+    assert not policy.should_retry(1, False)
+
+def _settings(stub_settings, **overrides):
+    return dict(stub_settings, retry_base_delay_seconds=0, **overrides)
+
+def test_transient_errors_are_retried(stub_server, stub_settings, monkeypatch) -> None:
+    stub_server.failures["flaky.com"] = [(503, {}), (429, {"Retry-After": "2"})]
+    sleeps = []
+    monkeypatch.setattr("src.services.spyfu_client.time.sleep", sleeps.append)
+    client = build_spyfu_client(_settings(stub_settings))
+
+    try:
+        stats = client.get_domain_stats("flaky.com", None)
+    finally:
+        client.close()
+
+    assert stats["organic_keywords"] == 10
+    assert len(stub_server.requests_seen) == 3
+    assert sleeps[0] == 0 and sleeps[1] == 2
+
+def test_fatal_errors_are_not_retried(stub_server, stub_settings) -> None:
+    stub_server.failures["gone.com"] = [(404, {})]
+    client = build_spyfu_client(_settings(stub_settings))
+
+    try:
+        with pytest.raises(requests.HTTPError):
+            client.get_domain_stats("gone.com", None)
+    finally:
+        client.close()
+
+    assert len(stub_server.requests_seen) == 1
+
+def test_async_client_retries(stub_server, stub_settings) -> None:
+    pytest.importorskip("aiohttp")
+    stub_server.failures["flaky.com"] = [(502, {}), (500, {})]
+
+    async def fetch():
+        async with build_async_spyfu_client(_settings(stub_settings)) as client:
+            return await client.get_domain_stats("flaky.com", None)
+
+    assert asyncio.run(fetch())["organic_keywords"] == 10
+    assert len(stub_server.requests_seen) == 3
+
+def test_urls_failing_after_retries_go_to_dead_letter_file(stub_server, stub_settings, tmp_path) -> None:
+    stub_server.failures["down.com"] = [(500, {})] * 10
+    path = tmp_path / "failed.txt"
+    urls = ["https://down.com/a", "ok.com", "www.down.com/b"]
+
+    with DeadLetterFile(str(path)) as dead_letter:
+        records = process_urls(
+            urls,
+            None,
+            ["domain_stats", "top_ads"],
+            _settings(stub_settings, retry_max_attempts=2),
+            dead_letter=dead_letter,
+        )
+
+    assert [r["origin"] for r in records] == ["ok.com"]
+    assert path.read_text(encoding="utf-8").splitlines() == ["https://down.com/a", "www.down.com/b"]
+    assert stub_server.requests_seen.count(("domain_stats", "down.com")) == 2
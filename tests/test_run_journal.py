@@ -0,0 +1,68 @@
+import json
+
+from src.outputs.run_journal import RunJournal
+from src.runner import run_bulk
+
+def _run(tmp_path, settings, **kwargs):
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps(settings), encoding="utf-8")
+    params = dict(
+        input_file=str(tmp_path / "urls.txt"),
+        country="US",
+        process_type="top_ads",
+        output_format="jsonl",
+        output_path=str(tmp_path / "out.jsonl"),
+        settings_path=str(settings_path),
+        log_config_path=str(tmp_path / "missing.conf"),
+        stream=True,
+    )
+    params.update(kwargs)
+    return run_bulk(**params)
+
+def test_resume_skips_journaled_work_and_drops_torn_record(tmp_path, stub_server, stub_settings) -> None:
+    (tmp_path / "urls.txt").write_text("a.com\nb.com\nc.com\n", encoding="utf-8")
+    settings = dict(stub_settings, journal_dir=str(tmp_path / "runs"))
+    _run(tmp_path, settings)
+    [journal_path] = (tmp_path / "runs").iterdir()
+    run_id = RunJournal.load(str(tmp_path / "runs"), journal_path.name[: -len(".journal.jsonl")]).run_id
+
+    # Simulate a crash after the first record: keep one journal entry and
+    # leave a half-written second record in the output.
+    header, first, *_ = journal_path.read_text(encoding="utf-8").splitlines()
+    journal_path.write_text(f"{header}\n{first}\n", encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+    first_line = output.read_text(encoding="utf-8").splitlines()[0]
+    output.write_text(first_line + '\n{"origin": "b.c', encoding="utf-8")
+    stub_server.requests_seen.clear()
+
+    _run(tmp_path, settings, resume=run_id)
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["domain"] for line in lines] == ["a.com", "b.com", "c.com"]
+    assert {json.loads(line)["run_id"] for line in lines} == {run_id}
+    assert sorted(d for _, d in stub_server.requests_seen) == ["b.com", "c.com"]
+
+def test_journal_survives_repeated_crashes_with_torn_lines(tmp_path) -> None:
+    directory = str(tmp_path / "runs")
+    journal = RunJournal.create(directory, "run-1", output_path=str(tmp_path / "out.jsonl"))
+    journal.record("a", "top_ads", "US", 8)
+    journal.close()
+    path = RunJournal.path_for(directory, "run-1")
+
+    # Crash mid-write, resume and finish two more entries, then crash again.
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"origin": "b", "proc')
+    journal = RunJournal.load(directory, "run-1")
+    journal.record("c", "top_ads", "US", 16)
+    journal.record("d", "top_ads", "US", 24)
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"origin": "e", "process_type": "top_ads", "country": "US", "offset": 32}')
+
+    journal = RunJournal.load(directory, "run-1")
+    journal.close()
+
+    assert {origin for origin, _, _ in journal.completed} == {"a", "c", "d"}
+    assert journal.last_offset == 24
+    with open(path, encoding="utf-8") as f:
+        assert all(json.loads(line) for line in f)
@@ -0,0 +1,82 @@
+import json
+
+from src.outputs.schema_validator import validate_records
+from src.parsers.json_normalizer import SECTION_FIELDS
+from src.runner import PROCESS_TYPES, process_urls, run_bulk
+
+def test_process_urls_with_workers_preserves_input_order() -> None:
+    urls = [f"https://site{i}.example.com/page" for i in range(20)]
+
+    records = process_urls(
+        urls,
+        country="US",
+        process_type="domain_stats",
+        settings={"use_sample_data": True},
+        workers=4,
+    )
+
+    assert [r["origin"] for r in records] == urls
+    assert [r["domain"] for r in records] == [f"site{i}.example.com" for i in range(20)]
+
+def test_process_urls_fetches_each_domain_once_and_fans_out(stub_server, stub_settings) -> None:
+    urls = ["https://x.com/a", "www.x.com/b", "https://y.com", "http://WWW.x.com/c"]
+
+    records = process_urls(urls, "US", "top_ads", stub_settings, workers=2)
+
+    assert [r["origin"] for r in records] == urls
+    assert [r["domain"] for r in records] == ["x.com", "x.com", "y.com", "x.com"]
+    assert sorted(stub_server.requests_seen) == [("top_ads", "x.com"), ("top_ads", "y.com")]
+    assert records[0]["top_ads"] == records[1]["top_ads"]
+
+def test_process_urls_merges_several_process_types_per_domain(stub_server, stub_settings) -> None:
+    records = process_urls(
+        ["https://x.com", "https://y.com"],
+        "US",
+        ["domain_stats", "top_competitors"],
+        stub_settings,
+        workers=4,
+    )
+
+    validate_records(records)
+    assert [r["domain"] for r in records] == ["x.com", "y.com"]
+    assert records[0]["process_type"] == "top_competitors,domain_stats"
+    assert records[0]["top_competitors"] and records[0]["domain_stats"]
+    assert records[0]["top_ads"] == []
+    assert len(stub_server.requests_seen) == 4
+
+def test_process_urls_all_fills_every_section() -> None:
+    [record] = process_urls(["example.com"], "US", "all", {"use_sample_data": True})
+
+    assert record["process_type"] == ",".join(PROCESS_TYPES)
+    for field in SECTION_FIELDS:
+        assert record[field], field
+
+def test_run_bulk_stream_writes_jsonl_one_record_per_url(tmp_path) -> None:
+    input_file = tmp_path / "urls.txt"
+    input_file.write_text("# comment\nhttps://a.com\n\nb.com\nc.com\n", encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+    settings = tmp_path / "settings.json"
+    settings.write_text(
+        json.dumps(
+            {
+                "use_sample_data": True,
+                "stream_chunk_size": 2,
+                "journal_dir": str(tmp_path / "runs"),
+            }
+        )
+    )
+
+    returned = run_bulk(
+        input_file=str(input_file),
+        country="US",
+        process_type="top_ads",
+        output_format="jsonl",
+        output_path=str(output),
+        settings_path=str(settings),
+        log_config_path=str(tmp_path / "missing.conf"),
+        stream=True,
+    )
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert returned == []
+    assert [json.loads(line)["domain"] for line in lines] == ["a.com", "b.com", "c.com"]
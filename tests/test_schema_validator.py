@@ -0,0 +1,51 @@
+import pytest
+
+from src.outputs.schema_validator import RecordValidator, validate_records
+from src.parsers.json_normalizer import build_record
+
+def _record(**overrides):
+    record = build_record(
+        origin="example.com",
+        domain="example.com",
+        country="US",
+        process_type="domain_stats",
+        top_competitors=[],
+        most_valuable_keywords=[],
+        most_successful_keywords=[],
+        newly_ranked_keywords=[],
+        top_ads=[],
+        domain_stats={},
+    )
+    return record.replace(**overrides)
+
+@pytest.mark.parametrize("mode", ["full", "fast"])
+def test_modes_agree_on_errors(mode) -> None:
+    validator = RecordValidator(mode)
+
+    assert validator.errors(_record()) == []
+    bad = _record(timestamp="yesterday", top_ads=None)
+    assert validator.errors(bad, 3) == RecordValidator("full").errors(bad, 3)
+    assert validator.errors(bad, 3)[0].startswith("Record #3:")
+
+    stats = validator.stats()
+    assert stats["mode"] == mode
+    assert stats["checked"] == 3
+    assert stats["invalid"] == 2
+    assert stats["seconds"] >= 0
+
+def test_sampled_mode_checks_one_in_n() -> None:
+    validator = RecordValidator("sampled", sample_every=10)
+    records = [_record() for _ in range(25)]
+    records[1] = _record(domain=None)  # not sampled
+
+    validate_records(iter(records), validator=validator)
+
+    assert validator.stats()["seen"] == 25
+    assert validator.stats()["checked"] == 3
+
+    with pytest.raises(ValueError):
+        validate_records([_record(domain=None)], mode="sampled")
+
+def test_unknown_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        RecordValidator("quick")
@@ -0,0 +1,32 @@
+from src.services.proxy_manager import ProxyManager
+from src.services.session_pool import SessionPool
+from src.services.spyfu_client import SpyfuClient
+
+def test_session_pool_reuses_one_session_per_proxy() -> None:
+    pool = SessionPool(pool_size=4)
+
+    direct = pool.get(None)
+    proxied = pool.get("http://proxy1:8000")
+
+    assert pool.get(None) is direct
+    assert pool.get("http://proxy1:8000") is proxied
+    assert proxied.proxies == {"http": "http://proxy1:8000", "https": "http://proxy1:8000"}
+    assert len(pool) == 2
+
+    pool.close()
+    assert len(pool) == 0
+
+def test_client_requests_go_through_pooled_session(stub_server, stub_settings) -> None:
+    client = SpyfuClient(
+        base_url=stub_settings["spyfu_base_url"],
+        api_key="test-key",
+        proxy_manager=ProxyManager({}),
+        use_sample_data=False,
+    )
+
+    for domain in ("a.com", "b.com", "c.com"):
+        assert client.get_domain_stats(domain, "US")["estimated_monthly_clicks"] == 100
+
+    assert len(client.session_pool) == 1
+    client.close()
+    assert len(client.session_pool) == 0
@@ -0,0 +1,61 @@
+import csv
+import json
+
+import pytest
+
+from src.outputs.exporters import export_records
+from src.outputs.merge import iter_json_array, merge_outputs
+from src.runner import main_from_cli, process_urls
+from src.services.sharding import filter_shard, parse_shard, shard_of
+
+def test_shards_partition_by_normalized_domain() -> None:
+    urls = [f"https://www.site{i}.com/a" for i in range(200)] + [f"site{i}.com/b" for i in range(200)]
+
+    shards = [list(filter_shard(urls, k, 4)) for k in (1, 2, 3, 4)]
+
+    assert sorted(u for shard in shards for u in shard) == sorted(urls)
+    assert all(len(shard) > 50 for shard in shards)
+    for i in range(200):
+        assert shard_of(f"site{i}.com", 4) == shard_of(f"site{i}.com", 4)
+        home = [k for k, shard in enumerate(shards) if f"https://www.site{i}.com/a" in shard]
+        assert f"site{i}.com/b" in shards[home[0]]
+
+def test_parse_shard_rejects_bad_specs() -> None:
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+def _records(urls):
+    return process_urls(urls, "US", "top_competitors", {"use_sample_data": True})
+
+def test_merge_streams_json_and_jsonl_shards(tmp_path) -> None:
+    first, second = _records(["a.com", "b.com"]), _records(["c.com"])
+    export_records(first, str(tmp_path / "s1.json"), "json")
+    export_records(second, str(tmp_path / "s2.jsonl"), "jsonl")
+
+    main_from_cli(
+        ["merge", str(tmp_path / "s1.json"), str(tmp_path / "s2.jsonl"), "-o", str(tmp_path / "all.jsonl")]
+    )
+
+    merged = [json.loads(line) for line in (tmp_path / "all.jsonl").read_text().splitlines()]
+    assert merged == first + second
+
+def test_json_array_reader_handles_small_chunks(tmp_path) -> None:
+    records = _records(["a.com", "b.com", "c.com"])
+    export_records(records, str(tmp_path / "out.json"), "json")
+
+    assert list(iter_json_array(str(tmp_path / "out.json"), chunk_size=7)) == records
+
+def test_merge_csv_shards_with_child_tables(tmp_path) -> None:
+    export_records(_records(["a.com"]), str(tmp_path / "s1.csv"), "csv", csv_layout="normalized")
+    export_records(_records(["b.com"]), str(tmp_path / "s2.csv"), "csv", csv_layout="normalized")
+
+    count = merge_outputs([str(tmp_path / "s1.csv"), str(tmp_path / "s2.csv")], str(tmp_path / "all.csv"))
+
+    assert count == 2
+    with open(tmp_path / "all.top_competitors.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert {row["domain"] for row in rows} == {"a.com", "b.com"}
+    with pytest.raises(ValueError):
+        merge_outputs([str(tmp_path / "s1.csv")], str(tmp_path / "all.jsonl"))
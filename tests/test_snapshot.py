@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from src.outputs.exporters import export_records
+from src.outputs.snapshot import DeltaRun, Snapshot, diff_records
+from src.parsers.json_normalizer import build_record
+from src.runner import process_urls, run_bulk
+
+def _record(domain, timestamp_ms, **sections):
+    return build_record(
+        origin=f"https://{domain}/",
+        domain=domain,
+        country="US",
+        process_type="top_competitors",
+        timestamp_ms=timestamp_ms,
+        run_id="previous",
+        **sections,
+    )
+
+def test_diff_records_reports_competitors_keywords_and_ads() -> None:
+    old = _record(
+        "x.com",
+        0,
+        top_competitors=[{"domain": "a.com"}, {"domain": "b.com"}],
+        most_valuable_keywords=[{"keyword": "crm", "position": 4}, {"keyword": "erp", "position": 9}],
+        top_ads=[{"headline": "Old", "landing_page_url": "https://x.com/old"}],
+    )
+    new = _record(
+        "x.com",
+        1,
+        top_competitors=[{"domain": "b.com"}, {"domain": "c.com"}],
+        most_valuable_keywords=[{"keyword": "crm", "position": 2}, {"keyword": "hr", "position": 7}],
+        top_ads=[
+            {"headline": "Old", "landing_page_url": "https://x.com/old"},
+            {"headline": "New", "landing_page_url": "https://x.com/new"},
+        ],
+    )
+
+    diff = diff_records(old, new)
+
+    assert diff["competitors_added"] == ["c.com"]
+    assert diff["competitors_lost"] == ["a.com"]
+    assert {(m["keyword"], m["from"], m["to"]) for m in diff["keyword_positions"]} == {
+        ("crm", 4, 2),
+        ("hr", None, 7),
+        ("erp", 9, None),
+    }
+    assert [ad["headline"] for ad in diff["ads_added"]] == ["New"]
+    assert diff_records(new, new) == {}
+
+def test_delta_run_copies_fresh_domains_and_diffs_the_rest(stub_server, stub_settings, tmp_path) -> None:
+    now_ms = 1_000_000_000_000
+    previous = [
+        _record("x.com", now_ms - 60_000, top_competitors=[{"domain": "kept.com"}]),
+        _record("y.com", now_ms - 7 * 86_400_000, top_competitors=[{"domain": "lost.com"}]),
+    ]
+    export_records(previous, str(tmp_path / "previous.jsonl"), "jsonl")
+    delta = DeltaRun(
+        Snapshot.load(str(tmp_path / "previous.jsonl")),
+        max_age_seconds=86400,
+        diff_path=str(tmp_path / "diff.jsonl"),
+        now=now_ms / 1000,
+    )
+
+    records = process_urls(
+        ["https://x.com/a", "z.com", "www.x.com/b", "y.com"], "US", "top_competitors", stub_settings, delta=delta
+    )
+    delta.close()
+
+    assert stub_server.requests_seen == [("top_competitors", "z.com"), ("top_competitors", "y.com")]
+    assert [r["origin"] for r in records] == ["https://x.com/a", "z.com", "www.x.com/b", "y.com"]
+    assert records[0]["run_id"] == "previous" and records[0]["top_competitors"] == [{"domain": "kept.com"}]
+    assert delta.stats() == {"carried": 1, "fetched": 2, "changed": 2}
+
+    diff = {line["domain"]: line for line in map(json.loads, (tmp_path / "diff.jsonl").read_text().splitlines())}
+    assert diff["z.com"]["status"] == "new"
+    assert diff["y.com"]["status"] == "changed"
+    assert diff["y.com"]["competitors_added"] == ["y.com-rival.com"]
+    assert diff["y.com"]["competitors_lost"] == ["lost.com"]
+
+def test_run_bulk_since_rejects_resume(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        run_bulk(
+            input_file=str(tmp_path / "urls.txt"),
+            country="US",
+            process_type="top_ads",
+            output_format="jsonl",
+            output_path=str(tmp_path / "out.jsonl"),
+            settings_path=None,
+            log_config_path=str(tmp_path / "missing.conf"),
+            resume="spyfu-bulk-urls-1-abc",
+            since=str(tmp_path / "previous.jsonl"),
+        )
+
+def test_copied_forward_records_take_the_new_origin(stub_server, stub_settings, tmp_path) -> None:
+    previous = _record("example.com", 2_000_000_000_000).replace(origin="https://old.example.com/landing")
+    delta = DeltaRun(Snapshot([previous]), max_age_seconds=86400, now=2_000_000_000)
+
+    [record] = process_urls(["example.com"], "US", "top_competitors", stub_settings, delta=delta)
+
+    assert stub_server.requests_seen == []
+    assert record["origin"] == "example.com"
+    assert record["run_id"] == "previous"
@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+
+from src.runner import main_from_cli, run_worker
+from src.services.work_queue import WorkQueue
+
+def test_expired_leases_are_taken_over_and_stale_owner_loses(tmp_path) -> None:
+    queue = WorkQueue(str(tmp_path / "q.sqlite"), visibility_timeout=0.05, max_attempts=2)
+    assert queue.enqueue([("https://a.com", "a.com"), ("b.com", "b.com")], "top_ads", "US") == 2
+    assert queue.enqueue([("b.com", "b.com")], "top_ads", "US") == 0
+
+    first = queue.lease("crashed", limit=1)
+    assert [job.origin for job in first] == ["https://a.com"]
+    assert [job.origin for job in queue.lease("other", limit=5)] == ["b.com"]
+
+    time.sleep(0.1)
+    retaken = queue.lease("survivor", limit=5)
+    assert [(job.id, job.attempts) for job in retaken] == [(first[0].id, 2), (2, 2)]
+    assert queue.complete("crashed", first[0].id, {"origin": "https://a.com"}) is False
+    assert queue.complete("survivor", first[0].id, {"origin": "https://a.com"}) is True
+
+    # b.com used up its attempts; once this lease lapses it is given up on.
+    time.sleep(0.1)
+    assert queue.lease("survivor", limit=5) == []
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+    assert list(queue.iter_results()) == [{"origin": "https://a.com"}]
+
+def test_failed_attempts_retry_until_the_budget_runs_out(tmp_path) -> None:
+    queue = WorkQueue(str(tmp_path / "q.sqlite"), max_attempts=2)
+    queue.enqueue([("a.com", "a.com")], "top_ads", None)
+
+    job = queue.lease("w")[0]
+    assert queue.fail("w", job.id, "boom")
+    job = queue.lease("w")[0]
+    assert queue.fail("w", job.id, "boom again")
+    assert queue.lease("w") == []
+    assert list(queue.iter_failed()) == [("a.com", "boom again")]
+
+    assert queue.requeue_failed() == 1
+    assert queue.counts()["pending"] == 1
+
+def test_workers_share_the_queue_and_merge_exports_results(tmp_path) -> None:
+    urls = [f"https://www.site{i}.com/page" for i in range(20)] + ["site3.com/other"]
+    input_file = tmp_path / "urls.txt"
+    input_file.write_text("\n".join(urls))
+    settings_path = tmp_path / "settings.json"
+    settings = {"use_sample_data": True, "queue_path": str(tmp_path / "jobs.sqlite"), "queue_poll_seconds": 0.01}
+    settings_path.write_text(json.dumps(settings))
+    log_config = str(tmp_path / "missing-logging.conf")
+
+    main_from_cli(
+        ["enqueue", "-i", str(input_file), "-p", "top_ads", "domain_stats", "-c", "US",
+         "--settings", str(settings_path), "--log-config", log_config]
+    )
+
+    done = []
+    threads = [
+        threading.Thread(
+            target=lambda n=n: done.append(
+                run_worker(dict(settings), worker_id=f"w{n}", workers=2, batch_size=3, drain=True)
+            )
+        )
+        for n in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(done) == len(urls)
+
+    output = tmp_path / "all.jsonl"
+    main_from_cli(["merge", settings["queue_path"], "-o", str(output)])
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["origin"] for r in records] == urls
+    assert {r["process_type"] for r in records} == {"top_ads,domain_stats"}
+    assert all(r["country"] == "US" for r in records)